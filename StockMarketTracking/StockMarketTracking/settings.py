@@ -44,9 +44,11 @@ INSTALLED_APPS = [
     "user.apps.UserConfig",
     "wallet.apps.WalletConfig",
     "share_manager.apps.ShareManagerConfig",
+    "benchmarks.apps.BenchmarksConfig",
 ]
 
 MIDDLEWARE = [
+    'utils.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +89,22 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Users of authenticated requests, kept in the process for a short time.
+    "users": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "users",
+        "TIMEOUT": 30,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+            "CULL_FREQUENCY": 10,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -135,7 +153,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 20
@@ -173,3 +191,34 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
+
+# Async views
+# With `ENABLED`, the hot read endpoints are served as coroutines when running under ASGI (see asgi.py).
+# Database work runs in a thread pool, `THREAD_SENSITIVE` runs it on the single thread used for sync views instead.
+ASYNC_VIEWS = {
+    "ENABLED": False,
+    "THREAD_SENSITIVE": False,
+}
+
+# Users of authenticated requests, cached by `user.authentication.CachedJWTAuthentication`
+JWT_USER_CACHE = {
+    "ALIAS": "users",
+    "TIMEOUT": 30,
+}
+
+# Per-view performance metrics of a sample of the requests, by `utils.instrumentation.PerformanceMiddleware`
+# Exported for Prometheus at /metrics/ to `METRICS_ALLOWED_IPS`. `EXTRA_METRICS` are paths of functions
+# returning more counters by name. Requests slower than `SLOW_REQUEST_MS` are logged with their queries.
+PERFORMANCE_INSTRUMENTATION = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.1,
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_REQUEST_QUERIES": 10,
+    "METRICS_ALLOWED_IPS": ("127.0.0.1",),
+    "EXTRA_METRICS": (),
+}
+
+# Streamed exports of whole tables, by `utils.export`, rows are fetched and encoded `CHUNK_SIZE` at a time
+DATA_EXPORT = {
+    "CHUNK_SIZE": 2000,
+}
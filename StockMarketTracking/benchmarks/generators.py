@@ -0,0 +1,75 @@
+import random
+
+from django.contrib.auth import get_user_model
+
+from share_manager import models
+from utils.iterables import batched
+from wallet.models import Wallet
+
+
+def create_users(count: int, prefix: str = "bench", balance: float = 10 ** 9, batch_size: int = 1000) -> list:
+    """
+    Creates users without a usable password, with a wallet holding `balance`, in batches.
+
+    :param count: Number of users to create.
+    :param prefix: Prefix of the usernames.
+    :param balance: Balance of the wallet of every user.
+    :param batch_size: Number of users per insert.
+    :return: IDs of the created users.
+    """
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        (User(username=f"{prefix}{i}", password="!") for i in range(count)), batch_size=batch_size
+    )
+
+    # `bulk_create` skips `User.save`, which creates the wallets otherwise.
+    user_ids = list(User.objects.filter(username__startswith=prefix).values_list("id", flat=True))
+    Wallet.objects.bulk_create(
+        (Wallet(user_id=user_id, balance=balance) for user_id in user_ids), batch_size=batch_size
+    )
+
+    return user_ids
+
+
+def create_shares(count: int, batch_size: int = 1000) -> list:
+    """
+    Creates shares with random prices, in batches.
+
+    :param count: Number of shares to create.
+    :param batch_size: Number of shares per insert.
+    :return: scrips of the created shares.
+    """
+
+    scrips = [f"BENCH{i}" for i in range(count)]
+    models.Share.objects.bulk_create(
+        (models.Share(stock_scrip=scrip, current_price=random.randint(1000, 20000) / 100) for scrip in scrips),
+        batch_size=batch_size,
+    )
+
+    return scrips
+
+
+def create_portfolios(user_ids, scrips, shares_per_user: int, batch_size: int = 10000) -> int:
+    """
+    Gives every user holdings of `shares_per_user` random shares, in batches.
+
+    :param user_ids: IDs of the users.
+    :param scrips: Scrips to pick the holdings from.
+    :param shares_per_user: Number of different shares held by every user.
+    :param batch_size: Number of holdings per insert.
+    :return: number of created holdings.
+    """
+
+    holdings = (
+        models.Portfolio(user_id=user_id, share_id=scrip, number_of_shares=random.randint(1, 100))
+        for user_id in user_ids
+        for scrip in random.sample(scrips, min(shares_per_user, len(scrips)))
+    )
+
+    created = 0
+    for batch in batched(holdings, batch_size):
+        models.Portfolio.objects.bulk_create(batch)
+        created += len(batch)
+
+    return created
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import generators
+from utils.benchmark import benchmark_database, compare_with_baseline, measure_endpoint
+
+BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures latency percentiles and query counts of the share endpoints, and compares them with a baseline. "
+        "Runs against a throwaway test database, exits with an error on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000, help="Number of users to generate.")
+        parser.add_argument("--scrips", type=int, default=5000, help="Number of scrips to generate.")
+        parser.add_argument("--holdings", type=int, default=20, help="Number of scrips held by every user.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline file to compare with.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative latency increase.")
+        parser.add_argument(
+            "--min-delta", type=float, default=1.0, help="Allowed absolute latency increase in milliseconds."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            user_ids = generators.create_users(options["users"])
+            scrips = generators.create_shares(options["scrips"])
+            generators.create_portfolios(user_ids, scrips, options["holdings"])
+
+            results = self.run_benchmarks(get_user_model().objects.get(id=user_ids[0]), scrips, options["requests"])
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<14} p50 {result['p50']:8.2f}ms  p95 {result['p95']:8.2f}ms  p99 {result['p99']:8.2f}ms  "
+                f"{result['queries']:3} queries"
+            )
+
+        if options["save_baseline"]:
+            options["baseline"].write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+            self.stdout.write(f"Saved the baseline to {options['baseline']}.")
+        elif options["baseline"].exists():
+            regressions = compare_with_baseline(
+                results, json.loads(options["baseline"].read_text()), options["tolerance"], options["min_delta"]
+            )
+
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+            self.stdout.write("No regressions against the baseline.")
+
+    @staticmethod
+    def run_benchmarks(user, scrips, requests: int) -> dict:
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        return {
+            "GetAllScrips": measure_endpoint(
+                client, "get", lambda i: reverse("share_manager:GetAllScrips"), requests, data={"limit": 20}
+            ),
+            "GetPortfolio": measure_endpoint(
+                client, "get", lambda i: reverse("share_manager:GetPortfolio"), requests, data={"limit": 20}
+            ),
+            "TradeShare": measure_endpoint(
+                client, "post", lambda i: reverse("share_manager:TradeShare"), requests,
+                data={"transaction_type": "BUY", "scrip": scrips[0], "scrip_count": 1},
+            ),
+        }
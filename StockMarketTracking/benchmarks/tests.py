@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from benchmarks import generators
+from share_manager.models import Portfolio
+from utils.benchmark import compare_with_baseline, percentile
+from wallet.models import Wallet
+
+
+class TestBenchmarkHelpers(TestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2.5)
+        self.assertEqual(percentile(range(101), 95), 95)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_compare_with_baseline(self):
+        baseline = {"GetPortfolio": {"p50": 10, "p95": 20, "p99": 30, "queries": 3}}
+
+        self.assertEqual(compare_with_baseline(
+            {"GetPortfolio": {"p50": 12, "p95": 20, "p99": 90, "queries": 3}}, baseline, tolerance=0.25
+        ), [])
+        self.assertEqual(len(compare_with_baseline(
+            {"GetPortfolio": {"p50": 13, "p95": 20, "p99": 30, "queries": 4}}, baseline, tolerance=0.25
+        )), 2)
+
+    def test_generators(self):
+        user_ids = generators.create_users(3)
+        scrips = generators.create_shares(5)
+
+        self.assertEqual(generators.create_portfolios(user_ids, scrips, 2), 6)
+        self.assertEqual(Wallet.objects.filter(user_id__in=user_ids).count(), 3)
+        self.assertEqual(Portfolio.objects.filter(user_id=user_ids[0]).count(), 2)
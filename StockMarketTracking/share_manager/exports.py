@@ -0,0 +1,15 @@
+from share_manager import models
+from utils.export import Export
+
+# Tables served by `ExportView` and the `export_data` command, by name.
+# Through the API, portfolios are limited to the ones of the requesting user.
+EXPORTS = {
+    "shares": Export(
+        models.Share.objects.all(), ("stock_scrip", "current_price", "last_updated"), date_field="last_updated",
+    ),
+    "portfolios": Export(
+        models.Portfolio.objects.all(),
+        ("id", "user_id", "user__username", "share_id", "number_of_shares", "share__current_price"),
+        author_field="user", owner_field="user",
+    ),
+}
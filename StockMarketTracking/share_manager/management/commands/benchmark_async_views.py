@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from share_manager import models
+from share_manager import views
+from utils.benchmark import benchmark_database, measure_view_concurrency, simulated_database_latency
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests the sync and async variants of the scrip and portfolio views from a single event loop, "
+        "like an ASGI server. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per view.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at the same time.")
+        parser.add_argument("--workers", type=int, default=8, help="Threads available to the async views.")
+        parser.add_argument(
+            "--db-latency", type=float, default=5, help="Milliseconds added to every query, like a remote database."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(), simulated_database_latency(options["db_latency"]), \
+                override_settings(ASYNC_VIEWS={"THREAD_SENSITIVE": False}, ALLOWED_HOSTS=["testserver"]):
+            user = get_user_model().objects.create(username="async_benchmark")
+            shares = models.Share.objects.bulk_create([
+                models.Share(stock_scrip=f"SCRIP{i}", current_price=100 + i) for i in range(50)
+            ])
+            models.Portfolio.objects.bulk_create([
+                models.Portfolio(user=user, share=share, number_of_shares=10) for share in shares
+            ])
+
+            factory = RequestFactory(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+            endpoints = (
+                ("scrips", views.GetAllScrips, views.AsyncGetAllScrips),
+                ("portfolio", views.GetPortfolio, views.AsyncGetPortfolio),
+            )
+
+            for name, sync_view, async_view in endpoints:
+                for mode, view_class in (("sync", sync_view), ("async", async_view)):
+                    view = view_class.as_view()
+
+                    # Time spent on a single request, when nothing else is running.
+                    _, service_time = measure_view_concurrency(view, lambda: factory.get("/"), 10, 1, 1)
+                    elapsed, latency = measure_view_concurrency(
+                        view, lambda: factory.get("/"), options["requests"], options["concurrency"],
+                        options["workers"]
+                    )
+                    throughput = options["requests"] / elapsed
+
+                    self.stdout.write(
+                        f"{name:<9} {mode:<5}: {throughput:8.1f} requests/s, {latency * 1000:8.1f}ms latency, "
+                        f"{throughput * service_time:5.1f} requests served concurrently"
+                    )
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from share_manager import exports
+from utils.export import CONTENT_TYPES
+
+
+def parse_datetime(value: str) -> datetime:
+    value = datetime.fromisoformat(value)
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+class Command(BaseCommand):
+    help = "Writes all the shares or portfolios as NDJSON or CSV, in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=tuple(exports.EXPORTS))
+        parser.add_argument("--format", dest="file_format", choices=tuple(CONTENT_TYPES), default="ndjson")
+        parser.add_argument("--author", help="Username of the owner of the exported rows.")
+        parser.add_argument("--since", type=parse_datetime, help="Earliest date time, inclusive.")
+        parser.add_argument("--until", type=parse_datetime, help="Latest date time, exclusive.")
+        parser.add_argument("--output", help="File to write to, standard output by default.")
+        parser.add_argument("--chunk-size", type=int, help="Number of rows fetched at once, CHUNK_SIZE by default.")
+
+    def handle(self, *args, **options):
+        export = exports.EXPORTS[options["kind"]]
+        if (options["since"] or options["until"]) and not export.date_field:
+            raise CommandError(f"{options['kind']} can't be filtered by date.")
+        queryset = export.filter(author=options["author"], since=options["since"], until=options["until"])
+        chunks = export.encode(queryset, options["file_format"], chunk_size=options["chunk_size"])
+
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as file:
+            file.writelines(chunks)
@@ -1 +1,207 @@
-# Create your tests here.
+import csv
+import json
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from share_manager import views
+from share_manager.models import Portfolio, Share
+from utils import instrumentation
+from utils.testing import QueryCountAssertionsMixin
+
+
+class SetupManagerMixin:
+    refresh_token_url = reverse("user:GetRefreshToken")
+
+    headers = {}
+    access_token = None
+    USERNAME = None
+    PASSWORD = None
+    client = None
+    user = None
+
+    def setup(self) -> None:
+        self.user = get_user_model()(username=self.USERNAME)
+        self.user.set_password(self.PASSWORD)
+        self.user.save()
+
+        response = self.client.post(self.refresh_token_url, {
+            "username": self.USERNAME,
+            "password": self.PASSWORD
+        })
+        self.access_token = response.data.get("access")
+        self.headers["HTTP_AUTHORIZATION"] = f"Bearer {self.access_token}"
+
+
+class TestListViewQueryCount(TestCase, SetupManagerMixin, QueryCountAssertionsMixin):
+    USERNAME = "trader"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        for i in range(25):
+            share = Share(stock_scrip=f"SCRIP{i}", current_price=100 + i)
+            share.save()
+            Portfolio(user=self.user, share=share, number_of_shares=i + 1).save()
+
+    def test_get_all_scrips(self):
+        self.assertConstantQueryCount(reverse("share_manager:GetAllScrips"), **self.headers)
+
+    def test_get_portfolio(self):
+        self.assertConstantQueryCount(reverse("share_manager:GetPortfolio"), **self.headers)
+
+
+@override_settings(ASYNC_VIEWS={"THREAD_SENSITIVE": True})
+class TestAsyncViews(TestCase, SetupManagerMixin):
+    USERNAME = "async_trader"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        share = Share(stock_scrip="ASYNC", current_price=10)
+        share.save()
+        Portfolio(user=self.user, share=share, number_of_shares=3).save()
+
+    def assertSameResponse(self, async_view, url):
+        request = RequestFactory().get(url, **self.headers)
+        async_response = async_to_sync(async_view.as_view())(request)
+        async_response.render()
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.data, self.client.get(url, **self.headers).data)
+
+    def test_get_all_scrips(self):
+        self.assertSameResponse(views.AsyncGetAllScrips, reverse("share_manager:GetAllScrips"))
+
+    def test_get_portfolio(self):
+        self.assertSameResponse(views.AsyncGetPortfolio, reverse("share_manager:GetPortfolio"))
+
+    def test_authentication_required(self):
+        response = async_to_sync(views.AsyncGetPortfolio.as_view())(RequestFactory().get("/"))
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(PERFORMANCE_INSTRUMENTATION={"ENABLED": True, "SAMPLE_RATE": 1, "SLOW_REQUEST_MS": 60000})
+class TestPerformanceInstrumentation(TestCase, SetupManagerMixin):
+    USERNAME = "instrumented_trader"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+        instrumentation.view_metrics.reset()
+
+        for i in range(3):
+            Share(stock_scrip=f"SCRIP{i}", current_price=100 + i).save()
+
+    def test_records_view_metrics(self):
+        response = self.client.get(reverse("share_manager:GetAllScrips"), **self.headers)
+        metrics = instrumentation.view_metrics.as_dict()["share_manager:GetAllScrips"]
+
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["queries"], 0)
+        self.assertEqual(metrics["response_bytes"], len(response.content))
+
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('django_view_queries_total{view="share_manager:GetAllScrips"}', body)
+
+
+@override_settings(DATA_EXPORT={"CHUNK_SIZE": 2})
+class TestExport(TestCase, SetupManagerMixin):
+    USERNAME = "exporting_trader"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        other = get_user_model().objects.create(username="other_trader")
+        for i in range(3):
+            share = Share(stock_scrip=f"SCRIP{i}", current_price=100 + i)
+            share.save()
+            Portfolio(user=self.user, share=share, number_of_shares=i + 1).save()
+            Portfolio(user=other, share=share, number_of_shares=10).save()
+
+    def export(self, kind, **params):
+        response = self.client.get(reverse("share_manager:ExportView", kwargs={"kind": kind}), params, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        return b"".join(response.streaming_content).decode()
+
+    def test_shares(self):
+        rows = list(csv.reader(StringIO(self.export("shares", file_format="csv"))))
+
+        self.assertEqual(rows[0], ["stock_scrip", "current_price", "last_updated"])
+        self.assertEqual([row[0] for row in rows[1:]], ["SCRIP0", "SCRIP1", "SCRIP2"])
+
+    def test_portfolios_of_the_user(self):
+        rows = [json.loads(line) for line in self.export("portfolios").splitlines()]
+
+        self.assertEqual({row["user_username"] for row in rows}, {self.USERNAME})
+        self.assertEqual([row["number_of_shares"] for row in rows], [1, 2, 3])
+
+    def test_command(self):
+        out = StringIO()
+        call_command("export_data", "portfolios", "--author", "other_trader", stdout=out)
+
+        self.assertEqual([json.loads(line)["number_of_shares"] for line in out.getvalue().splitlines()], [10] * 3)
+
+
+class TestConditionalGet(TestCase, SetupManagerMixin):
+    USERNAME = "conditional_trader"
+    PASSWORD = "Testing@123"
+
+    url = reverse("share_manager:GetAllScrips")
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.share = Share(stock_scrip="ETAG", current_price=10)
+        self.share.save()
+
+    def test_not_modified(self):
+        response = self.client.get(self.url, **self.headers)
+        etag = response["ETag"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+
+        last_modified = response["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified, **self.headers)
+        self.assertEqual(response.status_code, 304)
+
+    def test_price_change(self):
+        etag = self.client.get(self.url, **self.headers)["ETag"]
+
+        self.share.current_price = 11
+        self.share.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        Share(stock_scrip="NEW", current_price=10).save()
+        self.assertNotEqual(self.client.get(self.url, **self.headers)["ETag"], response["ETag"])
+
+    def test_rows_after_the_page(self):
+        Share(stock_scrip="ZZZ", current_price=10).save()
+        etag = self.client.get(self.url, {"limit": 1}, **self.headers)["ETag"]
+
+        Share.objects.filter(stock_scrip="ZZZ").update(current_price=12)
+        self.assertEqual(self.client.get(self.url, {"limit": 1}, HTTP_IF_NONE_MATCH=etag, **self.headers).status_code, 304)
+
+        Share(stock_scrip="NEW", current_price=10).save()
+        response = self.client.get(self.url, {"limit": 1}, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
@@ -1,11 +1,13 @@
 from django.urls import path
 
 from share_manager import views
+from utils.async_views import select_view
 
 app_name = "share_manager"
 
 urlpatterns = [
-    path("get-all-scrips/", views.GetAllScrips.as_view(), name="GetAllScrips"),
-    path("portfolio/", views.GetPortfolio.as_view(), name="GetPortfolio"),
+    path("get-all-scrips/", select_view(views.GetAllScrips, views.AsyncGetAllScrips), name="GetAllScrips"),
+    path("portfolio/", select_view(views.GetPortfolio, views.AsyncGetPortfolio), name="GetPortfolio"),
+    path("export/<str:kind>/", views.ExportView.as_view(), name="ExportView"),
     path("trade/", views.TradeShare.as_view(), name="TradeShare"),
 ]
@@ -1,24 +1,42 @@
 from django.db.models import Sum, F, FloatField
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from share_manager import exports
 from share_manager import models
 from share_manager import serializer
+from utils.async_views import AsyncAPIView, run_sync
+from utils.conditional import ConditionalListMixin
+from utils.export import ExportRequestParametersSerializer
+from utils.queryset import OptimizedQuerysetMixin
 
 
-class GetAllScrips(ListAPIView):
+class GetAllScrips(ConditionalListMixin, OptimizedQuerysetMixin, ListAPIView):
     """
-    Gets the list of all stock, that a user can trade.
+    Gets the list of all stock, that a user can trade. Polling clients get `304 Not Modified` while no price changed.
     """
 
-    queryset = models.Share.objects.all()
+    queryset = models.Share.objects.order_by("stock_scrip")
     serializer_class = serializer.StockSerializer
+    allow_token_user = True
+    last_modified_field = "last_updated"
+    etag_fields = ("current_price",)
 
 
-class GetPortfolio(ListAPIView):
+class AsyncGetAllScrips(AsyncAPIView, GetAllScrips):
+    """
+    `GetAllScrips` served as a coroutine, enabled through the `ASYNC_VIEWS` setting.
+    """
+
+    async def get(self, request: Request, *args, **kwargs):
+        return await run_sync(super().get, request, *args, **kwargs)
+
+
+class GetPortfolio(OptimizedQuerysetMixin, ListAPIView):
     """
     Gets the current portfolio of the user.
     """
@@ -61,6 +79,15 @@ class GetPortfolio(ListAPIView):
         return response
 
 
+class AsyncGetPortfolio(AsyncAPIView, GetPortfolio):
+    """
+    `GetPortfolio` served as a coroutine, enabled through the `ASYNC_VIEWS` setting.
+    """
+
+    async def get(self, request: Request, *args, **kwargs):
+        return await run_sync(super().get, request, *args, **kwargs)
+
+
 class TradeShare(APIView):
     """
     Allows for the trading of scrips. Either Buy or Sell.
@@ -178,3 +205,31 @@ class TradeShare(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
         else:
             return Response(trade_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ExportView(APIView):
+    """
+    Streams all the `shares`, or the `portfolios` of the user, as NDJSON or CSV.
+    """
+
+    def get(self, request: Request, kind: str):
+        """
+        Returns the rows of the export as a file, encoded while it is sent.
+
+        :param request: Request object from client
+        :param kind: Name of the export.
+        :return: Streamed NDJSON or CSV file.
+        """
+
+        if (export := exports.EXPORTS.get(kind)) is None:
+            raise NotFound()
+
+        parameters_serializer = ExportRequestParametersSerializer(data=request.query_params, export=export)
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = dict(parameters_serializer.validated_data)
+        file_format = filters.pop("file_format")
+
+        return export.stream(export.filter(owner=request.user, **filters), file_format, filename=kind)
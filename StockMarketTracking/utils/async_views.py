@@ -0,0 +1,102 @@
+import functools
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.views import APIView
+
+
+def get_async_settings() -> dict:
+    """
+    Returns the `ASYNC_VIEWS` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "ENABLED": False,
+        "THREAD_SENSITIVE": False,
+        **getattr(settings, "ASYNC_VIEWS", {}),
+    }
+
+
+async def run_sync(function, *args, **kwargs):
+    """
+    Runs blocking code, like ORM queries, outside the event loop.
+
+    Django 4.0 has no async ORM, so database work runs in a thread pool. With `THREAD_SENSITIVE` off, requests
+    don't queue behind the single thread that Django uses for sync views under ASGI, and each call opens and
+    closes its own connection, like a request would.
+
+    :param function: Function to call.
+    :return: return value of the function.
+    """
+
+    if get_async_settings()["THREAD_SENSITIVE"]:
+        return await sync_to_async(function, thread_sensitive=True)(*args, **kwargs)
+
+    @functools.wraps(function)
+    def run_with_connection():
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(run_with_connection, thread_sensitive=False)()
+
+
+class AsyncAPIView(APIView):
+    """
+    `APIView` served as a coroutine under ASGI. Handlers may be `async def`, authentication and permission checks
+    run through `run_sync`, as they may query the database.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        @functools.wraps(view)
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await run_sync(self.initial, request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def select_view(sync_view, async_view, **initkwargs):
+    """
+    Returns the url view of `async_view` when async views are enabled by the `ASYNC_VIEWS` setting,
+    the one of `sync_view` otherwise.
+
+    :param sync_view: View class served by a thread.
+    :param async_view: Async variant of the view.
+    :param initkwargs: Arguments for `as_view`.
+    :return: view function.
+    """
+
+    view = async_view if get_async_settings()["ENABLED"] else sync_view
+    return view.as_view(**initkwargs)
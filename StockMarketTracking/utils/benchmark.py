@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+
+
+@contextmanager
+def benchmark_database(verbosity: int = 0):
+    """
+    Runs the block against a throwaway test database, so benchmarks never touch real data.
+
+    :param verbosity: Verbosity for creating and destroying the database.
+    """
+
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+
+
+@contextmanager
+def simulated_database_latency(milliseconds: float):
+    """
+    Delays every query of every connection opened in the block, to emulate a database reached over the network.
+
+    :param milliseconds: Delay added to every query.
+    """
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(milliseconds / 1000)
+        return execute(sql, params, many, context)
+
+    def add_delay(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(add_delay)
+    for connection in connections.all():
+        connection.execute_wrappers.append(delay)
+
+    try:
+        yield
+    finally:
+        connection_created.disconnect(add_delay)
+        for connection in connections.all():
+            connection.execute_wrappers.remove(delay)
+
+
+def run_concurrently(function, threads: int, iterations: int):
+    """
+    Calls `function` `iterations` times in total, spread evenly over `threads` threads.
+
+    :param function: Function to call, without arguments.
+    :param threads: Number of threads calling the function at the same time.
+    :param iterations: Total number of calls.
+    :return: elapsed seconds and number of calls that raised an exception.
+    """
+
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(calls: int):
+        try:
+            barrier.wait()
+            for _ in range(calls):
+                try:
+                    function()
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            connections.close_all()
+
+    workers = [
+        threading.Thread(target=worker, args=(iterations // threads + (i < iterations % threads),))
+        for i in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for thread in workers:
+        thread.join()
+
+    return time.perf_counter() - start, len(errors)
+
+
+def measure_view_concurrency(view, make_request, requests: int, concurrency: int, workers: int, **view_kwargs):
+    """
+    Sends `requests` requests to the view, `concurrency` at a time, from a single event loop, like an ASGI server.
+    Sync views are run the way Django runs them under ASGI, async views get a pool of `workers` threads.
+
+    :param view: View function, as returned by `as_view`.
+    :param make_request: Function returning a new request for the view.
+    :param requests: Total number of requests.
+    :param concurrency: Number of requests in flight at the same time.
+    :param workers: Number of threads available to async views for blocking work.
+    :param view_kwargs: Arguments passed to the view, like the ones captured from the url.
+    :return: elapsed seconds, and the average latency of a request in seconds.
+    """
+
+    async def send(semaphore, latencies):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await handler(make_request(), **view_kwargs)
+            response.render()
+            latencies.append(time.perf_counter() - start)
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=workers))
+        semaphore, latencies = asyncio.Semaphore(concurrency), []
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send(semaphore, latencies) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+        return elapsed, sum(latencies) / len(latencies)
+
+    handler = view if asyncio.iscoroutinefunction(view) else sync_to_async(view, thread_sensitive=True)
+    return asyncio.run(run())
+
+
+def percentile(values, percent: float) -> float:
+    """
+    Returns the `percent` percentile of the values, interpolating between the closest ranks.
+
+    :param values: Measured values, in any order.
+    :param percent: Percentile to return, between 0 and 100.
+    :return: value below which `percent` percent of the values fall.
+    """
+
+    values = sorted(values)
+    rank = (len(values) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def measure_endpoint(client, method: str, make_url, requests: int, **extra) -> dict:
+    """
+    Sends `requests` requests to an endpoint through the test client, after one warm up request.
+
+    :param client: `django.test.Client` to send the requests with.
+    :param method: HTTP method, e.g. `get`.
+    :param make_url: Function returning the url for the nth request, so requests can vary.
+    :param requests: Number of measured requests.
+    :param extra: Additional arguments for the test client, like headers or data.
+    :return: latency percentiles in milliseconds, and the largest number of queries made by a request.
+    """
+
+    send = getattr(client, method)
+    latencies, query_counts = [], []
+
+    response = send(make_url(0), **extra)
+    if response.status_code >= 400:
+        raise AssertionError(f"{method.upper()} {make_url(0)} responded with {response.status_code}.")
+
+    for i in range(1, requests + 1):
+        with CaptureQueriesContext(connections["default"]) as queries:
+            start = time.perf_counter()
+            send(make_url(i), **extra)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        query_counts.append(len(queries))
+
+    return {
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "queries": max(query_counts),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float, min_delta: float = 1.0,
+                          percentiles=("p50", "p95")) -> list:
+    """
+    Compares benchmark results with a baseline of the same benchmarks. Any increase of the query count is a
+    regression, latencies may increase by `tolerance`, or by `min_delta` for endpoints faster than that.
+    p99 isn't compared by default, a couple of slow requests, e.g. during garbage collection, move it too much.
+
+    :param results: Measurements by benchmark name, as returned by `measure_endpoint`.
+    :param baseline: Earlier measurements by benchmark name.
+    :param tolerance: Allowed relative increase of the latencies, e.g. `0.25` for 25%.
+    :param min_delta: Allowed absolute increase of the latencies in milliseconds, which hides timer noise.
+    :param percentiles: Latency percentiles to compare.
+    :return: descriptions of the regressions, empty if there are none.
+    """
+
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        expected = baseline[name]
+
+        if result["queries"] > expected["queries"]:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {expected['queries']}")
+
+        for key in percentiles:
+            if result[key] > max(expected[key] * (1 + tolerance), expected[key] + min_delta):
+                regressions.append(f"{name}: {key} {result[key]:.2f}ms, baseline {expected[key]:.2f}ms")
+
+    return regressions
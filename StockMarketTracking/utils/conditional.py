@@ -0,0 +1,146 @@
+import hashlib
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Func, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.pagination import LimitOffsetPagination
+
+
+def make_etag(*parts) -> str:
+    """
+    Returns a strong ETag for the given values, e.g. the columns that change whenever the response changes.
+    """
+
+    encoded = json.dumps(parts, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return f'"{hashlib.md5(encoded.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def get_not_modified(request, etag: str, last_modified=None):
+    """
+    Returns a `304 Not Modified` response when the validators of the client match, `None` otherwise.
+    `If-None-Match` takes precedence over `If-Modified-Since`.
+
+    :param request: Request from the client side.
+    :param etag: Current ETag of the resource.
+    :param last_modified: Current modification date of the resource, leave out when it isn't a reliable validator.
+    :return: response to send instead of the body, or `None`.
+    """
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        response["ETag"] = etag
+
+    return response
+
+
+def set_validators(response, etag: str, last_modified=None):
+    """
+    Adds the `ETag` and `Last-Modified` headers to a successful response.
+    """
+
+    if response.status_code == 200:
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Answers GET requests of a list view with `304 Not Modified`, without serializing the page, when it didn't
+    change since the client fetched it. The validators are computed with one query reading a few columns of the
+    rows of the requested page, or of all the rows when the paginator can't tell the page without reading it.
+
+    The ETag is a hash of `get_etag_fields` of every row, by default `etag_fields`, which must include every column
+    that changes without updating `last_modified_field`. The rows are hashed as they are, so values moving between
+    rows change the ETag too. Pages of `LimitOffsetPagination` also hash the number of rows, and take the latest
+    modification of any row, as rows before or after the page change the response too.
+    """
+
+    last_modified_field = None
+    etag_fields = ("pk",)
+    # Whether `last_modified_field` changes with every column of the response, so `If-Modified-Since` can be trusted.
+    validate_last_modified = True
+
+    def get_etag_fields(self) -> tuple:
+        """
+        Columns of the rows of the page that the ETag is built from, besides the latest modification.
+        """
+
+        return self.etag_fields
+
+    def get_etag_extra(self) -> tuple:
+        """
+        Values the response depends on besides the rows, e.g. the requesting user.
+        """
+
+        return ()
+
+    def get_page_queryset(self):
+        """
+        Returns the rows of the requested page. Pages of `LimitOffsetPagination` also carry the number of rows,
+        which the response includes, and the latest modification of any row, read in the same query.
+        """
+
+        queryset = self.get_queryset()
+        paginator = self.paginator
+
+        if paginator is not None and hasattr(paginator, "get_page_queryset"):
+            page = paginator.get_page_queryset(queryset, self.request, view=self)
+            return queryset if page is None else page
+
+        if isinstance(paginator, LimitOffsetPagination) and (limit := paginator.get_limit(self.request)) is not None:
+            offset = paginator.get_offset(self.request)
+            if not queryset.ordered:
+                queryset = queryset.order_by("pk")
+            totals = {
+                "etag_row_count": Func(F("pk"), function="COUNT"),
+                "etag_last_modified": Func(F(self.last_modified_field), function="MAX"),
+            }
+            return queryset.annotate(**{
+                alias: Subquery(queryset.order_by().values(**{alias: total})) for alias, total in totals.items()
+            })[offset:offset + limit]
+
+        return queryset
+
+    def get_validators(self):
+        """
+        Returns the ETag and the modification date of the requested page, `None` when the parameters of the
+        request can't be queried, so the view reports the error.
+        """
+
+        queryset = self.get_page_queryset()
+        if not queryset.ordered and not queryset.query.is_sliced:
+            queryset = queryset.order_by("pk")
+
+        if "etag_last_modified" in queryset.query.annotations:
+            fields = ("etag_last_modified", *self.get_etag_fields(), self.last_modified_field, "etag_row_count")
+        else:
+            fields = (self.last_modified_field, *self.get_etag_fields())
+
+        try:
+            rows = list(queryset.values_list(*fields))
+        except (ValidationError, ValueError, TypeError):  # e.g. cursor values of the wrong type.
+            return None
+
+        last_modified = max((row[0] for row in rows if row[0] is not None), default=None)
+
+        return make_etag(self.get_etag_extra(), rows), last_modified
+
+    def get(self, request, *args, **kwargs):
+        if (validators := self.get_validators()) is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+
+        not_modified = get_not_modified(request, etag, last_modified if self.validate_last_modified else None)
+        if not_modified is not None:
+            return not_modified
+
+        return set_validators(super().get(request, *args, **kwargs), etag, last_modified)
@@ -0,0 +1,154 @@
+import csv
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+
+from utils.iterables import batched
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def get_export_settings() -> dict:
+    """
+    Returns the `DATA_EXPORT` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "CHUNK_SIZE": 2000,
+        **getattr(settings, "DATA_EXPORT", {}),
+    }
+
+
+class _Echo:
+    """
+    File-like object returning what is written to it, so `csv.writer` formats rows without buffering them.
+    """
+
+    def write(self, value):
+        return value
+
+
+class Export:
+    """
+    An exportable table: its rows, the exported columns, and the columns the export can be filtered on.
+
+    Rows are read as tuples with `QuerySet.iterator`, `CHUNK_SIZE` at a time, and encoded one chunk at a time,
+    so memory doesn't grow with the size of the table.
+    """
+
+    def __init__(self, queryset, fields, author_field: str = None, date_field: str = None, owner_field: str = None):
+        """
+        :param queryset: Rows to export.
+        :param fields: Exported lookups, `__` is replaced by `_` in column names.
+        :param author_field: Foreign key to the user, filtered on by username.
+        :param date_field: Date time column, filtered on by range.
+        :param owner_field: Foreign key to the user, limiting the export to the rows of the requesting user.
+        """
+
+        self.queryset = queryset
+        self.fields = tuple(fields)
+        self.columns = tuple(field.replace("__", "_") for field in self.fields)
+        self.author_field = author_field
+        self.date_field = date_field
+        self.owner_field = owner_field
+
+    def filter(self, owner=None, author: str = None, since=None, until=None):
+        """
+        Returns the exported rows, in primary key order.
+
+        :param owner: Requesting user, only their rows are returned when the export has an `owner_field`.
+        :param author: Username of the author of the rows.
+        :param since: Earliest date time of the rows, inclusive.
+        :param until: Latest date time of the rows, exclusive.
+        :return: filtered queryset.
+        """
+
+        queryset = self.queryset.all()
+
+        if owner is not None and self.owner_field:
+            queryset = queryset.filter(**{self.owner_field: owner})
+        if author is not None:
+            queryset = queryset.filter(**{f"{self.author_field}__username": author})
+        if since is not None:
+            queryset = queryset.filter(**{f"{self.date_field}__gte": since})
+        if until is not None:
+            queryset = queryset.filter(**{f"{self.date_field}__lt": until})
+
+        return queryset.order_by("pk")
+
+    def encode(self, queryset, file_format: str, chunk_size: int = None):
+        """
+        Encodes the rows of the queryset lazily.
+
+        :param queryset: Rows returned by `filter`.
+        :param file_format: `ndjson` or `csv`.
+        :param chunk_size: Number of rows fetched from the database and encoded at once.
+        :return: generator of strings, one per chunk of rows.
+        """
+
+        chunk_size = chunk_size or get_export_settings()["CHUNK_SIZE"]
+        rows = queryset.values_list(*self.fields).iterator(chunk_size=chunk_size)
+
+        if file_format == "csv":
+            writer = csv.writer(_Echo())
+            yield writer.writerow(self.columns)
+
+            for chunk in batched(rows, chunk_size):
+                yield "".join(writer.writerow(row) for row in chunk)
+        else:
+            encoder = DjangoJSONEncoder()
+
+            for chunk in batched(rows, chunk_size):
+                yield "".join(f"{encoder.encode(dict(zip(self.columns, row)))}\n" for row in chunk)
+
+    def stream(self, queryset, file_format: str, filename: str) -> StreamingHttpResponse:
+        """
+        Returns the rows of the queryset as a file download, encoded while it is sent.
+
+        :param queryset: Rows returned by `filter`.
+        :param file_format: `ndjson` or `csv`.
+        :param filename: Name of the downloaded file, without extension.
+        :return: streaming response.
+        """
+
+        response = StreamingHttpResponse(self.encode(queryset, file_format), content_type=CONTENT_TYPES[file_format])
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{file_format}"'
+
+        return response
+
+
+class ExportRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the format and the filters of an export.
+    """
+
+    file_format = serializers.ChoiceField(choices=tuple(CONTENT_TYPES), default="ndjson")
+    author = serializers.CharField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def __init__(self, *args, export: Export, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.export = export
+
+    def validate(self, attrs):
+        if "author" in attrs and not self.export.author_field:
+            raise serializers.ValidationError({"author": "This export can't be filtered by author."})
+        if ("since" in attrs or "until" in attrs) and not self.export.date_field:
+            raise serializers.ValidationError("This export can't be filtered by date.")
+        if "since" in attrs and "until" in attrs and attrs["since"] >= attrs["until"]:
+            raise serializers.ValidationError({"until": "Must be later than since."})
+
+        return attrs
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
@@ -0,0 +1,40 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountAssertionsMixin:
+    """
+    Assertions about the number of queries made by list endpoints. Mix into `django.test.TestCase`.
+    """
+
+    def assertConstantQueryCount(self, url: str, page_sizes=(1, 5, 20), page_size_param="limit", data=None,
+                                 **extra) -> int:
+        """
+        Requests the url with each page size, and asserts that the number of queries stays the same.
+
+        :param url: List endpoint to request.
+        :param page_sizes: Page sizes to request the url with.
+        :param page_size_param: Query parameter used by the pagination for the page size.
+        :param data: Additional query parameters.
+        :param extra: Additional arguments for the test client, like headers.
+        :return: number of queries made for a single page.
+        """
+
+        query_counts = {}
+
+        # Warms up per-process caches, like the one of authenticated users, before counting.
+        self.client.get(url, {**(data or {}), page_size_param: page_sizes[0]}, **extra)
+
+        for page_size in page_sizes:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {**(data or {}), page_size_param: page_size}, **extra)
+
+            self.assertLess(response.status_code, 400, f"{url} responded with {response.status_code}.")
+            query_counts[page_size] = len(queries)
+
+        self.assertEqual(
+            len(set(query_counts.values())), 1,
+            f"Number of queries for {url} depends on the page size: {query_counts}"
+        )
+
+        return query_counts[page_sizes[0]]
@@ -43,9 +43,11 @@ INSTALLED_APPS = [
     # Custom Applications
     "user.apps.UserConfig",
     "tweet.apps.TweetConfig",
+    "benchmarks.apps.BenchmarksConfig",
 ]
 
 MIDDLEWARE = [
+    "utils.instrumentation.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -86,6 +88,36 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Serialized tweets, shared by the web workers and the management commands that invalidate them, so it must
+    # not be kept in the process. Use a memcached or redis backend when the workers run on several hosts.
+    "tweets": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "tweets",
+        "TIMEOUT": 60,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+            "CULL_FREQUENCY": 10,
+        },
+    },
+    # Users of authenticated requests, kept in the process for a short time.
+    "users": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "users",
+        "TIMEOUT": 30,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+            "CULL_FREQUENCY": 10,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -128,7 +160,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 20
@@ -166,3 +198,85 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
+
+# Tweet counters
+# `tweet.counters.ShardedCounterBackend` spreads increments of hot tweets over many rows,
+# run `python manage.py flush_tweet_counters --interval 5` next to the server when using it.
+TWEET_COUNTERS = {
+    "BACKEND": "tweet.counters.DirectCounterBackend",
+    "OPTIONS": {},
+}
+
+# Home timelines
+# Tweets are written into the feeds of followers on creation, except for authors with more than
+# `FANOUT_FOLLOWER_LIMIT` followers, whose tweets are pulled into a feed when it is read.
+# The fan-out runs after the commit, in the thread of the request, so keep the limit low.
+TWEET_FEEDS = {
+    "FANOUT_FOLLOWER_LIMIT": 1000,
+    "BATCH_SIZE": 1000,
+    "PULL_LIMIT": 200,
+}
+
+# Tweet detail cache, shared by the single and the batch detail views
+TWEET_CACHE = {
+    "ALIAS": "tweets",
+    "TIMEOUT": 60,
+    "LOCK_TIMEOUT": 5,
+}
+
+# Maximum number of tweets requested at once from the batch detail view
+TWEET_BATCH_MAX_IDS = 100
+
+# Maximum number of tweets published at once from the batch thread view
+TWEET_THREAD_BATCH_MAX_TWEETS = 100
+
+# Trending hashtags
+# Hashtag uses are rolled up per minute, and counted in running totals for each of the `WINDOWS`, so reads only
+# read the top rows. Run `python manage.py prune_trends` every minute to move the windows forward and drop old minutes.
+TWEET_TRENDS = {
+    "WINDOWS": (60, 24 * 60),
+    "WINDOW_MINUTES": 60,
+    "LIMIT": 10,
+    "MAX_LIMIT": 50,
+}
+
+# Async views
+# With `ENABLED`, the hot read endpoints are served as coroutines when running under ASGI (see asgi.py).
+# Database work runs in a thread pool, `THREAD_SENSITIVE` runs it on the single thread used for sync views instead.
+ASYNC_VIEWS = {
+    "ENABLED": False,
+    "THREAD_SENSITIVE": False,
+}
+
+# Users of authenticated requests, cached by `user.authentication.CachedJWTAuthentication`
+JWT_USER_CACHE = {
+    "ALIAS": "users",
+    "TIMEOUT": 30,
+}
+
+# Per-view performance metrics of a sample of the requests, by `utils.instrumentation.PerformanceMiddleware`
+# Exported for Prometheus at /metrics/ to `METRICS_ALLOWED_IPS`. `EXTRA_METRICS` are paths of functions
+# returning more counters by name. Requests slower than `SLOW_REQUEST_MS` are logged with their queries.
+PERFORMANCE_INSTRUMENTATION = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.1,
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_REQUEST_QUERIES": 10,
+    "METRICS_ALLOWED_IPS": ("127.0.0.1",),
+    "EXTRA_METRICS": ("tweet.cache.metrics",),
+}
+
+# Streamed exports of whole tables, by `utils.export`, rows are fetched and encoded `CHUNK_SIZE` at a time
+DATA_EXPORT = {
+    "CHUNK_SIZE": 2000,
+}
+
+# Serialize tweets with their copy of the author's username instead of joining the users.
+# Run `python manage.py backfill_author_usernames` before enabling it, `check_author_usernames` finds drift.
+TWEET_DENORMALIZED_AUTHOR = False
+
+# Largest conversation returned by the conversation view, in levels of replies and in tweets
+TWEET_CONVERSATION = {
+    "MAX_DEPTH": 10,
+    "MAX_SIZE": 1000,
+}
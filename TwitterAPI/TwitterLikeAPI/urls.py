@@ -16,9 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from utils import instrumentation
+
 urlpatterns = [
     path('admin/doc/', include('django.contrib.admindocs.urls')),
     path("admin/", admin.site.urls),
+    path("metrics/", instrumentation.metrics, name="metrics"),
     path("api-auth/", include('rest_framework.urls')),
     path("user/", include('user.urls', namespace="user")),
     path("tweet/", include('tweet.urls', namespace="tweet")),
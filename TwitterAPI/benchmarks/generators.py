@@ -0,0 +1,102 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from tweet import models
+from tweet import search
+from user.models import Follow
+from utils.iterables import batched
+
+
+def create_users(count: int, prefix: str = "bench", batch_size: int = 1000) -> list:
+    """
+    Creates users without a usable password, in batches.
+
+    :param count: Number of users to create.
+    :param prefix: Prefix of the usernames.
+    :param batch_size: Number of users per insert.
+    :return: IDs of the created users.
+    """
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        (User(username=f"{prefix}{i}", password="!") for i in range(count)), batch_size=batch_size
+    )
+
+    return list(User.objects.filter(username__startswith=prefix).values_list("id", flat=True))
+
+
+def create_tweets(author_ids, count: int, batch_size: int = 10000) -> int:
+    """
+    Creates tweets by random authors, in batches, so millions of tweets never live in memory at once.
+    Tweets are indexed for search, but not fanned out, see `create_timeline`.
+
+    :param author_ids: IDs of the users to pick authors from.
+    :param count: Number of tweets to create.
+    :param batch_size: Number of tweets per insert.
+    :return: number of created tweets.
+    """
+
+    for batch in batched(range(count), batch_size):
+        search.index_tweets(models.Tweet.objects.bulk_create([
+            models.Tweet(author_id=random.choice(author_ids), tweet=f"Benchmark tweet {i} #bench{i % 100}")
+            for i in batch
+        ]), batch_size=batch_size)
+
+    return count
+
+
+def create_likes(user_ids, count: int, batch_size: int = 10000) -> int:
+    """
+    Creates likes of random users on the newest tweets, in batches, and sets the like counts of the tweets.
+
+    :param user_ids: IDs of the users to pick likers from.
+    :param count: Number of likes to attempt, duplicates are skipped.
+    :param batch_size: Number of likes per insert.
+    :return: number of likes in the database.
+    """
+
+    tweet_ids = list(models.Tweet.objects.order_by("-id").values_list("id", flat=True)[:max(count // 10, 1)])
+
+    for batch in batched(range(count), batch_size):
+        models.Like.objects.bulk_create(
+            [models.Like(tweet_id=random.choice(tweet_ids), author_id=random.choice(user_ids)) for _ in batch],
+            ignore_conflicts=True,
+        )
+
+    like_count = models.Like.objects.filter(tweet_id=OuterRef("pk")).values("tweet_id").annotate(
+        count=Count("id")
+    ).values("count")
+    models.Tweet.objects.filter(id__in=tweet_ids).update(like_count=Coalesce(Subquery(like_count), 0))
+
+    return models.Like.objects.count()
+
+
+def create_timeline(owner_id: int, followee_ids, batch_size: int = 10000) -> int:
+    """
+    Makes the user follow the given users, and writes their tweets into the feed of the user.
+
+    :param owner_id: ID of the user whose timeline is filled.
+    :param followee_ids: IDs of the users to follow.
+    :param batch_size: Number of feed entries per insert.
+    :return: number of feed entries written.
+    """
+
+    Follow.objects.bulk_create([
+        Follow(follower_id=owner_id, followee_id=followee_id)
+        for followee_id in followee_ids if followee_id != owner_id
+    ], ignore_conflicts=True)
+
+    tweets = models.Tweet.objects.filter(author_id__in=followee_ids).values_list("id", "creation_datetime")
+    written = 0
+
+    for batch in batched(tweets.iterator(chunk_size=batch_size), batch_size):
+        models.FeedEntry.objects.bulk_create([
+            models.FeedEntry(owner_id=owner_id, tweet_id=tweet_id, creation_datetime=creation_datetime)
+            for tweet_id, creation_datetime in batch
+        ], ignore_conflicts=True)
+        written += len(batch)
+
+    return written
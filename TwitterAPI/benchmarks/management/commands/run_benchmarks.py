@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import generators
+from tweet.models import Tweet
+from utils.benchmark import benchmark_database, compare_with_baseline, measure_endpoint
+
+BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures latency percentiles and query counts of the tweet endpoints, and compares them with a baseline. "
+        "Runs against a throwaway test database, exits with an error on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Number of users to generate.")
+        parser.add_argument("--tweets", type=int, default=100000, help="Number of tweets to generate.")
+        parser.add_argument("--likes", type=int, default=100000, help="Number of likes to generate.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline file to compare with.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative latency increase.")
+        parser.add_argument(
+            "--min-delta", type=float, default=1.0, help="Allowed absolute latency increase in milliseconds."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            user_ids = generators.create_users(options["users"])
+            generators.create_tweets(user_ids, options["tweets"])
+            generators.create_likes(user_ids, options["likes"])
+            generators.create_timeline(user_ids[0], user_ids[1:51])
+
+            results = self.run_benchmarks(get_user_model().objects.get(id=user_ids[0]), options["requests"])
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} p50 {result['p50']:8.2f}ms  p95 {result['p95']:8.2f}ms  p99 {result['p99']:8.2f}ms  "
+                f"{result['queries']:3} queries"
+            )
+
+        if options["save_baseline"]:
+            options["baseline"].write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+            self.stdout.write(f"Saved the baseline to {options['baseline']}.")
+        elif options["baseline"].exists():
+            regressions = compare_with_baseline(
+                results, json.loads(options["baseline"].read_text()), options["tolerance"], options["min_delta"]
+            )
+
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+            self.stdout.write("No regressions against the baseline.")
+
+    @staticmethod
+    def run_benchmarks(user, requests: int) -> dict:
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        tweet_id = Tweet.objects.order_by("-id").values_list("id", flat=True).first()
+
+        return {
+            "TweetsListView": measure_endpoint(
+                client, "get", lambda i: reverse("tweet:TweetsListView"), requests, data={"limit": 20}
+            ),
+            "TweetDetailView": measure_endpoint(
+                client, "get", lambda i: reverse("tweet:TweetDetailView", kwargs={"tweet_id": tweet_id}), requests
+            ),
+            "LikeUnlikeTweetView": measure_endpoint(
+                client, "post", lambda i: reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": tweet_id}),
+                requests
+            ),
+            "TimelineView": measure_endpoint(
+                client, "get", lambda i: reverse("tweet:TimelineView"), requests, data={"limit": 20}
+            ),
+            "SearchTweetsView": measure_endpoint(
+                client, "get", lambda i: reverse("tweet:SearchTweetsView"), requests, data={"q": "#bench7"}
+            ),
+        }
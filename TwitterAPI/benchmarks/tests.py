@@ -0,0 +1,35 @@
+from django.test import TestCase
+
+from benchmarks import generators
+from tweet.models import FeedEntry, Like, Tweet, TweetToken
+from utils.benchmark import compare_with_baseline, percentile
+
+
+class TestBenchmarkHelpers(TestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2.5)
+        self.assertEqual(percentile(range(101), 95), 95)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_compare_with_baseline(self):
+        baseline = {"TweetsListView": {"p50": 10, "p95": 20, "p99": 30, "queries": 3}}
+
+        self.assertEqual(compare_with_baseline(
+            {"TweetsListView": {"p50": 12, "p95": 20, "p99": 90, "queries": 3}}, baseline, tolerance=0.25
+        ), [])
+        self.assertEqual(len(compare_with_baseline(
+            {"TweetsListView": {"p50": 13, "p95": 20, "p99": 30, "queries": 4}}, baseline, tolerance=0.25
+        )), 2)
+
+    def test_generators(self):
+        user_ids = generators.create_users(5)
+        generators.create_tweets(user_ids, 50, batch_size=20)
+        likes = generators.create_likes(user_ids, 30)
+
+        self.assertEqual(Tweet.objects.count(), 50)
+        self.assertTrue(TweetToken.objects.exists())
+        self.assertEqual(likes, Like.objects.count())
+        self.assertEqual(sum(Tweet.objects.values_list("like_count", flat=True)), likes)
+
+        written = generators.create_timeline(user_ids[0], user_ids[1:])
+        self.assertEqual(FeedEntry.objects.filter(owner_id=user_ids[0]).count(), written)
@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.db.models import Q
 
 from tweet import models
+from tweet import search
 
 
 @admin.register(models.Tweet)
@@ -20,6 +22,18 @@ class TweetAdmin(admin.ModelAdmin):
     )
 
     list_display = ("author_username", "striped_tweet", "creation_datetime", "update_datetime")
-    search_fields = ("tweet", "get_author_username")
+    search_fields = ("author__username",)
     list_filter = ("creation_datetime", "update_datetime")
     autocomplete_fields = ("author",)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Searches the tweet text through the search index instead of scanning it, and the author by username.
+        """
+
+        if not search_term:
+            return queryset, False
+
+        by_text = search.search_queryset(search_term, queryset=queryset).values("id")
+
+        return queryset.filter(Q(id__in=by_text) | Q(author__username__iexact=search_term)), False
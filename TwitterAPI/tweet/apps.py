@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TweetConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tweet"
+
+    def ready(self):
+        # Connects the receivers of `tweet.signals`, and of user changes.
+        from tweet import authors, feeds, profiles, search, trends  # noqa: F401
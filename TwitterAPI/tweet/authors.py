@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from tweet import cache, models
+from utils.iterables import batched
+
+
+def is_denormalized() -> bool:
+    """
+    Whether tweets are serialized with their `author_username` column, through the `TWEET_DENORMALIZED_AUTHOR`
+    setting, instead of joining the users. Enable it once `backfill_author_usernames` has run.
+    """
+
+    return getattr(settings, "TWEET_DENORMALIZED_AUTHOR", False)
+
+
+def _update_author_usernames(tweet_ids, batch_size: int) -> None:
+    username = get_user_model().objects.filter(pk=OuterRef("author_id")).values("username")[:1]
+
+    for batch in batched(tweet_ids, batch_size):
+        models.Tweet.objects.filter(id__in=batch).update(author_username=Subquery(username))
+
+    cache.tweet_payloads.invalidate(*tweet_ids)
+
+
+def _id_ranges(batch_size: int):
+    """
+    Splits the tweet IDs into consecutive ranges of `batch_size` tweets, so the table is walked through the
+    primary key index instead of being scanned at once.
+    """
+
+    last_id = 0
+
+    while True:
+        bound = list(models.Tweet.objects.filter(id__gt=last_id).order_by("id").values_list(
+            "id", flat=True
+        )[batch_size - 1:batch_size])
+
+        if not bound:
+            yield last_id, None
+            return
+
+        yield last_id, bound[0]
+        last_id = bound[0]
+
+
+def sync_author_usernames(only_blank: bool = False, repair: bool = True, batch_size: int = 10000) -> int:
+    """
+    Finds the tweets whose `author_username` doesn't match the username of their author, and repairs them.
+
+    :param only_blank: Only look at tweets without `author_username`, e.g. when backfilling, no join is needed then.
+    :param repair: Whether to update the drifted tweets, or only count them.
+    :param batch_size: Number of tweets checked per query.
+    :return: number of drifted tweets.
+    """
+
+    drifted = 0
+
+    for after_id, until_id in _id_ranges(batch_size):
+        tweets = models.Tweet.objects.filter(id__gt=after_id)
+        if until_id is not None:
+            tweets = tweets.filter(id__lte=until_id)
+
+        if only_blank:
+            tweets = tweets.filter(author_username="")
+        else:
+            tweets = tweets.exclude(author_username=F("author__username"))
+
+        tweet_ids = list(tweets.values_list("id", flat=True))
+        drifted += len(tweet_ids)
+
+        if repair and tweet_ids:
+            _update_author_usernames(tweet_ids, batch_size)
+
+    return drifted
+
+
+@receiver(post_init, sender=get_user_model())
+def remember_username(sender, instance, **kwargs):
+    """
+    Keeps the username the user was loaded with, without loading it when deferred.
+    """
+
+    instance._loaded_username = instance.__dict__.get("username")
+
+
+@receiver(post_save, sender=get_user_model())
+def propagate_username(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Copies a changed username onto the tweets of the user, in the transaction of the change.
+    """
+
+    if created or raw or (update_fields is not None and "username" not in update_fields):
+        return
+    if instance.username == getattr(instance, "_loaded_username", None):
+        return
+
+    tweet_ids = list(models.Tweet.objects.filter(author_id=instance.pk).exclude(
+        author_username=instance.username
+    ).values_list("id", flat=True))
+
+    if tweet_ids:
+        _update_author_usernames(tweet_ids, batch_size=10000)
+
+    instance._loaded_username = instance.username
@@ -0,0 +1,210 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss counters of a cache in this process.
+    """
+
+    FIELDS = ("hits", "misses", "rebuilds", "waits", "invalidations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def increment(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+class TweetPayloadCache:
+    """
+    Read-through cache of serialized tweets, stored in the Django cache configured by the `TWEET_CACHE` setting.
+
+    On a miss only one caller rebuilds the payload, others wait for it for up to `LOCK_TIMEOUT` seconds
+    before rebuilding it themselves, so a viral tweet dropping out of the cache doesn't stampede the database.
+    """
+
+    key_prefix = "tweet:payload"
+    parent_fields = ("retweet_id", "thread_id", "root_tweet_id")
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @property
+    def config(self) -> dict:
+        return {
+            "ALIAS": "default",
+            "TIMEOUT": 60,
+            "LOCK_TIMEOUT": 5,
+            "LOCK_POLL_INTERVAL": 0.02,
+            **getattr(settings, "TWEET_CACHE", {}),
+        }
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def make_key(self, tweet_id: int) -> str:
+        return f"{self.key_prefix}:{tweet_id}"
+
+    def get(self, tweet_id: int, build):
+        """
+        Returns the cached payload of the tweet, or builds and caches it on a miss.
+
+        :param tweet_id: ID of the tweet.
+        :param build: Function returning the payload of the tweet, may raise if the tweet doesn't exist.
+        :return: payload of the tweet.
+        """
+
+        key = self.make_key(tweet_id)
+        payload = self._drop_orphans({tweet_id: self.cache.get(key)}).get(tweet_id)
+
+        if payload is not None:
+            self.stats.increment("hits")
+            return payload
+
+        self.stats.increment("misses")
+        return self._rebuild(key, build)
+
+    def get_many(self, tweet_ids, build_many) -> dict:
+        """
+        Returns the cached payloads of the tweets, and builds the missing ones at once.
+
+        Missing payloads are locked like the rebuilds of `get`, without waiting for the payloads other callers are
+        building. Only the payloads whose lock is still held after the build are cached, the others were invalidated
+        or are being rebuilt by someone else.
+
+        :param tweet_ids: IDs of the tweets.
+        :param build_many: Function returning the payloads of the given tweet IDs that exist, mapped by tweet ID.
+        :return: payloads of the existing tweets, mapped by tweet ID.
+        """
+
+        keys = {self.make_key(tweet_id): tweet_id for tweet_id in tweet_ids}
+        payloads = self._drop_orphans({keys[key]: payload for key, payload in self.cache.get_many(list(keys)).items()})
+
+        self.stats.increment("hits", len(payloads))
+        if not (missing_ids := [tweet_id for tweet_id in tweet_ids if tweet_id not in payloads]):
+            return payloads
+
+        self.stats.increment("misses", len(missing_ids))
+        config, token = self.config, uuid.uuid4().hex
+        locks = {
+            f"{self.make_key(tweet_id)}:lock": tweet_id for tweet_id in missing_ids
+            if self.cache.add(f"{self.make_key(tweet_id)}:lock", token, timeout=config["LOCK_TIMEOUT"])
+        }
+
+        try:
+            self.stats.increment("rebuilds", len(locks))
+            built_payloads = build_many(missing_ids)
+
+            # An invalidation during the build removes the lock, the payload might already be stale then.
+            held = [locks[lock_key] for lock_key, value in self.cache.get_many(list(locks)).items() if value == token]
+            self.cache.set_many(
+                {self.make_key(tweet_id): built_payloads[tweet_id] for tweet_id in held if tweet_id in built_payloads},
+                timeout=config["TIMEOUT"],
+            )
+
+            return {**payloads, **built_payloads}
+        finally:
+            self.cache.delete_many([
+                lock_key for lock_key, value in self.cache.get_many(list(locks)).items() if value == token
+            ])
+
+    def invalidate(self, *tweet_ids) -> None:
+        """
+        Removes the tweets from the cache. Rebuilds that are in progress for them won't be cached either.
+
+        :param tweet_ids: IDs of the changed tweets.
+        :return: None
+        """
+
+        keys = [self.make_key(tweet_id) for tweet_id in tweet_ids if tweet_id is not None]
+        self.cache.delete_many(keys + [f"{key}:lock" for key in keys])
+        self.stats.increment("invalidations", len(keys))
+
+    def forget_children(self, tweet_id: int) -> None:
+        """
+        Stops serving the cached retweets and threads of a deleted tweet, without looking them up. Payloads cached
+        before the delete expire within `TIMEOUT`, so the mark is kept as long.
+
+        :param tweet_id: ID of the deleted tweet.
+        :return: None
+        """
+
+        self.cache.set(f"{self.key_prefix}:deleted:{tweet_id}", True, timeout=self.config["TIMEOUT"])
+
+    def _drop_orphans(self, payloads: dict) -> dict:
+        """
+        Removes the payloads whose retweeted, thread or original tweet was deleted, from the result and the cache.
+        """
+
+        parents = {
+            f"{self.key_prefix}:deleted:{payload[field]}": tweet_id
+            for tweet_id, payload in payloads.items() if payload is not None
+            for field in self.parent_fields if payload.get(field) is not None
+        }
+        if not parents:
+            return payloads
+
+        orphans = {parents[key] for key in self.cache.get_many(list(parents))}
+        if orphans:
+            self.cache.delete_many([self.make_key(tweet_id) for tweet_id in orphans])
+
+        return {tweet_id: payload for tweet_id, payload in payloads.items() if tweet_id not in orphans}
+
+    def _rebuild(self, key: str, build):
+        lock_key, token = f"{key}:lock", uuid.uuid4().hex
+        config = self.config
+
+        if not self.cache.add(lock_key, token, timeout=config["LOCK_TIMEOUT"]):
+            # Someone else is rebuilding, wait for their payload instead of hitting the database too.
+            self.stats.increment("waits")
+            deadline = time.monotonic() + config["LOCK_TIMEOUT"]
+
+            while time.monotonic() < deadline:
+                time.sleep(config["LOCK_POLL_INTERVAL"])
+
+                if (payload := self.cache.get(key)) is not None:
+                    return payload
+                if self.cache.get(lock_key) is None:  # The rebuild failed, or was invalidated.
+                    break
+
+            return build()
+
+        try:
+            self.stats.increment("rebuilds")
+            payload = build()
+
+            # An invalidation during the rebuild removes the lock, the payload might already be stale then.
+            if self.cache.get(lock_key) == token:
+                self.cache.set(key, payload, timeout=config["TIMEOUT"])
+
+            return payload
+        finally:
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+
+tweet_payloads = TweetPayloadCache()
+
+
+def metrics() -> dict:
+    """
+    Counters of `tweet_payloads` in this process, exported by `utils.instrumentation.metrics`.
+    """
+
+    return {f"tweet_payload_cache_{field}_total": value for field, value in tweet_payloads.stats.as_dict().items()}
@@ -0,0 +1,30 @@
+from tweet import counters, retweets
+from utils.conditional import ConditionalListMixin
+
+
+class TweetListConditionalMixin(ConditionalListMixin):
+    """
+    Conditional GET for list views of tweets. Counters change without touching `update_datetime`, so they are
+    part of the ETag, and `If-Modified-Since` alone never answers `304`.
+    """
+
+    last_modified_field = "update_datetime"
+    etag_fields = ("id", "like_count", "retweet_count", "root_tweet_id")
+    validate_last_modified = False
+
+    def get_etag_fields(self) -> tuple:
+        fields = super().get_etag_fields()
+
+        if retweets.is_requested(self.request):
+            fields += ("root_tweet__update_datetime", "root_tweet__like_count", "root_tweet__retweet_count")
+
+        return fields
+
+    def get_etag_extra(self) -> tuple:
+        """
+        The pending counter increments, and the viewer when the page tells what they liked and retweeted.
+        """
+
+        viewer = self.request.user.id if self.include_viewer_state() else None
+
+        return counters.get_pending_version(), viewer, retweets.is_requested(self.request)
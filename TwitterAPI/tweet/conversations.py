@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.db.models.expressions import RawSQL
+
+from tweet import models
+
+
+def get_conversation_settings() -> dict:
+    """
+    Returns the `TWEET_CONVERSATION` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "MAX_DEPTH": 10,
+        "MAX_SIZE": 1000,
+        **getattr(settings, "TWEET_CONVERSATION", {}),
+    }
+
+
+def _descendant_ids(tweet_id: int, max_depth: int, limit: int) -> RawSQL:
+    """
+    Recursive CTE walking the thread replies below the tweet, level by level, without passing through deleted
+    tweets. At most `limit` IDs are returned, the shallowest first.
+    """
+
+    meta = models.Tweet._meta
+    table = meta.db_table
+    id_column = meta.pk.column
+    thread_column = meta.get_field("thread").column
+    deleted_column = meta.get_field("deleted_datetime").column
+
+    return RawSQL(
+        f'WITH RECURSIVE conversation (id, depth) AS ('
+        f'  SELECT "{id_column}", 0 FROM "{table}" WHERE "{id_column}" = %s AND "{deleted_column}" IS NULL'
+        f'  UNION ALL'
+        f'  SELECT reply."{id_column}", conversation.depth + 1 FROM "{table}" reply'
+        f'  INNER JOIN conversation ON reply."{thread_column}" = conversation.id'
+        f'  WHERE conversation.depth < %s AND reply."{deleted_column}" IS NULL'
+        f') SELECT id FROM conversation ORDER BY depth, id LIMIT %s',
+        (tweet_id, max_depth, limit),
+    )
+
+
+def get_conversation_queryset(tweet_id: int, max_depth: int, max_size: int):
+    """
+    Returns the tweet and its replies down to `max_depth` levels, in a single query. One more tweet than
+    `max_size` is returned when the conversation is larger, to tell that it was truncated.
+
+    :param tweet_id: ID of the tweet at the root of the conversation.
+    :param max_depth: Number of levels of replies to return.
+    :param max_size: Number of tweets to return, the root included.
+    :return: Django Query
+    """
+
+    return models.Tweet.objects.filter(id__in=_descendant_ids(tweet_id, max_depth, max_size + 1))
+
+
+def build_tree(tweet_id: int, payloads, max_size: int):
+    """
+    Nests the serialized tweets under their thread parent, as `replies` ordered by creation. Only the `max_size`
+    shallowest tweets are kept.
+
+    :param tweet_id: ID of the tweet at the root of the conversation.
+    :param payloads: Serialized tweets of the conversation, with their `id` and `thread_id`.
+    :param max_size: Number of tweets to keep, the root included.
+    :return: payload of the root tweet, or `None` if it isn't part of the payloads, and whether tweets were dropped.
+    """
+
+    nodes = {payload["id"]: {**payload, "replies": []} for payload in payloads}
+    depths = {tweet_id: 0}
+
+    def get_depth(node_id):
+        if node_id not in depths:
+            depths[node_id] = get_depth(nodes[node_id]["thread_id"]) + 1
+        return depths[node_id]
+
+    if tweet_id not in nodes:
+        return None, False
+
+    kept = sorted(nodes, key=lambda node_id: (get_depth(node_id), node_id))[:max_size]
+
+    for node_id in sorted(kept, key=lambda node_id: (nodes[node_id]["creation_datetime"], node_id)):
+        if node_id != tweet_id:
+            nodes[nodes[node_id]["thread_id"]]["replies"].append(nodes[node_id])
+
+    return nodes[tweet_id], len(kept) < len(nodes)
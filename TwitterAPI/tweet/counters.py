@@ -0,0 +1,194 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils.module_loading import import_string
+
+from tweet import models
+
+COUNTERS = ("like_count", "retweet_count", "thread_count")
+
+
+class DirectCounterBackend:
+    """
+    Writes every increment straight into the tweet row. Counts are always exact, but every increment on a
+    tweet contends for the same row.
+    """
+
+    def increment(self, tweet: models.Tweet, counter: str, amount: int = 1) -> None:
+        """
+        Adds `amount` to the counter of the tweet and refreshes the counter on the instance.
+
+        :param tweet: Tweet to update the counter of.
+        :param counter: Name of the counter, one of `COUNTERS`.
+        :param amount: Value to add to the counter, negative to decrement.
+        :return: None
+        """
+
+        tweet.increment_counter(counter, amount)
+
+    def hydrate(self, tweets) -> None:
+        """
+        Sets the current value of every counter on the given tweets. Nothing is pending for this backend.
+        """
+
+    def get_pending_version(self):
+        """
+        Summary of the pending increments. Nothing is pending for this backend.
+        """
+
+        return None
+
+    def flush(self, batch_size: int = 1000) -> int:
+        """
+        Folds pending increments into the tweets. Nothing is pending for this backend.
+        """
+
+        return 0
+
+
+class ShardedCounterBackend:
+    """
+    Writes increments into one of `shards` rows of `tweet.models.TweetCounterShard`, picked at random,
+    and folds them into the tweet rows when `flush` is called.
+    Reads return the value stored on the tweet plus the pending increments.
+    """
+
+    def __init__(self, shards: int = 16):
+        self.shards = shards
+
+    def increment(self, tweet: models.Tweet, counter: str, amount: int = 1) -> None:
+        shard = random.randrange(self.shards)
+        shard_row = models.TweetCounterShard.objects.filter(tweet_id=tweet.id, counter=counter, shard=shard)
+
+        if not shard_row.update(delta=F("delta") + amount):
+            try:
+                with transaction.atomic():
+                    models.TweetCounterShard.objects.create(
+                        tweet_id=tweet.id, counter=counter, shard=shard, delta=amount
+                    )
+            except IntegrityError:  # Created by a concurrent increment in the meantime.
+                shard_row.update(delta=F("delta") + amount)
+
+        self.hydrate([tweet])
+
+    def get_pending_version(self):
+        """
+        Summary of the pending increments, changes whenever one is written or folded.
+        """
+
+        return list(models.TweetCounterShard.objects.aggregate(
+            count=Count("id"), last_id=Max("id"), total=Sum("delta"),
+        ).values())
+
+    def hydrate(self, tweets) -> None:
+        tweets = {tweet.id: tweet for tweet in tweets if tweet.id is not None}
+        if not tweets:
+            return
+
+        # Base values and pending increments are read in one statement, so a concurrent flush
+        # can't make an increment appear twice or not at all.
+        rows = models.Tweet.objects.filter(id__in=tweets).values("id", *COUNTERS).annotate(**{
+            f"pending_{counter}": Sum("counter_shards__delta", filter=Q(counter_shards__counter=counter))
+            for counter in COUNTERS
+        })
+
+        for row in rows:
+            for counter in COUNTERS:
+                setattr(tweets[row["id"]], counter, row[counter] + (row[f"pending_{counter}"] or 0))
+
+    def flush(self, batch_size: int = 1000) -> int:
+        """
+        Folds pending increments into the tweet rows, `batch_size` shard rows per transaction.
+
+        :param batch_size: Number of shard rows to fold per transaction.
+        :return: number of shard rows folded.
+        """
+
+        flushed = 0
+
+        while True:
+            with transaction.atomic():
+                shards = list(
+                    models.TweetCounterShard.objects.select_for_update().order_by("id")
+                    .values_list("id", "tweet_id", "counter", "delta")[:batch_size]
+                )
+                if not shards:
+                    return flushed
+
+                deltas = defaultdict(lambda: defaultdict(int))
+                for _, tweet_id, counter, delta in shards:
+                    deltas[tweet_id][counter] += delta
+
+                for tweet_id, tweet_deltas in deltas.items():
+                    updates = {counter: F(counter) + delta for counter, delta in tweet_deltas.items() if delta}
+                    if updates:
+                        models.Tweet.objects.filter(id=tweet_id).update(**updates)
+
+                # Increments blocked on the locked rows find them gone, and start a new shard row.
+                models.TweetCounterShard.objects.filter(id__in=[shard[0] for shard in shards]).delete()
+
+            flushed += len(shards)
+
+
+def get_backend():
+    """
+    Creates the counter backend configured through the `TWEET_COUNTERS` setting.
+    """
+
+    config = getattr(settings, "TWEET_COUNTERS", {})
+    backend = import_string(config.get("BACKEND", "tweet.counters.DirectCounterBackend"))
+
+    return backend(**config.get("OPTIONS", {}))
+
+
+def increment(tweet: models.Tweet, counter: str, amount: int = 1) -> None:
+    """
+    Adds `amount` to the counter of the tweet through the configured backend.
+    """
+
+    get_backend().increment(tweet, counter, amount)
+
+
+def hydrate(tweets) -> None:
+    """
+    Sets the current value, including pending increments, of every counter on the given tweets.
+    """
+
+    get_backend().hydrate(tweets)
+
+
+def get_pending_version():
+    """
+    Returns a value that changes whenever increments are pending or folded, `None` when they are never pending.
+    Counter columns alone don't tell whether counters changed then, e.g. for HTTP validators.
+    """
+
+    return get_backend().get_pending_version()
+
+
+def flush(batch_size: int = 1000) -> int:
+    """
+    Folds pending increments into the tweet rows, returns the number of pending rows that were folded.
+    """
+
+    return get_backend().flush(batch_size=batch_size)
+
+
+class PendingCountersMixin:
+    """
+    Adds pending counter increments to every tweet of the page, and to the original tweets joined with them,
+    for list views of tweets.
+    """
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        tweets = page if page is not None else []
+        hydrate([*tweets, *(
+            tweet.root_tweet for tweet in tweets
+            if models.Tweet.root_tweet.is_cached(tweet) and tweet.root_tweet is not None
+        )])
+
+        return page
@@ -0,0 +1,23 @@
+from tweet import models
+from utils.export import Export
+
+TWEET_FIELDS = (
+    "id", "author_id", "author__username", "tweet", "creation_datetime", "update_datetime",
+    "like_count", "retweet_count", "thread_count", "retweet_id", "thread_id",
+)
+
+# Tables served by `ExportView` and the `export_data` command, by name.
+EXPORTS = {
+    "tweets": Export(
+        models.Tweet.objects.all(), TWEET_FIELDS, author_field="author", date_field="creation_datetime",
+    ),
+    "retweets": Export(
+        models.Tweet.objects.filter(retweet__isnull=False), TWEET_FIELDS,
+        author_field="author", date_field="creation_datetime",
+    ),
+    "likes": Export(
+        models.Like.objects.filter(tweet__deleted_datetime__isnull=True),
+        ("id", "tweet_id", "author_id", "author__username", "creation_datetime"),
+        author_field="author", date_field="creation_datetime",
+    ),
+}
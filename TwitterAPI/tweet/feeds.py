@@ -0,0 +1,155 @@
+from collections import defaultdict
+from itertools import chain
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tweet import models
+from tweet.signals import tweets_created
+from user.models import Follow, ProfileStats
+from utils.iterables import batched
+from utils.pagination import KeysetPagination
+
+
+def get_feed_settings() -> dict:
+    """
+    Returns the `TWEET_FEEDS` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "FANOUT_FOLLOWER_LIMIT": 1000,
+        "BATCH_SIZE": 1000,
+        "PULL_LIMIT": 200,
+        **getattr(settings, "TWEET_FEEDS", {}),
+    }
+
+
+def fan_out(tweets, batch_size: int = None) -> int:
+    """
+    Writes the tweets into the feeds of their authors and of the authors' followers, `batch_size` rows per insert.
+    Followers of authors with more than `FANOUT_FOLLOWER_LIMIT` followers are skipped, they get these tweets
+    through `pull` when reading their timeline.
+
+    :param tweets: Newly created tweets.
+    :param batch_size: Number of followers to write feed entries for per insert.
+    :return: number of feed entries written.
+    """
+
+    config = get_feed_settings()
+    batch_size = batch_size or config["BATCH_SIZE"]
+
+    tweets_by_author = defaultdict(list)
+    for tweet in tweets:
+        tweets_by_author[tweet.author_id].append(tweet)
+
+    pulled_authors = set(ProfileStats.objects.filter(
+        user_id__in=tweets_by_author, follower_count__gt=config["FANOUT_FOLLOWER_LIMIT"]
+    ).values_list("user_id", flat=True))
+
+    written = 0
+
+    for author_id, author_tweets in tweets_by_author.items():
+        owners = [author_id]
+        if author_id not in pulled_authors:
+            owners = chain(owners, Follow.objects.filter(followee_id=author_id).values_list(
+                "follower_id", flat=True
+            ).iterator(chunk_size=batch_size))
+
+        for owner_ids in batched(owners, batch_size):
+            entries = [
+                models.FeedEntry(owner_id=owner_id, tweet_id=tweet.id, creation_datetime=tweet.creation_datetime)
+                for owner_id in owner_ids
+                for tweet in author_tweets
+            ]
+            models.FeedEntry.objects.bulk_create(entries, batch_size=batch_size, ignore_conflicts=True)
+            written += len(entries)
+
+    return written
+
+
+def pull(owner_id: int) -> int:
+    """
+    Fan-out on read, copies tweets posted since the last pull by followed authors that are skipped by `fan_out`
+    into the feed of the user. At most `PULL_LIMIT` of the newest tweets are copied.
+
+    :param owner_id: ID of the user reading the timeline.
+    :return: number of feed entries written.
+    """
+
+    config = get_feed_settings()
+    follows = list(Follow.objects.filter(
+        follower_id=owner_id, followee__stats__follower_count__gt=config["FANOUT_FOLLOWER_LIMIT"]
+    ).values_list("followee_id", "pulled_datetime"))
+
+    if not follows:
+        return 0
+
+    pulled_datetime = timezone.now()
+    new_tweets = Q()
+    for followee_id, last_pulled_datetime in follows:
+        new_tweets |= Q(author_id=followee_id, creation_datetime__gt=last_pulled_datetime)
+
+    tweets = models.Tweet.objects.filter(new_tweets, creation_datetime__lte=pulled_datetime).order_by(
+        "-creation_datetime", "-id"
+    ).values_list("id", "creation_datetime")[:config["PULL_LIMIT"]]
+
+    with transaction.atomic():
+        entries = models.FeedEntry.objects.bulk_create([
+            models.FeedEntry(owner_id=owner_id, tweet_id=tweet_id, creation_datetime=creation_datetime)
+            for tweet_id, creation_datetime in tweets
+        ], ignore_conflicts=True)
+        Follow.objects.filter(
+            follower_id=owner_id, followee_id__in=[followee_id for followee_id, _ in follows]
+        ).update(pulled_datetime=pulled_datetime)
+
+    return len(entries)
+
+
+def forget_followee(owner_id: int, followee_id: int) -> int:
+    """
+    Removes the tweets of an unfollowed author from the feed of the user.
+
+    :param owner_id: ID of the user who unfollowed.
+    :param followee_id: ID of the unfollowed author.
+    :return: number of feed entries removed.
+    """
+
+    removed, _ = models.FeedEntry.objects.filter(owner_id=owner_id, tweet__author_id=followee_id).delete()
+
+    return removed
+
+
+def get_timeline_queryset(owner_id: int):
+    """
+    Returns the tweets in the feed of the user, to be paginated with `TimelinePagination`.
+    Pages are read as a single range of the (owner, creation_datetime, tweet) index of the feed.
+
+    :param owner_id: ID of the user to get the timeline of.
+    :return: Django Query
+    """
+
+    return models.Tweet.objects.filter(feed_entries__owner_id=owner_id).annotate(
+        feed_datetime=F("feed_entries__creation_datetime"),
+        feed_tweet_id=F("feed_entries__tweet_id"),
+    )
+
+
+class TimelinePagination(KeysetPagination):
+    """
+    Keyset pagination on the columns of the feed entries, so the database never sorts the timeline.
+    """
+
+    ordering = ("-feed_datetime", "-feed_tweet_id")
+
+
+@receiver(tweets_created)
+def fan_out_created_tweets(sender, tweets, **kwargs):
+    """
+    Fans out new tweets once they are committed. There is no background worker, the feed entries are written in
+    the thread of the request, so `FANOUT_FOLLOWER_LIMIT` bounds the work of a single request.
+    """
+
+    transaction.on_commit(lambda: fan_out(tweets))
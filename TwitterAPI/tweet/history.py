@@ -0,0 +1,98 @@
+import json
+from difflib import SequenceMatcher
+
+from django.db import transaction
+
+from tweet import models
+
+
+def _dump(operations: list) -> str:
+    return json.dumps(operations, separators=(",", ":"), ensure_ascii=False)
+
+
+def make_delta(source: str, target: str) -> str:
+    """
+    Returns a compact delta turning `source` into `target`, a JSON list of `[start, end]` ranges copied from
+    `source` and of inserted texts. The whole target is stored instead when that is shorter.
+
+    :param source: Text the delta is applied to.
+    :param target: Text the delta rebuilds.
+    :return: JSON text of the delta.
+    """
+
+    operations = []
+
+    for tag, source_start, source_end, target_start, target_end in SequenceMatcher(
+        None, source, target, autojunk=False
+    ).get_opcodes():
+        if tag == "equal":
+            operations.append([source_start, source_end])
+        elif tag != "delete":
+            operations.append(target[target_start:target_end])
+
+    return min(_dump(operations), _dump([target]), key=len)
+
+
+def apply_delta(source: str, delta: str) -> str:
+    """
+    Rebuilds the text that `make_delta` was given as target, from its source.
+    """
+
+    return "".join(
+        source[operation[0]:operation[1]] if isinstance(operation, list) else operation
+        for operation in json.loads(delta)
+    )
+
+
+def edit_tweet(tweet: models.Tweet, text: str):
+    """
+    Replaces the text of the tweet, and keeps the replaced version as a revision. Only the text and the update date
+    are written. The tweet row is locked, so concurrent edits get consecutive versions.
+
+    :param tweet: Tweet to edit.
+    :param text: New text of the tweet.
+    :return: the replaced text, read under the lock, or `None` when the text didn't change.
+    """
+
+    with transaction.atomic():
+        current = models.Tweet.objects.select_for_update().only("tweet", "update_datetime").get(id=tweet.id)
+
+        if current.tweet == text:
+            return None
+
+        last_version = current.revisions.order_by("-version").values_list("version", flat=True).first() or 0
+        models.TweetRevision.objects.create(
+            tweet=current,
+            version=last_version + 1,
+            delta=make_delta(text, current.tweet),
+            creation_datetime=current.update_datetime,
+        )
+
+        tweet.tweet = text
+        tweet.save(update_fields=["tweet", "update_datetime"])
+
+    return current.tweet
+
+
+def get_versions(tweet: models.Tweet, since_version: int = 1) -> list:
+    """
+    Rebuilds the versions of the tweet, newest first, from the text of the tweet and one delta per older version.
+
+    :param tweet: Tweet to get the history of.
+    :param since_version: Oldest version to rebuild, only the deltas down to it are read.
+    :return: dicts with the version number, the text and the date the version was written.
+    """
+
+    revisions = list(tweet.revisions.filter(version__gte=since_version).order_by("-version").values_list(
+        "version", "delta", "creation_datetime"
+    ))
+
+    current_version = revisions[0][0] + 1 if revisions else tweet.revisions.count() + 1
+    text = tweet.tweet
+    versions = [{"version": current_version, "tweet": text, "creation_datetime": tweet.update_datetime}]
+
+    for version, delta, creation_datetime in revisions:
+        text = apply_delta(text, delta)
+        versions.append({"version": version, "tweet": text, "creation_datetime": creation_datetime})
+
+    return versions
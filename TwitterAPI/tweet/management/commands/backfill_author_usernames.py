@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tweet import authors
+
+
+class Command(BaseCommand):
+    help = "Copies the username of the author onto the tweets that don't have it yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Number of tweets per query.")
+
+    def handle(self, *args, **options):
+        filled = authors.sync_author_usernames(only_blank=True, batch_size=options["batch_size"])
+        self.stdout.write(f"Filled the author username of {filled} tweets.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tweet import retweets
+
+
+class Command(BaseCommand):
+    help = "Points the retweets that don't have a root tweet yet to the original tweet of their chain."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Number of retweets per update.")
+
+    def handle(self, *args, **options):
+        updated = retweets.sync_root_tweets(batch_size=options["batch_size"])
+        self.stdout.write(f"Set the root tweet of {updated} retweets.")
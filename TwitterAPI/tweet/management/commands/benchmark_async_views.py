@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tweet import models
+from tweet import views
+from utils.benchmark import benchmark_database, measure_view_concurrency, simulated_database_latency
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests the sync and async variants of the tweet list and detail views from a single event loop, "
+        "like an ASGI server. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per view.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at the same time.")
+        parser.add_argument("--workers", type=int, default=8, help="Threads available to the async views.")
+        parser.add_argument(
+            "--db-latency", type=float, default=5, help="Milliseconds added to every query, like a remote database."
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(), simulated_database_latency(options["db_latency"]), \
+                override_settings(ASYNC_VIEWS={"THREAD_SENSITIVE": False}, ALLOWED_HOSTS=["testserver"]):
+            user = get_user_model().objects.create(username="async_benchmark")
+            tweet = models.Tweet.objects.create(author=user, tweet="Benchmark tweet")
+            models.Tweet.objects.bulk_create([models.Tweet(author=user, tweet=f"Tweet {i}") for i in range(100)])
+
+            factory = RequestFactory(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+            endpoints = (
+                ("list", views.TweetsListView, views.AsyncTweetsListView, {}),
+                ("detail", views.TweetDetailView, views.AsyncTweetDetailView, {"tweet_id": tweet.id}),
+            )
+
+            for name, sync_view, async_view, kwargs in endpoints:
+                for mode, view_class in (("sync", sync_view), ("async", async_view)):
+                    view = view_class.as_view()
+
+                    # Time spent on a single request, when nothing else is running.
+                    _, service_time = measure_view_concurrency(view, lambda: factory.get("/"), 10, 1, 1, **kwargs)
+                    elapsed, latency = measure_view_concurrency(
+                        view, lambda: factory.get("/"), options["requests"], options["concurrency"],
+                        options["workers"], **kwargs
+                    )
+                    throughput = options["requests"] / elapsed
+
+                    self.stdout.write(
+                        f"{name:<6} {mode:<5}: {throughput:8.1f} requests/s, {latency * 1000:8.1f}ms latency, "
+                        f"{throughput * service_time:5.1f} requests served concurrently"
+                    )
@@ -0,0 +1,93 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tweet import models
+from tweet import services
+from utils.benchmark import benchmark_database, measure_endpoint, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares reading a whole thread with the conversation view, against walking it with the threads view, "
+        "one request per tweet and page. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--levels", type=int, default=10, help="Levels of replies below the root tweet.")
+        parser.add_argument("--size", type=int, default=1000, help="Number of tweets in the thread, the root included.")
+        parser.add_argument("--requests", type=int, default=20, help="Measured reads of the whole thread.")
+
+    def handle(self, *args, **options):
+        with benchmark_database(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            user = get_user_model().objects.create(username="conversation_benchmark")
+            root = models.Tweet.objects.create(author=user, tweet="Root of the conversation")
+
+            # Spread the replies evenly over the levels, each reply answers a random tweet of the level above.
+            per_level = (options["size"] - 1) // options["levels"]
+            level = [root]
+            for depth in range(options["levels"]):
+                count = per_level if depth < options["levels"] - 1 else options["size"] - 1 - per_level * depth
+                level = services.bulk_create_tweets(
+                    models.Tweet(author=user, thread=random.choice(level), tweet=f"Reply {depth}.{i}")
+                    for i in range(count)
+                )
+
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+            url = reverse("tweet:ConversationView", kwargs={"tweet_id": root.id})
+
+            response = client.get(url)
+            self.stdout.write(f"conversation: {response.data['size']} tweets, truncated: {response.data['truncated']}")
+
+            results = measure_endpoint(client, "get", lambda i: url, options["requests"])
+            self.stdout.write(
+                f"conversation view: p50 {results['p50']:8.1f}ms, p95 {results['p95']:8.1f}ms, "
+                f"1 request, {results['queries']} queries"
+            )
+
+            queries = []
+
+            def count_queries(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            timings = []
+            for _ in range(options["requests"]):
+                queries.clear()
+                with connection.execute_wrapper(count_queries):
+                    start = time.perf_counter()
+                    requests, tweets = self.walk_threads(client, root.id)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(
+                f"threads view:      p50 {percentile(timings, 50):8.1f}ms, p95 {percentile(timings, 95):8.1f}ms, "
+                f"{requests} requests, {len(queries)} queries, {tweets} tweets"
+            )
+
+    @staticmethod
+    def walk_threads(client, root_id: int):
+        """
+        Reads the thread like a client of `GetThreadsView` has to, every page of the replies of every tweet.
+
+        :return: number of requests, and number of tweets read.
+        """
+
+        requests, tweets, pending = 0, 1, [root_id]
+
+        while pending:
+            url = reverse("tweet:GetThreadsView", kwargs={"tweet_id": pending.pop()}) + "?limit=100"
+
+            while url:
+                data = client.get(url).data
+                requests += 1
+                tweets += len(data["results"])
+                pending.extend(tweet["id"] for tweet in data["results"])
+                url = data["next"]
+
+        return requests, tweets
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tweet import counters
+from tweet import models
+from utils.benchmark import benchmark_database, run_concurrently
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures like throughput on a single hot tweet for each counter backend. "
+        "Runs against a throwaway test database. SQLite serializes all writers, "
+        "so compare concurrent runs on the production database engine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--increments", type=int, default=2000, help="Total number of likes.")
+        parser.add_argument("--threads", type=int, default=1, help="Number of concurrent writers.")
+        parser.add_argument("--shards", type=int, default=16, help="Shards for the sharded backend.")
+
+    def handle(self, *args, **options):
+        backends = {
+            "direct": counters.DirectCounterBackend(),
+            "sharded": counters.ShardedCounterBackend(shards=options["shards"]),
+        }
+
+        with benchmark_database():
+            author = get_user_model().objects.create_user(username="benchmark", password="benchmark")
+
+            for name, backend in backends.items():
+                tweet = models.Tweet.objects.create(author=author, tweet=f"Hot tweet for {name} backend")
+
+                elapsed, errors = run_concurrently(
+                    lambda: backend.increment(models.Tweet(id=tweet.id), "like_count", 1),
+                    threads=options["threads"],
+                    iterations=options["increments"],
+                )
+                backend.flush()
+                tweet.refresh_from_db()
+
+                self.stdout.write(
+                    f"{name:>8}: {options['increments']} likes in {elapsed:.2f}s "
+                    f"({options['increments'] / elapsed:.0f} likes/s), {errors} errors, "
+                    f"final like_count {tweet.like_count}"
+                )
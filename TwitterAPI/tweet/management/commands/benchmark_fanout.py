@@ -0,0 +1,73 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from tweet import feeds
+from tweet import models
+from user.models import Follow, ProfileStats
+from utils.benchmark import benchmark_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares fan-out on write with fan-out on read for an author with many followers. "
+        "Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--followers", type=int, nargs="+", default=[10000, 100000], help="Follower counts to measure."
+        )
+        parser.add_argument("--tweets", type=int, default=20, help="Tweets posted by the author per run.")
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            for follower_count in options["followers"]:
+                author, reader = self._create_author(follower_count)
+
+                for mode, limit in (("on write", follower_count), ("on read", follower_count - 1)):
+                    with override_settings(TWEET_FEEDS={"FANOUT_FOLLOWER_LIMIT": limit}):
+                        write_time, read_time = self._measure(author, reader, options["tweets"])
+
+                    self.stdout.write(
+                        f"{follower_count:>8} followers, fan-out {mode:<8}: "
+                        f"{write_time * 1000 / options['tweets']:8.2f}ms per tweet posted, "
+                        f"{read_time * 1000:8.2f}ms per timeline read"
+                    )
+
+    @staticmethod
+    def _create_author(follower_count: int):
+        User = get_user_model()
+        author = User.objects.create(username=f"author{follower_count}")
+
+        first_id = (User.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+        User.objects.bulk_create(
+            [User(username=f"follower{follower_count}x{i}", password="!") for i in range(follower_count)],
+            batch_size=1000,
+        )
+        followers = User.objects.filter(id__gte=first_id).values_list("id", flat=True)
+        Follow.objects.bulk_create(
+            [Follow(follower_id=follower_id, followee_id=author.id) for follower_id in followers.iterator()],
+            batch_size=1000,
+        )
+        ProfileStats.objects.create(user=author, follower_count=follower_count)
+
+        return author, followers.last()
+
+    @staticmethod
+    def _measure(author, reader_id: int, tweets: int):
+        models.FeedEntry.objects.all().delete()
+
+        start = time.perf_counter()
+        for i in range(tweets):
+            feeds.fan_out([models.Tweet.objects.create(author=author, tweet=f"Benchmark tweet {i}")])
+        write_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        feeds.pull(reader_id)
+        list(feeds.get_timeline_queryset(reader_id).order_by(*feeds.TimelinePagination.ordering)[:20])
+        read_time = time.perf_counter() - start
+
+        return write_time, read_time
@@ -0,0 +1,61 @@
+import random
+import time
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tweet import models
+from tweet import search
+from utils.benchmark import benchmark_database
+from utils.iterables import batched
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares searching the tweet text with `icontains` against the search index. "
+        "Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tweets", type=int, default=1000000, help="Number of tweets to search in.")
+        parser.add_argument("--vocabulary", type=int, default=50000, help="Number of distinct words.")
+        parser.add_argument("--queries", type=int, default=50, help="Number of searches per method.")
+        parser.add_argument("--page-size", type=int, default=20, help="Results fetched per search.")
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        words = [f"word{i}" for i in range(options["vocabulary"])]
+
+        with benchmark_database():
+            self._create_tweets(words, options["tweets"], options["verbosity"])
+            queries = [random.choice(words) for _ in range(options["queries"])]
+
+            for method, get_queryset in (
+                    ("icontains", lambda word: models.Tweet.objects.filter(tweet__icontains=word).order_by("-id")),
+                    ("index", lambda word: search.search_queryset(word).order_by(*search.SearchPagination.ordering)),
+            ):
+                start = time.perf_counter()
+                for word in queries:
+                    list(get_queryset(word).values_list("id", flat=True)[:options["page_size"]])
+                elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"{method:<10}: {elapsed * 1000 / len(queries):10.2f}ms per search "
+                    f"over {options['tweets']} tweets"
+                )
+
+    def _create_tweets(self, words, count: int, verbosity: int):
+        author = get_user_model().objects.create(username="search_benchmark")
+        # Zipf-like distribution, so a few words are common and most are rare, as in real text.
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+        for created, batch in enumerate(batched(range(count), 10000), start=1):
+            tweets = models.Tweet.objects.bulk_create([
+                models.Tweet(author=author, tweet=" ".join(random.choices(words, cum_weights=cum_weights, k=12)))
+                for _ in batch
+            ])
+            search.index_tweets(tweets, batch_size=10000)
+
+            if verbosity > 1:
+                self.stdout.write(f"Created {min(created * 10000, count)} tweets.")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tweet import authors
+
+
+class Command(BaseCommand):
+    help = "Finds tweets whose author username doesn't match the username of their author, and repairs them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Update the drifted tweets.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Number of tweets per query.")
+
+    def handle(self, *args, **options):
+        drifted = authors.sync_author_usernames(repair=options["repair"], batch_size=options["batch_size"])
+
+        if options["repair"]:
+            self.stdout.write(f"Repaired the author username of {drifted} tweets.")
+        elif drifted:
+            raise CommandError(f"{drifted} tweets have a drifted author username, run with --repair to fix them.")
+        else:
+            self.stdout.write("Author usernames are consistent.")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from tweet import feeds
+from tweet import models
+from utils.iterables import batched
+
+
+class Command(BaseCommand):
+    help = "Writes existing tweets into the feeds of their authors' followers, e.g. to rebuild the timelines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=parse_datetime, help="Only fan out tweets created after this date.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Feed entries written per insert.")
+        parser.add_argument("--tweets-per-batch", type=int, default=100, help="Tweets fanned out together.")
+
+    def handle(self, *args, **options):
+        tweets = models.Tweet.objects.only("id", "author_id", "creation_datetime").order_by("id")
+        if options["since"]:
+            tweets = tweets.filter(creation_datetime__gt=options["since"])
+
+        fanned_out_tweets = written = 0
+        for batch in batched(tweets.iterator(chunk_size=options["tweets_per_batch"]), options["tweets_per_batch"]):
+            written += feeds.fan_out(batch, batch_size=options["batch_size"])
+            fanned_out_tweets += len(batch)
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Fanned out {fanned_out_tweets} tweets, {written} feed entries.")
+
+        self.stdout.write(f"Fanned out {fanned_out_tweets} tweets, {written} feed entries.")
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tweet import counters
+
+
+class Command(BaseCommand):
+    help = "Folds pending counter increments into the like, retweet and thread counts of tweets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float, default=0,
+            help="Keep flushing every `interval` seconds, instead of flushing once.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of pending rows folded per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = counters.flush(batch_size=options["batch_size"])
+
+            if options["verbosity"] > 1 or not options["interval"]:
+                self.stdout.write(f"Flushed {flushed} pending counter rows.")
+            if not options["interval"]:
+                return
+
+            time.sleep(options["interval"])
@@ -0,0 +1,231 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from tweet import models, retweets, serializers, services
+from utils.iterables import batched
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """
+    Lets the `auto_now` and `auto_now_add` fields of the model be set explicitly, so loaded rows keep their dates.
+    """
+
+    fields = [field for field in model._meta.concrete_fields if getattr(field, "auto_now_add", None) is not None]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads tweets, or likes, from an NDJSON file in the format written by `export_data`, then recomputes the "
+        "counters of all tweets. Progress is saved with every batch, in its transaction, an interrupted load resumes "
+        "right after the last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, one row per line.")
+        parser.add_argument("--likes", action="store_true", help="Load likes instead of tweets.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per transaction.")
+        parser.add_argument(
+            "--checkpoint", help="Name of the saved progress, the absolute path of the file by default."
+        )
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint, start at the first line.")
+        parser.add_argument(
+            "--skip-recount", action="store_true", help="Don't recompute the counters, e.g. when likes are loaded next."
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = options["checkpoint"] or os.path.abspath(options["path"])
+        progress = {"offset": 0, "line": 0, "loaded": 0, "skipped": 0}
+
+        if options["restart"]:
+            models.LoadCheckpoint.objects.filter(name=checkpoint).delete()
+        elif saved := models.LoadCheckpoint.objects.filter(name=checkpoint).values_list("progress", flat=True).first():
+            progress.update(saved)
+            self.stdout.write(f"Resuming at line {progress['line'] + 1}.")
+
+        self.author_ids = {}
+        model = models.Like if options["likes"] else models.Tweet
+        serializer = serializers.LikeLoadSerializer() if options["likes"] else serializers.TweetLoadSerializer()
+        load = self.load_likes if options["likes"] else self.load_tweets
+
+        start, loaded_before, last_report = time.monotonic(), progress["loaded"], time.monotonic()
+
+        with open(options["path"], "rb") as file, preserve_timestamps(model):
+            file.seek(progress["offset"])
+
+            for lines in batched(file, options["batch_size"]):
+                rows = self.validate(serializer, lines, first_line=progress["line"] + 1)
+
+                # Rows without an ID can't be told apart from loaded ones, the batch and its progress commit together.
+                with transaction.atomic():
+                    loaded = load(rows, options["batch_size"])
+
+                    progress["offset"] += sum(len(line) for line in lines)
+                    progress["line"] += len(lines)
+                    progress["loaded"] += loaded
+                    progress["skipped"] += sum(1 for line in lines if line.strip()) - loaded
+                    self.save_checkpoint(checkpoint, progress)
+
+                if time.monotonic() - last_report >= 5:
+                    self.report(progress, progress["loaded"] - loaded_before, time.monotonic() - start)
+                    last_report = time.monotonic()
+
+        # Rows loaded with their IDs don't move the sequence of the table.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+
+        if not options["likes"]:
+            self.stdout.write(f"Set the root tweet of {retweets.sync_root_tweets(options['batch_size'])} retweets.")
+
+        if not options["skip_recount"]:
+            self.stdout.write(f"Recounted {services.recount_tweets(options['batch_size'])} tweets.")
+            self.stdout.write(f"Recounted {services.recount_profile_stats(options['batch_size'])} profiles.")
+
+        models.LoadCheckpoint.objects.filter(name=checkpoint).delete()
+        self.report(progress, progress["loaded"] - loaded_before, time.monotonic() - start)
+
+    def validate(self, serializer, lines, first_line: int) -> list:
+        """
+        Parses and validates the lines with a single serializer, invalid lines are reported and skipped.
+
+        :return: line numbers and validated data of the valid rows.
+        """
+
+        rows = []
+
+        for line_number, line in enumerate(lines, start=first_line):
+            if not line.strip():
+                continue
+
+            try:
+                rows.append((line_number, serializer.run_validation(json.loads(line))))
+            except ValueError as error:
+                self.stderr.write(f"Line {line_number}: {error}")
+            except ValidationError as error:
+                self.stderr.write(f"Line {line_number}: {error.detail}")
+
+        return rows
+
+    def resolve_authors(self, rows) -> None:
+        """
+        Looks up the IDs of the authors not seen yet, in one query. Unknown usernames are cached as `None`.
+        """
+
+        missing = {row["author_username"] for _, row in rows} - self.author_ids.keys()
+
+        if missing:
+            self.author_ids.update(dict.fromkeys(missing))
+            self.author_ids.update(
+                get_user_model().objects.filter(username__in=missing).values_list("username", "id")
+            )
+
+    def reject(self, line_number: int, reason: str) -> None:
+        self.stderr.write(f"Line {line_number}: {reason}")
+
+    def load_tweets(self, rows, batch_size: int) -> int:
+        """
+        Creates the tweets of the rows. Rows with an ID that is already loaded are skipped, so the batch
+        that was in progress when a load was interrupted can be loaded again.
+
+        :return: number of created tweets.
+        """
+
+        self.resolve_authors(rows)
+
+        ids = {row["id"] for _, row in rows if "id" in row}
+        parent_ids = {row.get(field) for _, row in rows for field in ("retweet_id", "thread_id")} - {None}
+        known_ids = set(models.Tweet.all_objects.filter(id__in=ids | parent_ids).values_list("id", flat=True))
+        loaded_ids = set(known_ids & ids)
+
+        tweets = []
+        now = timezone.now()
+
+        for line_number, row in rows:
+            if row.get("id") in loaded_ids:
+                continue
+            if (author_id := self.author_ids[row["author_username"]]) is None:
+                self.reject(line_number, f"Unknown author {row['author_username']}.")
+                continue
+            if {row.get("retweet_id"), row.get("thread_id")} - {None} - known_ids:
+                self.reject(line_number, "Retweeted or threaded tweet must be loaded first.")
+                continue
+
+            creation_datetime = row.get("creation_datetime", now)
+            tweets.append(models.Tweet(
+                id=row.get("id"),
+                author_id=author_id,
+                tweet=row["tweet"],
+                creation_datetime=creation_datetime,
+                update_datetime=row.get("update_datetime", creation_datetime),
+                retweet_id=row.get("retweet_id"),
+                thread_id=row.get("thread_id"),
+            ))
+            if "id" in row:
+                known_ids.add(row["id"])
+                loaded_ids.add(row["id"])
+
+        return len(services.bulk_create_tweets(tweets, batch_size=batch_size, update_counters=False))
+
+    def load_likes(self, rows, batch_size: int) -> int:
+        """
+        Creates the likes of the rows. Likes that already exist are ignored by the database.
+
+        :return: number of valid rows.
+        """
+
+        self.resolve_authors(rows)
+
+        tweet_ids = set(models.Tweet.objects.filter(
+            id__in={row["tweet_id"] for _, row in rows}
+        ).values_list("id", flat=True))
+
+        likes = []
+        now = timezone.now()
+
+        for line_number, row in rows:
+            if (author_id := self.author_ids[row["author_username"]]) is None:
+                self.reject(line_number, f"Unknown author {row['author_username']}.")
+            elif row["tweet_id"] not in tweet_ids:
+                self.reject(line_number, f"Unknown tweet {row['tweet_id']}.")
+            else:
+                likes.append(models.Like(
+                    tweet_id=row["tweet_id"], author_id=author_id, creation_datetime=row.get("creation_datetime", now)
+                ))
+
+        with transaction.atomic():
+            models.Like.objects.bulk_create(likes, batch_size=batch_size, ignore_conflicts=True)
+
+        return len(likes)
+
+    @staticmethod
+    def save_checkpoint(name: str, progress: dict) -> None:
+        """
+        Saves the progress of the load, in the transaction of the batch it includes.
+        """
+
+        models.LoadCheckpoint.objects.update_or_create(name=name, defaults={"progress": progress})
+
+    def report(self, progress: dict, loaded: int, elapsed: float) -> None:
+        self.stdout.write(
+            f"Line {progress['line']}: {progress['loaded']} rows loaded, {progress['skipped']} skipped, "
+            f"{loaded / elapsed if elapsed else 0:.0f} rows/s."
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from tweet import trends
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the trends windows forward, subtracting the minutes that left them, and deletes hashtag counts that "
+        "are too old to be part of any window. Run it every minute or so, trends count the minutes that left the "
+        "window until then."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than", type=int, help="Age in minutes of the oldest counts to keep, the longest window by default."
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Decayed {trends.decay()} hashtag totals.")
+
+        older_than = options["older_than"] or max(trends.get_trends_settings()["WINDOWS"])
+        self.stdout.write(f"Deleted {trends.prune(older_than)} hashtag counts.")
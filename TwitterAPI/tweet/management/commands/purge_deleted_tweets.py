@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from tweet import purge
+
+
+class Command(BaseCommand):
+    help = (
+        "Removes deleted tweets with their retweets, threads, likes and other dependent rows, in bounded batches. "
+        "Run it periodically, deleted tweets are hidden until then."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        purged = purge.purge(batch_size=options["batch_size"], report=self.stdout.write)
+        self.stdout.write(f"Purged {purged['tweets']} tweets and {purged['rows']} dependent rows.")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from tweet import models
+from tweet import search
+from utils.iterables import batched
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search index of existing tweets, e.g. after changing the tokenizer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tweets indexed per transaction.")
+
+    def handle(self, *args, **options):
+        tweets = models.Tweet.objects.only("id", "tweet").order_by("id")
+
+        indexed_tweets = written = 0
+        for batch in batched(tweets.iterator(chunk_size=options["batch_size"]), options["batch_size"]):
+            written += search.index_tweets(batch)
+            indexed_tweets += len(batch)
+
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Indexed {indexed_tweets} tweets, {written} index entries.")
+
+        self.stdout.write(f"Indexed {indexed_tweets} tweets, {written} index entries.")
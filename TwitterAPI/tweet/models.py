@@ -1,8 +1,43 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 
 
+class TweetQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Sets `author_username` on the new tweets first, with one query for the authors that aren't loaded.
+        """
+
+        objs = list(objs)
+        missing = [tweet for tweet in objs if not tweet.author_username and tweet.author_id is not None]
+        usernames = dict(get_user_model().objects.filter(
+            id__in={tweet.author_id for tweet in missing if not Tweet.author.is_cached(tweet)}
+        ).values_list("id", "username")) if missing else {}
+
+        for tweet in missing:
+            tweet.author_username = tweet.author.username if Tweet.author.is_cached(tweet) \
+                else usernames.get(tweet.author_id, "")
+
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class TweetManager(models.Manager.from_queryset(TweetQuerySet)):
+    """
+    Hides deleted tweets, and the retweets and threads of deleted tweets, so deleting a tweet only marks its own row.
+    They stay in the table until `purge_deleted_tweets` removes them.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            deleted_datetime__isnull=True,
+            retweet__deleted_datetime__isnull=True,
+            root_tweet__deleted_datetime__isnull=True,
+            thread__deleted_datetime__isnull=True,
+        )
+
+
 class Tweet(models.Model):
     """
     Database table representation of tweet. Also, contains additional methods related to Tweet.
@@ -14,6 +49,14 @@ class Tweet(models.Model):
         on_delete=models.CASCADE,
         help_text=_("Creator of tweet")
     )
+    author_username = models.CharField(
+        verbose_name=_("Author Username"),
+        max_length=128,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Copy of the username of the author, so lists of tweets can be read without a join."),
+    )
 
     creation_datetime = models.DateTimeField(
         verbose_name=_("Creation Date"),
@@ -58,6 +101,17 @@ class Tweet(models.Model):
         help_text=_("Determines if this tweet is a repost."),
         related_name="tweet_retweet",
     )
+    root_tweet = models.ForeignKey(
+        verbose_name=_("Root Tweet"),
+        to="tweet.Tweet",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        help_text=_("Original tweet at the end of the chain of retweets, only set on retweets."),
+        related_name="tweet_root_retweet",
+    )
     thread = models.ForeignKey(
         verbose_name=_("Thread"),
         to="tweet.Tweet",
@@ -69,6 +123,37 @@ class Tweet(models.Model):
         related_name="tweet_thread",
     )
 
+    deleted_datetime = models.DateTimeField(
+        verbose_name=_("Deletion Date"),
+        null=True,
+        blank=True,
+        default=None,
+        editable=False,
+        help_text=_("Date deleted, the tweet is purged with its retweets and threads in the background"),
+    )
+
+    objects = TweetManager()
+    all_objects = TweetQuerySet.as_manager()
+
+    class Meta:
+        # Match the keyset ordering of the list views, so pages are read straight from the index.
+        indexes = (
+            models.Index(fields=("-creation_datetime", "-id"), name="tweet_creation_idx"),
+            models.Index(fields=("author", "-creation_datetime", "-id"), name="tweet_author_creation_idx"),
+            models.Index(fields=("retweet", "-creation_datetime", "-id"), name="tweet_retweet_creation_idx"),
+            models.Index(fields=("thread", "-creation_datetime", "-id"), name="tweet_thread_creation_idx"),
+            models.Index(
+                fields=("deleted_datetime",), name="tweet_deleted_idx",
+                condition=models.Q(deleted_datetime__isnull=False),
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.author_username and self.author_id is not None:
+            self.author_username = self.author.username
+
+        super().save(*args, **kwargs)
+
     @property
     def striped_tweet(self):
         """
@@ -77,6 +162,22 @@ class Tweet(models.Model):
 
         return f"{self.tweet[:30]}..." if len(self.tweet) > 30 else self.tweet
 
+    def increment_counter(self, counter: str, amount: int = 1) -> int:
+        """
+        Adds `amount` to one of the counters in the database itself, so concurrent updates are not lost.
+        Only the counter column is written.
+
+        :param counter: Name of the counter, `like_count`, `retweet_count` or `thread_count`.
+        :param amount: Value to add to the counter, negative to decrement.
+        :return: updated value of the counter.
+        """
+
+        setattr(self, counter, F(counter) + amount)
+        self.save(update_fields=[counter])
+        self.refresh_from_db(fields=[counter])
+
+        return getattr(self, counter)
+
     def __str__(self):
         return self.striped_tweet
 
@@ -105,6 +206,15 @@ class Like(models.Model):
         help_text=_("Tweet that was liked")
     )
 
+    class Meta:
+        constraints = (
+            # Also serves as the (tweet, author) index for the like/unlike lookup.
+            models.UniqueConstraint(fields=("tweet", "author"), name="unique_like_per_author"),
+        )
+        indexes = (
+            models.Index(fields=("tweet", "-creation_datetime", "-id"), name="like_tweet_creation_idx"),
+        )
+
 
 class Retweet(models.Model):
     """
@@ -130,3 +240,243 @@ class Retweet(models.Model):
         help_text=_("The tweet that was retweeted"),
         related_name="retweet_tweet"
     )
+
+    class Meta:
+        indexes = (
+            models.Index(fields=("tweet", "author"), name="retweet_tweet_author_idx"),
+        )
+
+
+class TweetCounterShard(models.Model):
+    """
+    Increments of a tweet counter that haven't been folded into the tweet yet.
+    Spreading the increments of a single tweet over many rows keeps hot tweets from contending on one row.
+    """
+
+    COUNTER_CHOICES = (
+        ("like_count", _("Like Count")),
+        ("retweet_count", _("Retweet Count")),
+        ("thread_count", _("Thread Count")),
+    )
+
+    tweet = models.ForeignKey(
+        verbose_name=_("Tweet"),
+        to=Tweet,
+        on_delete=models.CASCADE,
+        help_text=_("Tweet whose counter is incremented"),
+        related_name="counter_shards",
+    )
+    counter = models.CharField(
+        verbose_name=_("Counter"),
+        max_length=16,
+        choices=COUNTER_CHOICES,
+        help_text=_("Name of the counter field on the tweet"),
+    )
+    shard = models.PositiveSmallIntegerField(
+        verbose_name=_("Shard"),
+        help_text=_("Shard number, picked at random for every increment"),
+    )
+    delta = models.BigIntegerField(
+        verbose_name=_("Delta"),
+        default=0,
+        help_text=_("Pending change of the counter"),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("tweet", "counter", "shard"), name="unique_tweet_counter_shard"),
+        )
+
+
+class FeedEntry(models.Model):
+    """
+    Materialized home timeline, one row per tweet in a user's feed.
+    """
+
+    owner = models.ForeignKey(
+        verbose_name=_("Owner"),
+        to=get_user_model(),
+        on_delete=models.CASCADE,
+        help_text=_("User whose timeline contains the tweet"),
+        related_name="feed_entries",
+    )
+    tweet = models.ForeignKey(
+        verbose_name=_("Tweet"),
+        to=Tweet,
+        on_delete=models.CASCADE,
+        help_text=_("Tweet in the timeline"),
+        related_name="feed_entries",
+    )
+    creation_datetime = models.DateTimeField(
+        verbose_name=_("Creation Date"),
+        help_text=_("Creation date of the tweet, copied to keep the timeline in a single index"),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("owner", "tweet"), name="unique_feed_entry"),
+        )
+        indexes = (
+            models.Index(fields=("owner", "-creation_datetime", "-tweet"), name="feed_owner_creation_idx"),
+        )
+
+
+class TweetToken(models.Model):
+    """
+    Inverted index of the tweet text, one row per distinct token of a tweet. Maintained by `tweet.search`.
+    Hashtags and mentions are stored with their `#` and `@` prefix, next to the plain word.
+    """
+
+    token = models.CharField(
+        verbose_name=_("Token"),
+        max_length=64,
+        help_text=_("Normalized word, hashtag or mention"),
+    )
+    tweet = models.ForeignKey(
+        verbose_name=_("Tweet"),
+        to=Tweet,
+        on_delete=models.CASCADE,
+        help_text=_("Tweet containing the token"),
+        related_name="search_tokens",
+    )
+    frequency = models.PositiveSmallIntegerField(
+        verbose_name=_("Frequency"),
+        default=1,
+        help_text=_("Number of times the token occurs in the tweet, used for ranking"),
+    )
+
+    class Meta:
+        constraints = (
+            # Also serves as the (token, tweet) index for looking up the tweets of a token.
+            models.UniqueConstraint(fields=("token", "tweet"), name="unique_token_per_tweet"),
+        )
+
+
+class HashtagCount(models.Model):
+    """
+    Number of tweets that used a hashtag within a minute, rolled up at write time by `tweet.trends`.
+    """
+
+    hashtag = models.CharField(
+        verbose_name=_("Hashtag"),
+        max_length=64,
+        help_text=_("Lower case hashtag, without the #"),
+    )
+    bucket = models.DateTimeField(
+        verbose_name=_("Bucket"),
+        help_text=_("Start of the minute the hashtag was used in"),
+    )
+    count = models.BigIntegerField(
+        verbose_name=_("Count"),
+        default=0,
+        help_text=_("Number of tweets using the hashtag within the minute"),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("hashtag", "bucket"), name="unique_hashtag_bucket"),
+        )
+        indexes = (
+            models.Index(fields=("bucket", "hashtag"), name="hashtag_count_bucket_idx"),
+        )
+
+
+class TrendWindow(models.Model):
+    """
+    Trends window with running totals in `HashtagTrend`, starting at the oldest minute they still count.
+    """
+
+    minutes = models.PositiveIntegerField(
+        verbose_name=_("Minutes"),
+        unique=True,
+        help_text=_("Length of the window"),
+    )
+    start = models.DateTimeField(
+        verbose_name=_("Start"),
+        help_text=_("Oldest bucket counted by the totals of the window, moved forward by `prune_trends`"),
+    )
+
+
+class HashtagTrend(models.Model):
+    """
+    Number of uses of a hashtag within a trends window, updated with every use and decayed by `prune_trends`.
+    """
+
+    window_minutes = models.PositiveIntegerField(
+        verbose_name=_("Window Minutes"),
+        help_text=_("Length of the window the uses are counted in"),
+    )
+    hashtag = models.CharField(
+        verbose_name=_("Hashtag"),
+        max_length=64,
+        help_text=_("Lower case hashtag, without the #"),
+    )
+    count = models.BigIntegerField(
+        verbose_name=_("Count"),
+        default=0,
+        help_text=_("Number of tweets using the hashtag within the window"),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("window_minutes", "hashtag"), name="unique_hashtag_trend"),
+        )
+        indexes = (
+            # Reads the top hashtags of a window without sorting the others.
+            models.Index(fields=("window_minutes", "-count", "hashtag"), name="hashtag_trend_top_idx"),
+        )
+
+
+class TweetRevision(models.Model):
+    """
+    Earlier version of an edited tweet, stored as a delta from the version that replaced it.
+    The tweet row holds the latest version, older ones are rebuilt by applying the deltas newest first.
+    """
+
+    tweet = models.ForeignKey(
+        verbose_name=_("Tweet"),
+        to=Tweet,
+        on_delete=models.CASCADE,
+        help_text=_("Edited tweet"),
+        related_name="revisions",
+    )
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"),
+        help_text=_("Number of the version, starting at 1 for the tweet as posted"),
+    )
+    delta = models.TextField(
+        verbose_name=_("Delta"),
+        help_text=_("Changes turning the next version back into this one, see `tweet.history`"),
+    )
+    creation_datetime = models.DateTimeField(
+        verbose_name=_("Creation Date"),
+        help_text=_("Date this version was written"),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("tweet", "version"), name="unique_tweet_revision"),
+        )
+
+
+class LoadCheckpoint(models.Model):
+    """
+    Progress of a `load_tweets` run, saved in the transaction of every batch, so a resumed load starts right after
+    the last committed batch.
+    """
+
+    name = models.CharField(
+        verbose_name=_("Name"),
+        max_length=255,
+        unique=True,
+        help_text=_("Name of the load, the absolute path of the loaded file by default"),
+    )
+    progress = models.JSONField(
+        verbose_name=_("Progress"),
+        help_text=_("Byte offset and line of the next row, with the number of loaded and skipped rows"),
+    )
+    update_datetime = models.DateTimeField(
+        verbose_name=_("Update Date"),
+        auto_now=True,
+        help_text=_("Date the last batch was committed"),
+    )
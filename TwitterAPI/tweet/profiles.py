@@ -0,0 +1,56 @@
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tweet import models
+from tweet.signals import tweets_created
+from user.models import ProfileStats
+
+
+def _decrement(queryset, count: str) -> None:
+    """
+    Subtracts the rows of the queryset from `count` of their authors, with a single update for all the authors.
+    """
+
+    queryset = queryset.order_by()
+    amounts = queryset.filter(author_id=OuterRef("user_id")).values("author_id").annotate(
+        amount=Count("id")
+    ).values("amount")
+
+    ProfileStats.objects.filter(user_id__in=queryset.values("author_id")).update(**{
+        count: F(count) - Subquery(amounts), "update_datetime": timezone.now(),
+    })
+
+
+def forget_tweets(tweet_ids) -> None:
+    """
+    Removes the tweets from the tweet counts of their authors, when they are marked as deleted.
+
+    :param tweet_ids: IDs of the deleted tweets.
+    :return: None
+    """
+
+    _decrement(models.Tweet.all_objects.filter(id__in=tweet_ids), "tweet_count")
+
+
+def forget_likes(tweet_ids) -> None:
+    """
+    Removes the likes of the tweets from the like counts of their authors, before the likes are purged.
+
+    :param tweet_ids: IDs of the purged tweets.
+    :return: None
+    """
+
+    _decrement(models.Like.objects.filter(tweet_id__in=tweet_ids), "like_count")
+
+
+@receiver(tweets_created)
+def count_created_tweets(sender, tweets, **kwargs):
+    """
+    Adds new tweets to the tweet counts of their authors, in the transaction creating them.
+    """
+
+    for author_id, amount in Counter(tweet.author_id for tweet in tweets).items():
+        ProfileStats.increment(author_id, tweet_count=amount)
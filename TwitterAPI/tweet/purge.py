@@ -0,0 +1,133 @@
+from django.db import models as db_models
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from tweet import cache, models, profiles
+from user.models import ProfileStats
+
+
+def _parent_fields() -> list:
+    """
+    Foreign keys from tweets to tweets, a tweet is deleted with the tweets it points to.
+    """
+
+    return [
+        field.name for field in models.Tweet._meta.concrete_fields
+        if field.is_relation and field.related_model is models.Tweet
+    ]
+
+
+def _dependents() -> list:
+    """
+    Models with rows deleted along with their tweet, and the foreign key to the tweet.
+    """
+
+    return [
+        (relation.related_model, relation.field.name) for relation in models.Tweet._meta.related_objects
+        if relation.related_model is not models.Tweet and relation.on_delete is db_models.CASCADE
+    ]
+
+
+def _children(tweet_ids) -> Q:
+    """
+    Condition matching the retweets and threads pointing to any of the tweets.
+    """
+
+    children = Q()
+    for field in _parent_fields():
+        children |= Q(**{f"{field}_id__in": tweet_ids})
+
+    return children
+
+
+def _delete_in_batches(queryset, batch_size: int) -> int:
+    """
+    Deletes the rows of the queryset `batch_size` at a time, with one `DELETE ... WHERE id IN` per transaction.
+    No signals are sent and nothing is collected in memory.
+    """
+
+    deleted = 0
+
+    while ids := list(queryset.values_list("pk", flat=True)[:batch_size]):
+        with transaction.atomic(using=queryset.db):
+            deleted += queryset.model._base_manager.filter(pk__in=ids)._raw_delete(queryset.db)
+
+    return deleted
+
+
+def delete_tweet(tweet: models.Tweet) -> None:
+    """
+    Marks the tweet as deleted, and removes it from the tweet count of its author and from the search index.
+    `TweetManager` hides its retweets and threads right away, they are marked and removed later by `purge`.
+
+    :param tweet: Tweet to delete.
+    :return: None
+    """
+
+    with transaction.atomic():
+        tweet.deleted_datetime = timezone.now()
+        tweet.save(update_fields=["deleted_datetime"])
+        ProfileStats.increment(tweet.author_id, tweet_count=-1)
+        models.TweetToken.objects.filter(tweet_id=tweet.id).delete()
+
+    cache.tweet_payloads.forget_children(tweet.id)
+
+
+def propagate(batch_size: int = 1000, report=None) -> int:
+    """
+    Marks the retweets and threads of deleted tweets as deleted, level by level, `batch_size` tweets per update,
+    and removes each batch from the tweet counts of the authors with a single update.
+
+    :param batch_size: Number of tweets to mark per update.
+    :param report: Called with a progress message after every batch.
+    :return: number of tweets marked.
+    """
+
+    children = _children(models.Tweet.all_objects.filter(deleted_datetime__isnull=False).values("id"))
+    pending = models.Tweet.all_objects.filter(children, deleted_datetime__isnull=True)
+
+    marked = 0
+
+    while ids := list(pending.values_list("id", flat=True)[:batch_size]):
+        with transaction.atomic():
+            profiles.forget_tweets(ids)
+            models.Tweet.all_objects.filter(id__in=ids).update(deleted_datetime=timezone.now())
+        cache.tweet_payloads.invalidate(*ids)
+
+        marked += len(ids)
+        if report:
+            report(f"Marked {marked} retweets and threads of deleted tweets as deleted.")
+
+    return marked
+
+
+def purge(batch_size: int = 1000, report=None) -> dict:
+    """
+    Removes deleted tweets with everything that depends on them, leaves first, so deleting a tweet with many
+    retweets and likes never loads them, and never holds locks for long. Every statement deletes at most
+    `batch_size` rows.
+
+    :param batch_size: Number of rows to delete per statement.
+    :param report: Called with a progress message after every batch of tweets.
+    :return: number of purged tweets and of purged dependent rows.
+    """
+
+    propagate(batch_size, report)
+
+    leaves = models.Tweet.all_objects.filter(deleted_datetime__isnull=False)
+    for field in _parent_fields():
+        leaves = leaves.filter(~Exists(models.Tweet.all_objects.filter(**{field: OuterRef("pk")})))
+
+    purged = {"tweets": 0, "rows": 0}
+
+    while ids := list(leaves.values_list("id", flat=True)[:batch_size]):
+        profiles.forget_likes(ids)
+        for model, field in _dependents():
+            purged["rows"] += _delete_in_batches(model._base_manager.filter(**{f"{field}__in": ids}), batch_size)
+
+        purged["tweets"] += _delete_in_batches(models.Tweet.all_objects.filter(id__in=ids), batch_size)
+        if report:
+            report(f"Purged {purged['tweets']} tweets and {purged['rows']} dependent rows.")
+
+    return purged
@@ -0,0 +1,71 @@
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from tweet import cache, models
+
+
+def get_root_id(tweet: models.Tweet) -> int:
+    """
+    Returns the ID of the original tweet that a retweet of `tweet` points to, through `root_tweet` of the tweet.
+    Retweets written before `root_tweet` existed are followed up the chain until `backfill_root_tweets` has run.
+
+    :param tweet: Tweet being retweeted.
+    :return: ID of the original tweet.
+    """
+
+    while tweet.retweet_id is not None:
+        if tweet.root_tweet_id is not None:
+            return tweet.root_tweet_id
+
+        tweet = models.Tweet.all_objects.only("retweet_id", "root_tweet_id").get(id=tweet.retweet_id)
+
+    return tweet.id
+
+
+def sync_root_tweets(batch_size: int = 10000, report=None) -> int:
+    """
+    Sets `root_tweet` on the retweets that don't have it, e.g. retweets written before it existed or loaded by
+    `load_tweets`. Chains are resolved from the original tweet down, one level at a time.
+
+    :param batch_size: Number of retweets per update.
+    :param report: Called with a progress message after every batch.
+    :return: number of retweets updated.
+    """
+
+    pending = models.Tweet.all_objects.filter(retweet__isnull=False, root_tweet__isnull=True).filter(
+        Q(retweet__retweet__isnull=True) | Q(retweet__root_tweet__isnull=False)
+    )
+    parent_root = models.Tweet.all_objects.filter(pk=OuterRef("retweet_id")).values("root_tweet_id")[:1]
+
+    updated = 0
+
+    while ids := list(pending.values_list("id", flat=True)[:batch_size]):
+        models.Tweet.all_objects.filter(id__in=ids).update(
+            root_tweet_id=Coalesce(Subquery(parent_root), F("retweet_id"))
+        )
+        cache.tweet_payloads.invalidate(*ids)
+
+        updated += len(ids)
+        if report:
+            report(f"Set the root tweet of {updated} retweets.")
+
+    return updated
+
+
+def is_requested(request) -> bool:
+    """
+    Whether the request asks for the original tweet of retweets to be embedded, through the `root_tweet` query
+    parameter.
+    """
+
+    return request.query_params.get("root_tweet", "").lower() in ("1", "true", "yes")
+
+
+class RootTweetMixin:
+    """
+    Embeds the original tweet in every retweet of a list view, when the `root_tweet` query parameter is set.
+    The original tweets are joined by the same query as the page.
+    """
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "include_root_tweet": is_requested(self.request)}
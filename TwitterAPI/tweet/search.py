@@ -0,0 +1,133 @@
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from tweet import models
+from tweet.signals import tweets_created
+from utils.pagination import KeysetPagination
+
+TOKEN_PATTERN = re.compile(r"[#@]?\w+")
+MAX_TOKEN_LENGTH = models.TweetToken._meta.get_field("token").max_length
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits the text into lower case tokens. Hashtags and mentions are returned with their prefix,
+    followed by the plain word, so they are found by searching either.
+
+    :param text: Text of a tweet or a search query.
+    :return: tokens in order of appearance, with repetitions.
+    """
+
+    tokens = []
+
+    for match in TOKEN_PATTERN.findall(text.casefold()):
+        token = match[:MAX_TOKEN_LENGTH]
+        tokens.append(token)
+
+        if token[0] in "#@" and len(token) > 1:
+            tokens.append(token[1:])
+
+    return tokens
+
+
+def extract_hashtags(text: str) -> list:
+    """
+    Returns the distinct hashtags of the text, lower case and without the `#`, in order of appearance.
+    """
+
+    return list(dict.fromkeys(token[1:] for token in tokenize(text) if token.startswith("#") and len(token) > 1))
+
+
+def extract_mentions(text: str) -> list:
+    """
+    Returns the distinct mentioned usernames of the text, lower case and without the `@`, in order of appearance.
+    """
+
+    return list(dict.fromkeys(token[1:] for token in tokenize(text) if token.startswith("@") and len(token) > 1))
+
+
+def index_tweets(tweets, batch_size: int = 1000) -> int:
+    """
+    Replaces the index entries of the given tweets with the tokens of their current text.
+
+    :param tweets: Saved tweets.
+    :param batch_size: Number of index rows to insert per statement.
+    :return: number of index rows written.
+    """
+
+    tweets = [tweet for tweet in tweets if tweet.id is not None]
+
+    entries = [
+        models.TweetToken(tweet_id=tweet.id, token=token, frequency=frequency)
+        for tweet in tweets
+        for token, frequency in Counter(tokenize(tweet.tweet)).items()
+    ]
+
+    with transaction.atomic():
+        models.TweetToken.objects.filter(tweet_id__in=[tweet.id for tweet in tweets]).delete()
+        models.TweetToken.objects.bulk_create(entries, batch_size=batch_size)
+
+    for tweet in tweets:
+        tweet._search_indexed = True
+
+    return len(entries)
+
+
+def search_queryset(query: str, queryset=None):
+    """
+    Returns the tweets containing every token of the query, annotated with `rank`, the number of
+    occurrences of the query tokens in the tweet. Every token is looked up through the (token, tweet) index.
+
+    :param query: Search query, e.g. `django #python`.
+    :param queryset: Tweets to search in, all tweets by default.
+    :return: Django Query, to be paginated with `SearchPagination`.
+    """
+
+    tokens = list(dict.fromkeys(tokenize(query)))
+    queryset = models.Tweet.objects.all() if queryset is None else queryset
+
+    if not tokens:
+        return queryset.none()
+
+    for token in tokens:
+        queryset = queryset.filter(id__in=models.TweetToken.objects.filter(token=token).values("tweet_id"))
+
+    rank = models.TweetToken.objects.filter(tweet_id=OuterRef("pk"), token__in=tokens).values("tweet_id").annotate(
+        rank=Sum("frequency")
+    ).values("rank")
+
+    return queryset.annotate(rank=Coalesce(Subquery(rank, output_field=IntegerField()), 0))
+
+
+class SearchPagination(KeysetPagination):
+    """
+    Keyset pagination over the search results, best matches first, newest first within the same rank.
+    """
+
+    ordering = ("-rank", "-id")
+
+
+@receiver(post_save, sender=models.Tweet)
+def index_saved_tweet(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Keeps the index of a tweet up to date with its text, counter updates are skipped.
+    Deleted tweets lose their index entries through the cascade.
+    """
+
+    if not raw and (update_fields is None or "tweet" in update_fields):
+        index_tweets([instance])
+
+
+@receiver(tweets_created)
+def index_created_tweets(sender, tweets, **kwargs):
+    """
+    Indexes tweets created in bulk, `post_save` isn't sent for them.
+    """
+
+    index_tweets([tweet for tweet in tweets if not getattr(tweet, "_search_indexed", False)])
@@ -1,44 +1,123 @@
+from collections.abc import Mapping
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from tweet import authors
 from tweet import models
 from user.serializer import UserSerializer
 
 
-class TweetSerializer(serializers.ModelSerializer):
+class AuthorUsernameField(serializers.CharField):
+    """
+    Username of the author of a tweet, read from the `author_username` column of the tweet when
+    `TWEET_DENORMALIZED_AUTHOR` is on, so querysets don't join the users, and from the author otherwise.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(read_only=True, **kwargs)
+
+    def bind(self, field_name, parent):
+        self.source = None if authors.is_denormalized() else "author.username"
+        super().bind(field_name, parent)
+
+
+class ViewerStateSerializerMixin(serializers.Serializer):
+    """
+    Adds the like and retweet state of the requesting user, only when the view asks for it through the
+    `include_viewer_state` context. Otherwise, the payload doesn't depend on the user, and can be cached.
+    """
+
+    liked_by_me = serializers.BooleanField(read_only=True)
+    retweeted_by_me = serializers.BooleanField(read_only=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if not self.context.get("include_viewer_state"):
+            fields.pop("liked_by_me")
+            fields.pop("retweeted_by_me")
+
+        return fields
+
+
+class RootTweetSerializer(serializers.ModelSerializer):
+    """
+    Serializes the original tweet embedded in a retweet, same as the detail view without the viewer state.
+    It is `None` when the original tweet is deleted, the join with the retweet doesn't go through `TweetManager`.
+    """
+
+    author_username = AuthorUsernameField()
+
+    class Meta:
+        model = models.Tweet
+        fields = (
+            "id", "author", "like_count", "retweet_count", "author_username",
+            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id", "root_tweet_id",
+        )
+        read_only_fields = fields
+        extra_only = ("deleted_datetime",)
+
+    def to_representation(self, instance):
+        if instance.deleted_datetime is not None:
+            return None
+
+        return super().to_representation(instance)
+
+
+class RootTweetSerializerMixin(serializers.Serializer):
+    """
+    Embeds the original tweet of retweets, only when the view asks for it through the `include_root_tweet` context,
+    so clients don't follow the chain of retweets with one request per level.
+    """
+
+    root_tweet = RootTweetSerializer(read_only=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if not self.context.get("include_root_tweet"):
+            fields.pop("root_tweet")
+
+        return fields
+
+
+class TweetSerializer(ViewerStateSerializerMixin, RootTweetSerializerMixin, serializers.ModelSerializer):
     """
     Serializes tweet for detail view and for update.
     """
-    # To get the username of the author
-    author_username = serializers.CharField(source="author.username", read_only=True)
+    author_username = AuthorUsernameField()
 
     class Meta:
         model = models.Tweet
         fields = (
             "id", "author", "like_count", "retweet_count", "author_username",
-            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id",
+            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id", "root_tweet_id",
+            "liked_by_me", "retweeted_by_me", "root_tweet",
         )
         read_only_fields = (
             "id", "author", "like_count", "retweet_count", "author_username",
-            "creation_datetime", "update_datetime", "retweet_id", "thread_id",
+            "creation_datetime", "update_datetime", "retweet_id", "thread_id", "root_tweet_id",
         )
 
 
-class TweetListViewSerializer(serializers.ModelSerializer):
+class TweetListViewSerializer(ViewerStateSerializerMixin, RootTweetSerializerMixin, serializers.ModelSerializer):
     """
     Gets the list view of the tweet. Same as above but everything is un-editable in here.
     """
 
-    author_username = serializers.CharField(source="author.username", read_only=True)
+    author_username = AuthorUsernameField()
 
     class Meta:
         model = models.Tweet
         fields = (
             "id", "author", "like_count", "retweet_count", "author_username",
-            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id",
+            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id", "root_tweet_id",
+            "liked_by_me", "retweeted_by_me", "root_tweet",
         )
         read_only_fields = (
             "id", "author", "like_count", "retweet_count", "author_username",
-            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id",
+            "creation_datetime", "update_datetime", "tweet", "retweet_id", "thread_id", "root_tweet_id",
         )
 
 
@@ -60,9 +139,168 @@ class TweetUpdateRequestParametersSerializer(serializers.Serializer):
         pass
 
 
+class ConversationRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the number of levels and of tweets of a conversation to return.
+    """
+
+    def __init__(self, *args, max_depth: int = 10, max_size: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["depth"] = serializers.IntegerField(min_value=0, max_value=max_depth, required=False)
+        self.fields["size"] = serializers.IntegerField(min_value=1, max_value=max_size, required=False)
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
+class TweetHistoryRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the version of the tweet to return from its history.
+    """
+
+    version = serializers.IntegerField(min_value=1, required=False)
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
+class TweetVersionSerializer(serializers.Serializer):
+    """
+    Serializes a version of a tweet rebuilt by `tweet.history`.
+    """
+
+    version = serializers.IntegerField(read_only=True)
+    tweet = serializers.CharField(read_only=True)
+    creation_datetime = serializers.DateTimeField(read_only=True)
+
+
+class TweetBatchRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the tweet IDs for the batch detail view, as a list or as comma separated text.
+    """
+
+    def __init__(self, *args, max_ids: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["ids"] = serializers.ListField(
+            child=serializers.IntegerField(min_value=1),
+            allow_empty=False,
+            max_length=max_ids,
+        )
+
+    def to_internal_value(self, data):
+        if not isinstance(data, Mapping):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.error_messages["invalid"].format(datatype=type(data).__name__)
+                ]
+            }, code="invalid")
+
+        ids = data.getlist("ids") if hasattr(data, "getlist") else data.get("ids")
+
+        if isinstance(ids, str):
+            ids = [ids]
+        if isinstance(ids, list) and all(isinstance(tweet_id, str) for tweet_id in ids):
+            ids = [tweet_id.strip() for value in ids for tweet_id in value.split(",") if tweet_id.strip()]
+
+        return super().to_internal_value({} if ids is None else {"ids": ids})
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
+class TweetThreadBatchRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the ordered tweets of a thread, to be published at once.
+    """
+
+    def __init__(self, *args, max_tweets: int = 100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["tweets"] = serializers.ListField(
+            child=serializers.CharField(max_length=281),
+            allow_empty=False,
+            max_length=max_tweets,
+        )
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
+class TrendsRequestParametersSerializer(serializers.Serializer):
+    """
+    Serializer to accept the window and the number of trending hashtags to return.
+    """
+
+    def __init__(self, *args, windows=(60, 24 * 60), max_limit: int = 50, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["minutes"] = serializers.ChoiceField(choices=windows, required=False)
+        self.fields["limit"] = serializers.IntegerField(min_value=1, max_value=max_limit, required=False)
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
 class LikeSerializer(serializers.ModelSerializer):
     author = UserSerializer()
 
     class Meta:
         model = models.Like
         fields = ("creation_datetime", "tweet_id", "author")
+
+
+class TweetLoadSerializer(serializers.Serializer):
+    """
+    Validates a tweet row of a `load_tweets` file, in the format written by `export_data`. Counters are ignored,
+    they are recomputed once loading is done.
+    """
+
+    id = serializers.IntegerField(min_value=1, required=False)
+    author_username = serializers.CharField(max_length=150)
+    tweet = serializers.CharField(max_length=281)
+    creation_datetime = serializers.DateTimeField(required=False)
+    update_datetime = serializers.DateTimeField(required=False)
+    retweet_id = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    thread_id = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
+
+
+class LikeLoadSerializer(serializers.Serializer):
+    """
+    Validates a like row of a `load_tweets` file, in the format written by `export_data`.
+    """
+
+    tweet_id = serializers.IntegerField(min_value=1)
+    author_username = serializers.CharField(max_length=150)
+    creation_datetime = serializers.DateTimeField(required=False)
+
+    # Requirement of the framework.
+    def update(self, instance, validated_data):
+        pass
+
+    def create(self, validated_data):
+        pass
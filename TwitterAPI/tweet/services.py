@@ -0,0 +1,135 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from tweet import cache, counters, models, signals
+from user.models import ProfileStats
+from utils.iterables import batched
+
+
+def bulk_create_tweets(tweets, batch_size: int = 1000, update_counters: bool = True) -> list:
+    """
+    Inserts the unsaved tweets with `batch_size` rows per statement, in one transaction.
+    Counters of retweeted and threaded tweets are updated once per parent, and `tweets_created` is sent once.
+    Shared by the batch views and by importers of tweet archives.
+
+    :param tweets: Unsaved tweets, in order of creation.
+    :param batch_size: Number of tweets to insert per statement.
+    :param update_counters: Whether to update the counters of the parents, importers recount them at the end instead.
+    :return: created tweets, with IDs set.
+    """
+
+    tweets = list(tweets)
+    if not tweets:
+        return tweets
+
+    counted = tweets if update_counters else ()
+    retweet_counts = Counter(tweet.retweet_id for tweet in counted if tweet.retweet_id is not None)
+    thread_counts = Counter(tweet.thread_id for tweet in counted if tweet.thread_id is not None)
+    parents = models.Tweet.objects.in_bulk({*retweet_counts, *thread_counts})
+
+    with transaction.atomic():
+        tweets = models.Tweet.objects.bulk_create(tweets, batch_size=batch_size)
+
+        for parent_id, amount in retweet_counts.items():
+            counters.increment(parents[parent_id], "retweet_count", amount)
+        for parent_id, amount in thread_counts.items():
+            counters.increment(parents[parent_id], "thread_count", amount)
+
+        signals.tweets_created.send(sender=models.Tweet, tweets=tweets)
+
+    cache.tweet_payloads.invalidate(*parents)
+
+    return tweets
+
+
+def publish_thread(author, thread: models.Tweet, bodies) -> list:
+    """
+    Creates a tweet for each of the bodies, in the given order, as a thread of `thread`.
+
+    :param author: User posting the thread.
+    :param thread: Tweet to bind the new tweets to.
+    :param bodies: Text of the new tweets.
+    :return: created tweets.
+    """
+
+    return bulk_create_tweets(models.Tweet(author=author, thread=thread, tweet=body) for body in bodies)
+
+
+def _count(queryset, field: str):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef("pk")}).order_by().values(field).annotate(count=Count("id")).values("count")
+    ), 0)
+
+
+def recount_tweets(batch_size: int = 1000) -> int:
+    """
+    Recomputes the counters of every tweet from the likes, retweets and threads, e.g. after a bulk load.
+    Stale tweets are found in one pass over the table, and only those are written and dropped from the cache.
+
+    :param batch_size: Number of tweets to update per statement.
+    :return: number of tweets whose counters changed.
+    """
+
+    counts = {
+        "like_count": _count(models.Like.objects.all(), "tweet_id"),
+        "retweet_count": _count(models.Tweet.objects.all(), "retweet_id"),
+        "thread_count": _count(models.Tweet.objects.all(), "thread_id"),
+    }
+
+    # Pending increments are folded first, so the counters are compared with their full value.
+    counters.flush(batch_size=batch_size)
+
+    with transaction.atomic():
+        stale_ids = list(models.Tweet.objects.annotate(**{
+            f"actual_{counter}": count for counter, count in counts.items()
+        }).filter(
+            ~Q(like_count=F("actual_like_count"))
+            | ~Q(retweet_count=F("actual_retweet_count"))
+            | ~Q(thread_count=F("actual_thread_count"))
+        ).values_list("id", flat=True))
+
+        for batch in batched(stale_ids, batch_size):
+            models.Tweet.objects.filter(id__in=batch).update(**counts)
+
+    cache.tweet_payloads.invalidate(*stale_ids)
+
+    return len(stale_ids)
+
+
+def recount_profile_stats(batch_size: int = 1000) -> int:
+    """
+    Recomputes the tweet and like counts of every user from the tweets and likes, e.g. after a bulk load.
+    Profiles without counts yet get a row first.
+
+    :param batch_size: Number of profiles to update per statement.
+    :return: number of profiles whose counts changed.
+    """
+
+    counts = {
+        "tweet_count": _count(models.Tweet.objects.all(), "author_id"),
+        "like_count": _count(models.Like.objects.all(), "author_id"),
+    }
+
+    with transaction.atomic():
+        ProfileStats.objects.bulk_create(
+            [ProfileStats(user_id=user_id) for user_id in get_user_model().objects.filter(
+                stats__isnull=True
+            ).values_list("id", flat=True)],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+        stale_ids = list(ProfileStats.objects.annotate(**{
+            f"actual_{count}": expression for count, expression in counts.items()
+        }).filter(
+            ~Q(tweet_count=F("actual_tweet_count")) | ~Q(like_count=F("actual_like_count"))
+        ).values_list("user_id", flat=True))
+
+        for batch in batched(stale_ids, batch_size):
+            ProfileStats.objects.filter(user_id__in=batch).update(**counts)
+
+    return len(stale_ids)
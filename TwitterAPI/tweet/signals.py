@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after tweets are created through the API or in bulk, with `tweets`, the list of new tweets.
+# `post_save` isn't sent by `bulk_create`, so subsystems keeping derived data listen to this instead.
+tweets_created = Signal()
@@ -1,9 +1,39 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from io import StringIO
+from threading import Timer
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from django.urls import reverse
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.serializers import BaseSerializer
 
-from tweet.models import Tweet
+from tweet import cache
+from tweet import counters
+from tweet import history
+from tweet import purge
+from tweet import retweets
+from tweet import search
+from tweet import services
+from tweet import signals
+from tweet import trends
+from tweet import views
+from tweet.management.commands import load_tweets
+from tweet.models import FeedEntry, HashtagCount, Like, LoadCheckpoint, Tweet, TweetCounterShard, TweetToken
+from utils import instrumentation
+from utils.testing import QueryCountAssertionsMixin, QueryPlanAssertionsMixin
 
 
 class SetupManagerMixin:
@@ -17,6 +47,9 @@ class SetupManagerMixin:
     user = None
 
     def setup(self) -> None:
+        cache.tweet_payloads.cache.clear()
+        cache.tweet_payloads.stats.reset()
+
         self.user = get_user_model()(username=self.USERNAME)
         self.user.set_password(self.PASSWORD)
         self.user.save()
@@ -175,3 +208,1576 @@ class TestTweetUpdateView(TestCase, SetupManagerMixin):
             },
         )
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestKeysetPagination(TestCase, SetupManagerMixin):
+    get_tweet_list_url = reverse("tweet:TweetsListView")
+
+    USERNAME = "admin3"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        for i in range(5):
+            Tweet(tweet=f"Tweet number {i}", author=self.user).save()
+
+    def _get_all_pages(self, url):
+        tweet_ids = []
+
+        while url:
+            response = self.client.get(url, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            tweet_ids += [tweet["id"] for tweet in response.data["results"]]
+            url = response.data["next"]
+
+        return tweet_ids
+
+    def test_pages_are_ordered_and_complete(self):
+        tweet_ids = self._get_all_pages(f"{self.get_tweet_list_url}?limit=2")
+
+        self.assertEqual(
+            tweet_ids,
+            list(Tweet.objects.order_by("-creation_datetime", "-id").values_list("id", flat=True))
+        )
+
+    def test_inserts_do_not_shift_pages(self):
+        response = self.client.get(f"{self.get_tweet_list_url}?limit=2", **self.headers)
+        first_page = [tweet["id"] for tweet in response.data["results"]]
+
+        Tweet(tweet="Posted while paging", author=self.user).save()
+        remaining = self._get_all_pages(response.data["next"])
+
+        self.assertEqual(len(first_page + remaining), 5)
+        self.assertFalse(set(first_page) & set(remaining))
+
+    def test_previous_page(self):
+        response = self.client.get(f"{self.get_tweet_list_url}?limit=2", **self.headers)
+        first_page = response.data["results"]
+
+        response = self.client.get(response.data["next"], **self.headers)
+        response = self.client.get(response.data["previous"], **self.headers)
+
+        self.assertEqual(response.data["results"], first_page)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.get_tweet_list_url, **self.headers)
+
+        self.assertFalse([query for query in queries if "COUNT(" in query["sql"].upper()])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{self.get_tweet_list_url}?cursor=invalid", **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_cursor_values(self):
+        for position in (["not a date", 1], [timezone.now().isoformat(), "not an id"], [{}, []]):
+            cursor = urlsafe_b64encode(json.dumps({"p": position}).encode()).decode()
+            response = self.client.get(self.get_tweet_list_url, {"cursor": cursor}, **self.headers)
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+
+class TestListViewQueryCount(TestCase, SetupManagerMixin, QueryCountAssertionsMixin):
+    USERNAME = "admin4"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet(tweet="Original tweet", author=self.user)
+        self.tweet.save()
+
+        for i in range(25):
+            author = get_user_model().objects.create_user(username=f"author{i}", password=self.PASSWORD)
+            Tweet(tweet=f"Retweet {i}", author=author, retweet=self.tweet).save()
+            Tweet(tweet=f"Thread {i}", author=author, thread=self.tweet).save()
+            Like(tweet=self.tweet, author=author).save()
+
+    def test_tweets_list_view(self):
+        self.assertConstantQueryCount(reverse("tweet:TweetsListView"), **self.headers)
+
+    def test_by_author_view(self):
+        self.assertConstantQueryCount(
+            reverse("tweet:TweetsByAuthorView", kwargs={"username": "author0"}), **self.headers
+        )
+
+    def test_likes_list_view(self):
+        self.assertConstantQueryCount(
+            reverse("tweet:LikesListView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+        )
+
+    def test_retweets_list_view(self):
+        self.assertConstantQueryCount(
+            reverse("tweet:GetRetweetsListView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+        )
+
+    def test_threads_list_view(self):
+        self.assertConstantQueryCount(
+            reverse("tweet:GetThreadsView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+        )
+
+
+class TestCounters(TestCase, SetupManagerMixin):
+    USERNAME = "admin5"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet(tweet="Counting on it", author=self.user)
+        self.tweet.save()
+
+    def test_like_unlike(self):
+        url = reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id})
+
+        response = self.client.post(url, **self.headers)
+        self.assertEqual(response.data.get("like_count"), 1)
+        self.assertEqual(Like.objects.filter(tweet=self.tweet).count(), 1)
+
+        response = self.client.post(url, **self.headers)
+        self.assertEqual(response.data.get("like_count"), 0)
+        self.assertFalse(Like.objects.filter(tweet=self.tweet).exists())
+
+    def test_like_does_not_touch_other_columns(self):
+        update_datetime = self.tweet.update_datetime
+        Tweet.objects.filter(id=self.tweet.id).update(tweet="Changed elsewhere")
+
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+
+        self.tweet.refresh_from_db()
+        self.assertEqual(self.tweet.tweet, "Changed elsewhere")
+        self.assertEqual(self.tweet.update_datetime, update_datetime)
+
+    def test_duplicate_like(self):
+        Like(tweet=self.tweet, author=self.user).save()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Like(tweet=self.tweet, author=self.user).save()
+
+    def test_retweet_and_thread_counts(self):
+        self.client.post(
+            reverse("tweet:RetweetView", kwargs={"tweet_id": self.tweet.id}), {"tweet": "Retweet"}, **self.headers
+        )
+        response = self.client.post(
+            reverse("tweet:CreateThreadView", kwargs={"tweet_id": self.tweet.id}), {"tweet": "Thread"}, **self.headers
+        )
+
+        self.tweet.refresh_from_db()
+        self.assertEqual((self.tweet.retweet_count, self.tweet.thread_count), (1, 1))
+
+        self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": response.data["id"]}), **self.headers)
+
+        self.tweet.refresh_from_db()
+        self.assertEqual((self.tweet.retweet_count, self.tweet.thread_count), (1, 0))
+
+
+@override_settings(TWEET_COUNTERS={"BACKEND": "tweet.counters.ShardedCounterBackend", "OPTIONS": {"shards": 4}})
+class TestShardedCounters(TestCase, SetupManagerMixin):
+    USERNAME = "admin6"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet(tweet="Going viral", author=self.user)
+        self.tweet.save()
+
+    def test_pending_likes_are_visible(self):
+        response = self.client.post(
+            reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+        )
+        self.assertEqual(response.data.get("like_count"), 1)
+
+        self.tweet.refresh_from_db()
+        self.assertEqual(self.tweet.like_count, 0)
+
+        response = self.client.get(
+            reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+        )
+        self.assertEqual(response.data.get("like_count"), 1)
+
+        response = self.client.get(reverse("tweet:TweetsListView"), **self.headers)
+        self.assertEqual(response.data["results"][0]["like_count"], 1)
+
+    def test_flush(self):
+        for i in range(10):
+            counters.increment(self.tweet, "retweet_count", 1)
+        counters.increment(self.tweet, "retweet_count", -3)
+
+        call_command("flush_tweet_counters", stdout=StringIO())
+
+        self.tweet.refresh_from_db()
+        self.assertEqual(self.tweet.retweet_count, 7)
+        self.assertFalse(TweetCounterShard.objects.exists())
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked with SQLite's EXPLAIN QUERY PLAN.")
+class TestListViewIndexes(TestCase, SetupManagerMixin, QueryPlanAssertionsMixin):
+    USERNAME = "admin7"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet(tweet="Indexed tweet", author=self.user)
+        self.tweet.save()
+
+        for i in range(5):
+            Tweet(tweet=f"Retweet {i}", author=self.user, retweet=self.tweet).save()
+            Tweet(tweet=f"Thread {i}", author=self.user, thread=self.tweet).save()
+        Like(tweet=self.tweet, author=self.user).save()
+
+    def _assert_pages_use_indexes(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"limit": 2}, **self.headers)
+            self.client.get(response.data["next"], **self.headers)
+
+        self.assertQueriesUseIndexes(queries, tables=("tweet_tweet", "tweet_like"))
+
+    def test_tweets_list_view(self):
+        self._assert_pages_use_indexes(reverse("tweet:TweetsListView"))
+
+    def test_by_author_view(self):
+        self._assert_pages_use_indexes(reverse("tweet:TweetsByAuthorView", kwargs={"username": self.USERNAME}))
+
+    def test_likes_list_view(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("tweet:LikesListView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+
+        self.assertQueriesUseIndexes(queries, tables=("tweet_like",))
+
+    def test_retweets_list_view(self):
+        self._assert_pages_use_indexes(reverse("tweet:GetRetweetsListView", kwargs={"tweet_id": self.tweet.id}))
+
+    def test_threads_list_view(self):
+        self._assert_pages_use_indexes(reverse("tweet:GetThreadsView", kwargs={"tweet_id": self.tweet.id}))
+
+    def test_like_unlike_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers
+            )
+
+        self.assertQueriesUseIndexes(queries, tables=("tweet_like",))
+
+
+class TestTimelineView(TestCase, SetupManagerMixin, QueryPlanAssertionsMixin):
+    timeline_url = reverse("tweet:TimelineView")
+
+    USERNAME = "admin8"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.followed = get_user_model().objects.create_user(username="followed", password=self.PASSWORD)
+        self.stranger = get_user_model().objects.create_user(username="stranger", password=self.PASSWORD)
+
+        self.client.post(reverse("user:FollowUnfollowView", kwargs={"username": "followed"}), **self.headers)
+
+    def _tweet_as(self, user, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            tweet = Tweet.objects.create(author=user, tweet=text)
+            signals.tweets_created.send(sender=Tweet, tweets=[tweet])
+
+        return tweet
+
+    def _get_timeline_ids(self):
+        response = self.client.get(self.timeline_url, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [tweet["id"] for tweet in response.data["results"]]
+
+    def test_fan_out_on_write(self):
+        own = self._tweet_as(self.user, "Own tweet")
+        followed = self._tweet_as(self.followed, "Followed tweet")
+        self._tweet_as(self.stranger, "Stranger tweet")
+
+        self.assertEqual(self._get_timeline_ids(), [followed.id, own.id])
+
+    def test_create_tweet_fans_out(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("tweet:CreateTweet"), {"tweet": "Hello"}, **self.headers)
+
+        self.assertEqual(self._get_timeline_ids(), [response.data["id"]])
+
+    @override_settings(TWEET_FEEDS={"FANOUT_FOLLOWER_LIMIT": 0})
+    def test_fan_out_on_read(self):
+        followed = self._tweet_as(self.followed, "Too popular to fan out")
+
+        self.assertFalse(FeedEntry.objects.filter(owner=self.user).exists())
+        self.assertEqual(self._get_timeline_ids(), [followed.id])
+        self.assertEqual(self._get_timeline_ids(), [followed.id])
+
+    @skipUnless(connection.vendor == "sqlite", "Query plans are checked with SQLite's EXPLAIN QUERY PLAN.")
+    def test_timeline_uses_index(self):
+        for i in range(3):
+            self._tweet_as(self.followed, f"Followed tweet {i}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.timeline_url, {"limit": 2}, **self.headers)
+            self.client.get(response.data["next"], **self.headers)
+
+        self.assertQueriesUseIndexes(queries, tables=("tweet_feedentry",))
+
+    def test_unfollow(self):
+        own = self._tweet_as(self.user, "Own tweet")
+        self._tweet_as(self.followed, "Followed before")
+
+        response = self.client.post(
+            reverse("user:FollowUnfollowView", kwargs={"username": "followed"}), **self.headers
+        )
+        self.assertFalse(response.data["following"])
+        self.assertEqual(response.data["follower_count"], 0)
+        self.assertEqual(self._get_timeline_ids(), [own.id])
+        self.assertFalse(FeedEntry.objects.filter(owner=self.user, tweet__author=self.followed).exists())
+
+        self._tweet_as(self.followed, "Not followed anymore")
+        self.assertEqual(self._get_timeline_ids(), [own.id])
+
+    def test_fan_out_tweets_command(self):
+        tweet = Tweet.objects.create(author=self.followed, tweet="Posted before the feeds existed")
+
+        call_command("fan_out_tweets", stdout=StringIO())
+
+        self.assertEqual(self._get_timeline_ids(), [tweet.id])
+
+
+class TestTweetDetailCache(TestCase, SetupManagerMixin):
+    USERNAME = "admin9"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet(tweet="Read a million times", author=self.user)
+        self.tweet.save()
+
+        self.detail_url = reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweet.id})
+
+    def _get_detail(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tweet_queries = [query for query in queries if '"tweet_tweet"' in query["sql"]]
+
+        return response.data, len(tweet_queries)
+
+    def test_read_through(self):
+        self.assertEqual(self._get_detail()[1], 1)
+        self.assertEqual(self._get_detail()[1], 0)
+
+        self.assertEqual(cache.tweet_payloads.stats.as_dict()["hits"], 1)
+        self.assertEqual(cache.tweet_payloads.stats.as_dict()["misses"], 1)
+
+    def test_invalidated_on_like_and_update(self):
+        self._get_detail()
+
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+        self.assertEqual(self._get_detail()[0]["like_count"], 1)
+
+        self.client.post(
+            reverse("tweet:TweetUpdateView"), {"tweet_id": self.tweet.id, "tweet": "Edited"}, **self.headers
+        )
+        self.assertEqual(self._get_detail()[0]["tweet"], "Edited")
+
+    def test_invalidated_on_retweet_and_delete(self):
+        self._get_detail()
+
+        response = self.client.post(
+            reverse("tweet:RetweetView", kwargs={"tweet_id": self.tweet.id}), {"tweet": "Retweet"}, **self.headers
+        )
+        self.assertEqual(self._get_detail()[0]["retweet_count"], 1)
+
+        retweet_url = reverse("tweet:TweetDetailView", kwargs={"tweet_id": response.data["id"]})
+        self.client.get(retweet_url, **self.headers)
+        self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+
+        self.assertEqual(self.client.get(self.detail_url, **self.headers).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(retweet_url, **self.headers).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stampede_guard(self):
+        key = cache.tweet_payloads.make_key(self.tweet.id)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {"id": self.tweet.id}
+
+        # Another process is rebuilding the payload, and stores it while we wait.
+        cache.tweet_payloads.cache.add(f"{key}:lock", "other")
+        Timer(0.05, lambda: cache.tweet_payloads.cache.set(key, {"id": self.tweet.id})).start()
+
+        self.assertEqual(cache.tweet_payloads.get(self.tweet.id, build), {"id": self.tweet.id})
+        self.assertEqual(builds, [])
+        self.assertEqual(cache.tweet_payloads.stats.as_dict()["waits"], 1)
+
+    def test_batch_build_invalidated(self):
+        other = Tweet.objects.create(tweet="Built alongside", author=self.user)
+
+        def build_many(tweet_ids):
+            # The tweet changes while its payload is built.
+            cache.tweet_payloads.invalidate(self.tweet.id)
+            return {tweet_id: {"id": tweet_id} for tweet_id in tweet_ids}
+
+        payloads = cache.tweet_payloads.get_many([self.tweet.id, other.id], build_many)
+
+        self.assertEqual(payloads, {self.tweet.id: {"id": self.tweet.id}, other.id: {"id": other.id}})
+        self.assertIsNone(cache.tweet_payloads.cache.get(cache.tweet_payloads.make_key(self.tweet.id)))
+        self.assertEqual(cache.tweet_payloads.cache.get(cache.tweet_payloads.make_key(other.id)), {"id": other.id})
+
+
+class TestTweetBatchDetailView(TestCase, SetupManagerMixin):
+    batch_url = reverse("tweet:TweetBatchDetailView")
+
+    USERNAME = "admin10"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweets = [Tweet.objects.create(tweet=f"Batched {i}", author=self.user) for i in range(3)]
+
+    def test_order_and_missing(self):
+        ids = [self.tweets[2].id, 987654, self.tweets[0].id, self.tweets[2].id]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.batch_url, {"ids": ",".join(map(str, ids))}, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tweet["id"] for tweet in response.data["results"]], [self.tweets[2].id, self.tweets[0].id])
+        self.assertEqual(response.data["missing"], [987654])
+        self.assertEqual(len([query for query in queries if '"tweet_tweet"' in query["sql"]]), 1)
+
+    def test_post_without_object(self):
+        for body in ([self.tweets[0].id, self.tweets[1].id], self.tweets[0].id):
+            response = self.client.post(self.batch_url, body, content_type="application/json", **self.headers)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("non_field_errors", response.data)
+
+    def test_post_uses_cache(self):
+        self.client.get(reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweets[0].id}), **self.headers)
+
+        response = self.client.post(
+            self.batch_url, {"ids": [tweet.id for tweet in self.tweets]}, content_type="application/json",
+            **self.headers
+        )
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(cache.tweet_payloads.stats.as_dict()["hits"], 1)
+
+        response = self.client.get(self.batch_url, {"ids": self.tweets[1].id}, **self.headers)
+        self.assertEqual(response.data["results"][0]["tweet"], "Batched 1")
+        self.assertEqual(cache.tweet_payloads.stats.as_dict()["hits"], 2)
+
+    @override_settings(TWEET_BATCH_MAX_IDS=2)
+    def test_batch_size_cap(self):
+        response = self.client.get(
+            self.batch_url, {"ids": ",".join(str(tweet.id) for tweet in self.tweets)}, **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_ids(self):
+        response = self.client.get(self.batch_url, {"ids": "1,abc"}, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestCreateThreadBatchView(TestCase, SetupManagerMixin):
+    USERNAME = "admin11"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="Thread start", author=self.user)
+        self.url = reverse("tweet:CreateThreadBatchView", kwargs={"tweet_id": self.tweet.id})
+
+    def test_publish_thread(self):
+        bodies = [f"Part {i}" for i in range(20)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    self.url, {"tweets": bodies}, content_type="application/json", **self.headers
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tweet["tweet"] for tweet in response.data], bodies)
+        self.assertTrue(all(tweet["thread_id"] == self.tweet.id for tweet in response.data))
+        self.assertEqual(len([query for query in queries if query["sql"].startswith('INSERT INTO "tweet_tweet"')]), 1)
+
+        self.tweet.refresh_from_db()
+        self.assertEqual(self.tweet.thread_count, 20)
+        self.assertEqual(FeedEntry.objects.filter(owner=self.user).count(), 20)
+
+        threads = self.client.get(reverse("tweet:GetThreadsView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+        self.assertEqual(threads.data["results"][0]["tweet"], "Part 19")
+
+    def test_rolls_back_invalid_batch(self):
+        response = self.client.post(
+            self.url, {"tweets": ["Fine", "x" * 282]}, content_type="application/json", **self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tweet.objects.filter(thread=self.tweet).exists())
+
+    @override_settings(TWEET_THREAD_BATCH_MAX_TWEETS=2)
+    def test_batch_size_cap(self):
+        response = self.client.post(
+            self.url, {"tweets": ["1", "2", "3"]}, content_type="application/json", **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestViewerState(TestCase, SetupManagerMixin, QueryCountAssertionsMixin):
+    USERNAME = "admin12"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        other_user = get_user_model().objects.create(username="viewer_other")
+        self.tweets = [Tweet.objects.create(tweet=f"Tweet {i}", author=other_user) for i in range(25)]
+
+        Like.objects.create(tweet=self.tweets[-1], author=self.user)
+        Like.objects.create(tweet=self.tweets[-2], author=other_user)
+        Tweet.objects.create(tweet="Retweet", author=self.user, retweet=self.tweets[-2])
+
+    def test_viewer_state(self):
+        response = self.client.get(reverse("tweet:TweetsListView"), {"viewer_state": "true"}, **self.headers)
+        states = {
+            tweet["id"]: (tweet["liked_by_me"], tweet["retweeted_by_me"]) for tweet in response.data["results"]
+        }
+
+        self.assertEqual(states[self.tweets[-1].id], (True, False))
+        self.assertEqual(states[self.tweets[-2].id], (False, True))
+        self.assertEqual(states[self.tweets[-3].id], (False, False))
+
+    def test_viewer_state_is_optional(self):
+        response = self.client.get(reverse("tweet:TweetsListView"), **self.headers)
+        self.assertNotIn("liked_by_me", response.data["results"][0])
+
+        detail = self.client.get(reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweets[-1].id}),
+                                 **self.headers)
+        self.assertNotIn("liked_by_me", detail.data)
+
+    def test_constant_query_count(self):
+        self.assertConstantQueryCount(
+            reverse("tweet:TweetsListView"), data={"viewer_state": "true"}, **self.headers
+        )
+
+
+class TestSearch(TestCase, SetupManagerMixin, QueryPlanAssertionsMixin):
+    search_url = reverse("tweet:SearchTweetsView")
+
+    USERNAME = "admin13"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweets = [
+            Tweet.objects.create(tweet="Learning #Django with @admin13", author=self.user),
+            Tweet.objects.create(tweet="django django, everywhere", author=self.user),
+            Tweet.objects.create(tweet="Python is fun", author=self.user),
+        ]
+
+    def search(self, query, **params):
+        return self.client.get(self.search_url, {"q": query, **params}, **self.headers)
+
+    def test_tokenize(self):
+        self.assertEqual(search.tokenize("Hi #Django, @Bob!"), ["hi", "#django", "django", "@bob", "bob"])
+        self.assertEqual(search.extract_hashtags("#a #B #a"), ["a", "b"])
+        self.assertEqual(search.extract_mentions("@bob and @Alice"), ["bob", "alice"])
+
+    def test_ranked_results(self):
+        response = self.search("Django")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tweet["id"] for tweet in response.data["results"]], [self.tweets[1].id, self.tweets[0].id])
+
+    def test_hashtag_and_mention(self):
+        self.assertEqual([tweet["id"] for tweet in self.search("#django").data["results"]], [self.tweets[0].id])
+        self.assertEqual(len(self.search("@admin13 learning").data["results"]), 1)
+        self.assertEqual(len(self.search("#python").data["results"]), 0)
+
+    def test_pagination(self):
+        for i in range(5):
+            Tweet.objects.create(tweet=f"django {i}", author=self.user)
+
+        first = self.search("django", limit=4)
+        second = self.client.get(first.data["next"], **self.headers)
+
+        ids = [tweet["id"] for tweet in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+        self.assertIsNone(second.data["next"])
+
+    def test_index_maintenance(self):
+        tweet = self.tweets[2]
+        self.client.post(reverse("tweet:TweetUpdateView"), {"tweet_id": tweet.id, "tweet": "Rust now"}, **self.headers)
+
+        self.assertEqual(len(self.search("python").data["results"]), 0)
+        self.assertEqual(len(self.search("rust").data["results"]), 1)
+
+        counters.increment(tweet, "like_count", 1)
+        self.assertEqual(TweetToken.objects.filter(tweet=tweet).count(), 2)
+
+        self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": tweet.id}), **self.headers)
+        self.assertFalse(TweetToken.objects.filter(tweet_id=tweet.id).exists())
+
+    def test_bulk_created_tweets_are_indexed(self):
+        self.client.post(
+            reverse("tweet:CreateThreadBatchView", kwargs={"tweet_id": self.tweets[2].id}),
+            {"tweets": ["thread about flask", "and more flask"]}, content_type="application/json", **self.headers
+        )
+        self.assertEqual(len(self.search("flask").data["results"]), 2)
+
+    def test_empty_query(self):
+        self.assertEqual(self.search(" ,! ").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_uses_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.search("django fun")
+
+        # Ranked results are sorted after matching, only the lookups themselves must use the index.
+        sql = next(query["sql"] for query in queries if '"tweet_tweettoken"' in query["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        self.assertFalse([step for step in plan if step.startswith("SCAN")], plan)
+
+
+@override_settings(TWEET_TRENDS={"WINDOWS": (60, 120), "MAX_LIMIT": 5})
+class TestTrends(TestCase, SetupManagerMixin):
+    trends_url = reverse("tweet:TrendsView")
+
+    USERNAME = "admin14"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+    def create(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("tweet:CreateTweet"), {"tweet": text}, **self.headers).data
+
+    def test_trends(self):
+        tweet = self.create("#Django and #python")
+        self.create("more #django #django")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("tweet:RetweetView", kwargs={"tweet_id": tweet["id"]}), {"tweet": "#rust"},
+                             **self.headers)
+
+        response = self.client.get(self.trends_url, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"hashtag": "django", "count": 2}, {"hashtag": "python", "count": 1}, {"hashtag": "rust", "count": 1},
+        ])
+        self.assertEqual(HashtagCount.objects.count(), 3)
+
+    def test_update_counts_added_hashtags(self):
+        tweet = self.create("#one")
+        self.client.post(reverse("tweet:TweetUpdateView"), {"tweet_id": tweet["id"], "tweet": "#one #two"},
+                         **self.headers)
+
+        counts = {trend["hashtag"]: trend["count"] for trend in trends.get_trends()}
+        self.assertEqual(counts, {"one": 1, "two": 1})
+
+    def test_window(self):
+        trends.record(["old"] * 3, moment=timezone.now() - timedelta(minutes=90))
+        trends.record(["older"], moment=timezone.now() - timedelta(minutes=150))
+        self.create("#new")
+
+        self.assertEqual([trend["hashtag"] for trend in trends.get_trends(minutes=60)], ["new"])
+        self.assertEqual([trend["hashtag"] for trend in trends.get_trends(minutes=120)], ["old", "new"])
+
+    def test_decay(self):
+        trends.record(["leaving", "leaving", "staying"], moment=timezone.now() - timedelta(minutes=50))
+        trends.record(["leaving"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(trends.get_trends(minutes=60), [
+                {"hashtag": "leaving", "count": 3}, {"hashtag": "staying", "count": 1},
+            ])
+        self.assertEqual(len(queries), 1)
+
+        trends.decay(timezone.now() + timedelta(minutes=15))
+        self.assertEqual(trends.get_trends(minutes=60), [{"hashtag": "leaving", "count": 1}])
+        self.assertEqual([trend["count"] for trend in trends.get_trends(minutes=120)], [3, 1])
+
+        # Buckets still counted by the longer window are kept.
+        call_command("prune_trends", older_than=30, stdout=StringIO())
+        self.assertEqual(HashtagCount.objects.filter(hashtag="staying").count(), 1)
+
+    def test_new_window_backfilled(self):
+        trends.record(["early"], moment=timezone.now() - timedelta(minutes=100))
+
+        with override_settings(TWEET_TRENDS={"WINDOWS": (60, 120, 180)}):
+            trends.record(["late"])
+            self.assertEqual([trend["hashtag"] for trend in trends.get_trends(minutes=180)], ["early", "late"])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.trends_url, {"limit": 6}, **self.headers).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.trends_url, {"minutes": 0}, **self.headers).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.trends_url, {"minutes": 90}, **self.headers).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(ASYNC_VIEWS={"THREAD_SENSITIVE": True})
+class TestAsyncViews(TestCase, SetupManagerMixin):
+    USERNAME = "admin15"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="Async tweet", author=self.user)
+
+    def get_async(self, view, url, **kwargs):
+        response = async_to_sync(view.as_view())(RequestFactory().get(url, **self.headers), **kwargs)
+        response.render()
+
+        return response
+
+    def test_detail_view(self):
+        url = reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweet.id})
+        response = self.get_async(views.AsyncTweetDetailView, url, tweet_id=self.tweet.id)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.client.get(url, **self.headers).data)
+
+        missing = self.get_async(views.AsyncTweetDetailView, url, tweet_id=self.tweet.id + 1)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_view(self):
+        url = reverse("tweet:TweetsListView")
+        response = self.get_async(views.AsyncTweetsListView, url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], self.client.get(url, **self.headers).data["results"])
+
+    def test_authentication_required(self):
+        response = async_to_sync(views.AsyncTweetsListView.as_view())(RequestFactory().get("/"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(PERFORMANCE_INSTRUMENTATION={
+    "ENABLED": True, "SAMPLE_RATE": 1, "SLOW_REQUEST_MS": 60000, "EXTRA_METRICS": ("tweet.cache.metrics",),
+})
+class TestPerformanceInstrumentation(TestCase, SetupManagerMixin):
+    USERNAME = "admin16"
+    PASSWORD = "Testing@123"
+
+    list_url = reverse("tweet:TweetsListView")
+    metrics_url = reverse("metrics")
+
+    def setUp(self) -> None:
+        self.setup()
+        instrumentation.view_metrics.reset()
+
+        Tweet.objects.bulk_create(Tweet(tweet=f"Tweet {i}", author=self.user) for i in range(3))
+
+    def test_records_view_metrics(self):
+        response = self.client.get(self.list_url, **self.headers)
+        metrics = instrumentation.view_metrics.as_dict()["tweet:TweetsListView"]
+
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["queries"], 0)
+        self.assertGreater(metrics["wall_seconds"], metrics["db_seconds"])
+        self.assertGreater(metrics["serializer_seconds"], 0)
+        self.assertEqual(metrics["response_bytes"], len(response.content))
+
+    def test_serializers_timed_only_while_sampled(self):
+        data = BaseSerializer.__dict__["data"]
+
+        self.client.get(self.list_url, **self.headers)
+
+        self.assertIs(BaseSerializer.__dict__["data"], data)
+        self.assertGreater(instrumentation.view_metrics.as_dict()["tweet:TweetsListView"]["serializer_seconds"], 0)
+
+    @override_settings(ASYNC_VIEWS={"THREAD_SENSITIVE": True})
+    def test_async_chain(self):
+        async def get_response(request):
+            response = await views.AsyncTweetsListView.as_view()(request)
+            return response.render()
+
+        middleware = instrumentation.PerformanceMiddleware(get_response)
+        request = RequestFactory().get(self.list_url, **self.headers)
+        request.resolver_match = resolve(self.list_url)
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(request)
+
+        metrics = instrumentation.view_metrics.as_dict()["tweet:TweetsListView"]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(metrics["requests"], 1)
+        self.assertGreater(metrics["queries"], 0)
+        self.assertGreater(metrics["serializer_seconds"], 0)
+
+    def test_counts_duplicate_queries(self):
+        profile = instrumentation.RequestProfile()
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 1"):
+            profile.record_query(lambda *args: None, sql, (), False, {})
+
+        self.assertEqual(len(profile.queries), 4)
+        self.assertEqual(profile.duplicate_queries, 2)
+
+    def test_unsampled_requests_are_not_recorded(self):
+        with self.settings(PERFORMANCE_INSTRUMENTATION={"ENABLED": True, "SAMPLE_RATE": 0}):
+            Client().get(self.list_url, **self.headers)
+
+        self.assertEqual(instrumentation.view_metrics.as_dict(), {})
+
+    def test_metrics_endpoint(self):
+        self.client.get(self.list_url, **self.headers)
+        response = self.client.get(self.metrics_url)
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('django_view_requests_total{view="tweet:TweetsListView"} 1', body)
+        self.assertIn('django_view_wall_seconds_bucket{view="tweet:TweetsListView",le="+Inf"} 1', body)
+        self.assertIn("tweet_payload_cache_hits_total", body)
+
+    def test_metrics_endpoint_restricted(self):
+        response = self.client.get(self.metrics_url, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        instrumentation.view_metrics.reset()
+        with self.settings(PERFORMANCE_INSTRUMENTATION={"ENABLED": False}):
+            self.assertEqual(Client().get(self.metrics_url).status_code, status.HTTP_404_NOT_FOUND)
+            Client().get(self.list_url, **self.headers)
+
+        self.assertEqual(instrumentation.view_metrics.as_dict(), {})
+
+    def test_slow_request_log(self):
+        with self.settings(PERFORMANCE_INSTRUMENTATION={"ENABLED": True, "SAMPLE_RATE": 1, "SLOW_REQUEST_MS": 0}):
+            with self.assertLogs("utils.instrumentation", "WARNING") as logs:
+                Client().get(self.list_url, **self.headers)
+
+        self.assertIn("tweet:TweetsListView", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+
+@override_settings(DATA_EXPORT={"CHUNK_SIZE": 2})
+class TestExport(TestCase, SetupManagerMixin):
+    USERNAME = "admin17"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.other = get_user_model().objects.create(username="other17")
+        self.tweets = Tweet.objects.bulk_create(
+            Tweet(tweet=f"Tweet {i}", author=self.user if i % 2 else self.other) for i in range(5)
+        )
+        self.retweet = Tweet.objects.create(tweet="Retweet", author=self.user, retweet=self.tweets[0])
+        Like.objects.create(tweet=self.tweets[0], author=self.other)
+
+    def export(self, kind, **params):
+        response = self.client.get(reverse("tweet:ExportView", kwargs={"kind": kind}), params, **self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, content = self.export("tweets")
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([row["id"] for row in rows], [tweet.id for tweet in [*self.tweets, self.retweet]])
+        self.assertEqual(rows[-1]["author_username"], self.USERNAME)
+        self.assertEqual(rows[-1]["retweet_id"], self.tweets[0].id)
+
+    def test_csv(self):
+        response, content = self.export("likes", file_format="csv")
+        rows = list(csv.reader(StringIO(content)))
+
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="likes.csv"')
+        self.assertEqual(rows[0], ["id", "tweet_id", "author_id", "author_username", "creation_datetime"])
+        self.assertEqual(rows[1][1:4], [str(self.tweets[0].id), str(self.other.id), "other17"])
+
+    def test_filters(self):
+        _, content = self.export("tweets", author=self.USERNAME)
+        self.assertEqual(len(content.splitlines()), 3)
+
+        _, content = self.export("retweets")
+        self.assertEqual([json.loads(line)["id"] for line in content.splitlines()], [self.retweet.id])
+
+        Tweet.objects.filter(id=self.tweets[0].id).update(creation_datetime=timezone.now() - timedelta(days=2))
+        _, content = self.export("tweets", until=(timezone.now() - timedelta(days=1)).isoformat())
+        self.assertEqual([json.loads(line)["id"] for line in content.splitlines()], [self.tweets[0].id])
+
+    def test_likes_of_deleted_tweets(self):
+        Like.objects.create(tweet=self.tweets[1], author=self.other)
+        purge.delete_tweet(self.tweets[0])
+
+        _, content = self.export("likes")
+        self.assertEqual([json.loads(line)["tweet_id"] for line in content.splitlines()], [self.tweets[1].id])
+
+    def test_streams_with_a_single_query(self):
+        response = self.client.get(reverse("tweet:ExportView", kwargs={"kind": "tweets"}), **self.headers)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 6)
+
+    def test_invalid_parameters(self):
+        url = reverse("tweet:ExportView", kwargs={"kind": "tweets"})
+
+        self.assertEqual(
+            self.client.get(url, {"file_format": "xml"}, **self.headers).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(url, {"since": "2022-01-02", "until": "2022-01-01"}, **self.headers).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(reverse("tweet:ExportView", kwargs={"kind": "users"}), **self.headers).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command("export_data", "tweets", "--author", "other17", "--format", "csv", stdout=out)
+
+        rows = list(csv.reader(StringIO(out.getvalue())))
+        self.assertEqual([int(row[0]) for row in rows[1:]], [tweet.id for tweet in self.tweets[::2]])
+
+
+class TestLoadTweets(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create(username="loader18")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, rows):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.writelines(f"{row if isinstance(row, str) else json.dumps(row)}\n" for row in rows)
+
+        return path
+
+    def load(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command("load_tweets", path, *args, stdout=out, stderr=err)
+
+        return out.getvalue(), err.getvalue()
+
+    def tweet_rows(self):
+        return [
+            {
+                "id": 1001, "author_username": "loader18", "tweet": "Old #history",
+                "creation_datetime": "2020-01-01T00:00:00Z",
+            },
+            {"id": 1002, "author_username": "loader18", "tweet": "Retweet", "retweet_id": 1001},
+            {"id": 1003, "author_username": "loader18", "tweet": "Thread", "thread_id": 1001},
+        ]
+
+    def test_load(self):
+        path = self.write("tweets.ndjson", [
+            *self.tweet_rows(),
+            {"author_username": "nobody", "tweet": "Unknown author"},
+            {"author_username": "loader18", "tweet": "Missing parent", "retweet_id": 999},
+            "not json",
+            {"author_username": "loader18", "tweet": ""},
+        ])
+        out, err = self.load(path, "--batch-size", "2")
+
+        self.assertEqual(sorted(Tweet.objects.values_list("id", flat=True)), [1001, 1002, 1003])
+        self.assertEqual(len(err.splitlines()), 4)
+        self.assertIn("3 rows loaded, 4 skipped", out)
+        self.assertFalse(LoadCheckpoint.objects.exists())
+
+        tweet = Tweet.objects.get(id=1001)
+        self.assertEqual(tweet.creation_datetime.year, 2020)
+        self.assertEqual((tweet.retweet_count, tweet.thread_count), (1, 1))
+        self.assertEqual(list(search.search_queryset("history").values_list("id", flat=True)), [1001])
+
+        # New tweets get IDs after the loaded ones.
+        self.assertGreater(Tweet.objects.create(author=self.user, tweet="New").id, 1003)
+
+    def test_load_likes(self):
+        self.load(self.write("tweets.ndjson", self.tweet_rows()))
+        self.load(self.write("likes.ndjson", [
+            {"tweet_id": 1001, "author_username": "loader18"},
+            {"tweet_id": 1001, "author_username": "loader18"},
+            {"tweet_id": 999, "author_username": "loader18"},
+        ]), "--likes")
+
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertEqual(Tweet.objects.get(id=1001).like_count, 1)
+
+    def test_resume_after_interruption(self):
+        path = self.write("tweets.ndjson", self.tweet_rows())
+        bulk_create_tweets = services.bulk_create_tweets
+
+        def interrupt_second_batch(tweets, **kwargs):
+            if Tweet.objects.exists():
+                raise KeyboardInterrupt()
+            return bulk_create_tweets(tweets, **kwargs)
+
+        with mock.patch.object(services, "bulk_create_tweets", side_effect=interrupt_second_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                self.load(path, "--batch-size", "1")
+
+        self.assertEqual(list(Tweet.objects.values_list("id", flat=True)), [1001])
+
+        out, _ = self.load(path, "--batch-size", "1")
+        self.assertIn("Resuming at line 2", out)
+        self.assertEqual(sorted(Tweet.objects.values_list("id", flat=True)), [1001, 1002, 1003])
+
+        # Loading again skips the rows that are already there.
+        out, _ = self.load(path, "--restart")
+        self.assertIn("0 rows loaded, 3 skipped", out)
+        self.assertEqual(Tweet.objects.count(), 3)
+
+    def test_resume_without_ids(self):
+        path = self.write("tweets.ndjson", [{"author_username": "loader18", "tweet": f"No ID {i}"} for i in range(3)])
+        save_checkpoint = load_tweets.Command.save_checkpoint
+
+        def interrupt_second_checkpoint(name, progress):
+            if progress["line"] == 2:
+                raise KeyboardInterrupt()
+            save_checkpoint(name, progress)
+
+        with mock.patch.object(load_tweets.Command, "save_checkpoint", side_effect=interrupt_second_checkpoint):
+            with self.assertRaises(KeyboardInterrupt):
+                self.load(path, "--batch-size", "1")
+
+        # The batch was rolled back with its checkpoint, so it is loaded once.
+        self.assertEqual(list(Tweet.objects.values_list("tweet", flat=True)), ["No ID 0"])
+
+        out, _ = self.load(path, "--batch-size", "1")
+        self.assertIn("Resuming at line 2", out)
+        self.assertEqual(sorted(Tweet.objects.values_list("tweet", flat=True)), ["No ID 0", "No ID 1", "No ID 2"])
+
+
+class TestDenormalizedAuthor(TestCase, SetupManagerMixin):
+    USERNAME = "admin19"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="Tweet", author=self.user)
+        Tweet.objects.bulk_create([Tweet(tweet="Bulk", author_id=self.user.id)])
+
+    def test_set_on_create(self):
+        self.assertEqual(set(Tweet.objects.values_list("author_username", flat=True)), {self.USERNAME})
+
+    def test_username_change(self):
+        user = get_user_model().objects.get(id=self.user.id)
+        user.username = "renamed19"
+        user.save()
+
+        self.assertEqual(set(Tweet.objects.values_list("author_username", flat=True)), {"renamed19"})
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+    @override_settings(TWEET_DENORMALIZED_AUTHOR=True)
+    def test_list_without_join(self):
+        url = reverse("tweet:TweetsListView")
+        self.client.get(url, **self.headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **self.headers)
+
+        self.assertEqual({tweet["author_username"] for tweet in response.data["results"]}, {self.USERNAME})
+        tweet_queries = [query["sql"] for query in queries.captured_queries if 'FROM "tweet_tweet"' in query["sql"]]
+        self.assertTrue(tweet_queries)
+        self.assertFalse([sql for sql in tweet_queries if '"user_user"' in sql])
+
+    def test_backfill_and_check(self):
+        Tweet.objects.update(author_username="")
+        out = StringIO()
+
+        call_command("backfill_author_usernames", "--batch-size", "1", stdout=out)
+        self.assertIn("of 2 tweets", out.getvalue())
+        self.assertEqual(set(Tweet.objects.values_list("author_username", flat=True)), {self.USERNAME})
+
+        Tweet.objects.filter(id=self.tweet.id).update(author_username="drifted")
+        with self.assertRaisesMessage(CommandError, "1 tweets"):
+            call_command("check_author_usernames", stdout=out)
+
+        call_command("check_author_usernames", "--repair", stdout=out)
+        call_command("check_author_usernames", stdout=out)
+        self.assertIn("consistent", out.getvalue())
+
+
+class TestTweetHistory(TestCase, SetupManagerMixin):
+    USERNAME = "admin20"
+    PASSWORD = "Testing@123"
+
+    update_url = reverse("tweet:TweetUpdateView")
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="The quick brown fox jumps over the lazy dog", author=self.user)
+
+    def edit(self, text):
+        return self.client.post(self.update_url, {"tweet_id": self.tweet.id, "tweet": text}, **self.headers)
+
+    def get_history(self, **params):
+        return self.client.get(
+            reverse("tweet:TweetHistoryView", kwargs={"tweet_id": self.tweet.id}), params, **self.headers
+        )
+
+    def test_delta(self):
+        source = "The quick brown fox jumps over the lazy dog, again and again 🦊"
+        target = "The quick red fox jumps over the lazy cat, again and again 🦊"
+
+        delta = history.make_delta(source, target)
+        self.assertEqual(history.apply_delta(source, delta), target)
+        self.assertLess(len(delta), len(target))
+
+        self.assertEqual(history.apply_delta(source, history.make_delta(source, "")), "")
+        self.assertEqual(history.apply_delta("", history.make_delta("", target)), target)
+
+    def test_history(self):
+        texts = [self.tweet.tweet, "The quick red fox jumps over the lazy dog", "The quick red fox sleeps"]
+        for text in texts[1:]:
+            self.assertEqual(self.edit(text).status_code, status.HTTP_200_OK)
+
+        response = self.get_history()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([version["tweet"] for version in response.data["versions"]], texts[::-1])
+        self.assertEqual([version["version"] for version in response.data["versions"]], [3, 2, 1])
+
+        self.assertEqual(self.get_history(version=1).data["versions"][0]["tweet"], texts[0])
+        self.assertEqual(self.get_history(version=4).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_writes_only_changed_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.edit("Edited")
+
+        updates = [
+            query["sql"] for query in queries.captured_queries if query["sql"].startswith('UPDATE "tweet_tweet"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("like_count", updates[0])
+
+        self.edit("Edited")
+        self.assertEqual(self.tweet.revisions.count(), 1)
+
+    def test_edit_returns_locked_text(self):
+        stale = Tweet.objects.get(id=self.tweet.id)
+        # A concurrent edit commits after `stale` was read.
+        Tweet.objects.filter(id=self.tweet.id).update(tweet="Concurrent #edit")
+
+        self.assertEqual(history.edit_tweet(stale, "Concurrent #edit and more"), "Concurrent #edit")
+        self.assertIsNone(history.edit_tweet(stale, "Concurrent #edit and more"))
+
+
+class TestDeleteTweet(TestCase, SetupManagerMixin):
+    USERNAME = "admin21"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="Viral #tweet", author=self.user)
+        self.retweets = Tweet.objects.bulk_create(
+            Tweet(tweet=f"Retweet {i}", author=self.user, retweet=self.tweet) for i in range(5)
+        )
+        self.reply = Tweet.objects.create(tweet="Reply", author=self.user, thread=self.retweets[0])
+        self.other = Tweet.objects.create(tweet="Other", author=self.user)
+
+        Like.objects.bulk_create(Like(tweet=tweet, author=self.user) for tweet in [self.tweet, *self.retweets])
+        search.index_tweets([self.tweet, *self.retweets, self.reply, self.other])
+
+    def delete(self):
+        return self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+
+    def test_delete_is_constant(self):
+        services.recount_profile_stats()
+        # Caches the authenticated user.
+        warm_up = Tweet.objects.create(tweet="Warm up", author=self.user)
+        self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": warm_up.id}), **self.headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.delete().status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as lone:
+            self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": self.other.id}), **self.headers)
+
+        # The same statements as for a tweet without retweets, threads and likes.
+        self.assertEqual(len(queries), len(lone))
+        updates = [query["sql"] for query in queries.captured_queries if '"deleted_datetime"' in query["sql"]
+                   and query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(Tweet.objects.filter(id=self.tweet.id).exists())
+        self.assertTrue(Tweet.all_objects.filter(id=self.tweet.id).exists())
+        self.assertEqual(self.delete().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_children_hidden_right_away(self):
+        Tweet.objects.create(tweet="Thread", author=self.user, thread=self.tweet)
+        self.delete()
+
+        for url in (
+            reverse("tweet:GetRetweetsListView", kwargs={"tweet_id": self.tweet.id}),
+            reverse("tweet:GetThreadsView", kwargs={"tweet_id": self.tweet.id}),
+        ):
+            response = self.client.get(url, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["results"], [])
+
+        # Replies to the retweets are one level further down, they are marked by the purge.
+        listed = self.client.get(reverse("tweet:TweetsListView"), **self.headers).data["results"]
+        self.assertEqual([tweet["id"] for tweet in listed], [self.other.id, self.reply.id])
+
+        purge.propagate()
+        listed = self.client.get(reverse("tweet:TweetsListView"), **self.headers).data["results"]
+        self.assertEqual([tweet["id"] for tweet in listed], [self.other.id])
+
+    def test_purge(self):
+        self.delete()
+
+        out = StringIO()
+        call_command("purge_deleted_tweets", "--batch-size", "2", stdout=out)
+
+        self.assertEqual(list(Tweet.all_objects.values_list("id", flat=True)), [self.other.id])
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(set(TweetToken.objects.values_list("tweet_id", flat=True)), {self.other.id})
+        self.assertIn("Purged 7 tweets and", out.getvalue())
+
+    def test_purge_deletes_in_batches(self):
+        self.delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            purge.purge(batch_size=2)
+
+        deletes = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("DELETE")]
+        self.assertGreater(len(deletes), 7)
+        for sql in deletes:
+            self.assertLessEqual(len(sql.rsplit(" IN (", 1)[1].split(",")), 2, sql)
+
+
+class TestConversationView(TestCase, SetupManagerMixin):
+    USERNAME = "admin22"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        # root -> a -> a1 -> a1x, root -> b
+        self.root = Tweet.objects.create(tweet="Root", author=self.user)
+        self.a = Tweet.objects.create(tweet="A", author=self.user, thread=self.root)
+        self.b = Tweet.objects.create(tweet="B", author=self.user, thread=self.root)
+        self.a1 = Tweet.objects.create(tweet="A1", author=self.user, thread=self.a)
+        self.a1x = Tweet.objects.create(tweet="A1x", author=self.user, thread=self.a1)
+        other = Tweet.objects.create(tweet="Other", author=self.user)
+        Tweet.objects.create(tweet="Unrelated", author=self.user, thread=other)
+
+    def get(self, tweet_id=None, **params):
+        url = reverse("tweet:ConversationView", kwargs={"tweet_id": tweet_id or self.root.id})
+        return self.client.get(url, params, **self.headers)
+
+    @staticmethod
+    def shape(node):
+        return [node["tweet"], [TestConversationView.shape(reply) for reply in node["replies"]]]
+
+    def test_nested(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["size"], 5)
+        self.assertFalse(response.data["truncated"])
+        self.assertEqual(self.shape(response.data["tweet"]), ["Root", [["A", [["A1", [["A1x", []]]]]], ["B", []]]])
+
+    def test_single_query(self):
+        self.get()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get()
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn("WITH RECURSIVE", queries[0]["sql"])
+
+    def test_bounds(self):
+        self.assertEqual(self.shape(self.get(depth=1).data["tweet"]), ["Root", [["A", []], ["B", []]]])
+
+        response = self.get(size=3)
+        self.assertTrue(response.data["truncated"])
+        self.assertEqual(self.shape(response.data["tweet"]), ["Root", [["A", []], ["B", []]]])
+
+        self.assertEqual(self.get(depth=100).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deleted_and_missing(self):
+        purge.delete_tweet(self.a)
+        self.assertEqual(self.shape(self.get().data["tweet"]), ["Root", [["B", []]]])
+
+        self.assertEqual(self.get(self.a.id).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestRootTweet(TestCase, SetupManagerMixin):
+    USERNAME = "admin23"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.original = Tweet.objects.create(tweet="Original", author=self.user)
+
+    def retweet(self, tweet_id):
+        response = self.client.post(
+            reverse("tweet:RetweetView", kwargs={"tweet_id": tweet_id}), {"tweet": "Retweet"}, **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response.data["id"]
+
+    def test_retweet_of_retweet(self):
+        first_id = self.retweet(self.original.id)
+        second_id = self.retweet(first_id)
+
+        self.assertEqual(Tweet.objects.get(id=first_id).root_tweet_id, self.original.id)
+        self.assertEqual(Tweet.objects.get(id=second_id).root_tweet_id, self.original.id)
+
+    def test_list_embeds_root_in_same_query(self):
+        second_id = self.retweet(self.retweet(self.original.id))
+        url = reverse("tweet:TweetsListView")
+
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get(url, **self.headers)
+        with CaptureQueriesContext(connection) as embedded:
+            response = self.client.get(url, {"root_tweet": "1"}, **self.headers)
+
+        self.assertEqual(len(embedded), len(plain))
+        results = {tweet["id"]: tweet for tweet in response.data["results"]}
+        self.assertEqual(results[second_id]["root_tweet"]["id"], self.original.id)
+        self.assertEqual(results[second_id]["root_tweet"]["tweet"], "Original")
+        self.assertEqual(results[second_id]["root_tweet"]["author_username"], self.USERNAME)
+        self.assertIsNone(results[self.original.id]["root_tweet"])
+        self.assertNotIn("root_tweet", self.client.get(url, **self.headers).data["results"][0])
+
+    def test_list_hides_deleted_root(self):
+        self.retweet(self.retweet(self.original.id))
+        other = Tweet.objects.create(tweet="Other", author=self.user)
+        purge.delete_tweet(self.original)
+
+        response = self.client.get(reverse("tweet:TweetsListView"), {"root_tweet": "1"}, **self.headers)
+
+        self.assertEqual([(tweet["id"], tweet["root_tweet"]) for tweet in response.data["results"]], [(other.id, None)])
+        self.assertNotIn("Original", response.content.decode())
+
+    def test_detail_and_batch_embed_root(self):
+        retweet_id = self.retweet(self.original.id)
+
+        response = self.client.get(
+            reverse("tweet:TweetDetailView", kwargs={"tweet_id": retweet_id}), {"root_tweet": "true"}, **self.headers
+        )
+        self.assertEqual(response.data["root_tweet"]["id"], self.original.id)
+        self.assertEqual(response.data["root_tweet"]["retweet_count"], 1)
+
+        response = self.client.get(
+            reverse("tweet:TweetBatchDetailView"), {"ids": f"{retweet_id},{self.original.id}", "root_tweet": "1"},
+            **self.headers
+        )
+        self.assertEqual([tweet["root_tweet"] and tweet["root_tweet"]["id"] for tweet in response.data["results"]],
+                         [self.original.id, None])
+
+    def test_backfill(self):
+        first = Tweet.objects.create(tweet="First", author=self.user, retweet=self.original)
+        second = Tweet.objects.create(tweet="Second", author=self.user, retweet=first)
+
+        self.assertEqual(retweets.get_root_id(second), self.original.id)
+
+        out = StringIO()
+        call_command("backfill_root_tweets", batch_size=1, stdout=out)
+
+        self.assertIn("Set the root tweet of 2 retweets.", out.getvalue())
+        self.assertEqual(
+            list(Tweet.objects.filter(retweet__isnull=False).values_list("root_tweet_id", flat=True)),
+            [self.original.id, self.original.id],
+        )
+        self.assertIsNone(Tweet.objects.get(id=self.original.id).root_tweet_id)
+
+
+class TestTweetsByAuthor(TestCase, SetupManagerMixin, QueryCountAssertionsMixin):
+    USERNAME = "admin24"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.other = get_user_model().objects.create_user(username="other24", password=self.PASSWORD)
+        self.other_tweet = Tweet.objects.create(tweet="Other", author=self.other)
+
+    def create(self, text):
+        return self.client.post(reverse("tweet:CreateTweet"), {"tweet": text}, **self.headers).data["id"]
+
+    def stats(self, username=USERNAME):
+        url = reverse("tweet:TweetsByAuthorView", kwargs={"username": username})
+        return self.client.get(url, **self.headers).data["author"]
+
+    def test_lists_author_tweets(self):
+        ids = [self.create(f"Tweet {i}") for i in range(3)]
+        url = reverse("tweet:TweetsByAuthorView", kwargs={"username": self.USERNAME})
+
+        response = self.client.get(url, {"limit": 2}, **self.headers)
+        next_page = self.client.get(response.data["next"], **self.headers)
+
+        self.assertEqual([tweet["id"] for tweet in response.data["results"] + next_page.data["results"]], ids[::-1])
+        self.assertEqual(response.data["author"]["username"], self.USERNAME)
+        self.assertEqual(response.data["author"]["tweet_count"], 3)
+        self.assertConstantQueryCount(url, **self.headers)
+
+        missing = reverse("tweet:TweetsByAuthorView", kwargs={"username": "nobody"})
+        self.assertEqual(self.client.get(missing, **self.headers).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_counts_without_count_queries(self):
+        tweet_id = self.create("Mine")
+        self.client.post(reverse("tweet:RetweetView", kwargs={"tweet_id": self.other_tweet.id}), {"tweet": "RT"},
+                         **self.headers)
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.other_tweet.id}),
+                         **self.headers)
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": tweet_id}), **self.headers)
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": tweet_id}), **self.headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = self.stats()
+
+        self.assertEqual((stats["tweet_count"], stats["like_count"]), (2, 1))
+        self.assertFalse([query for query in queries if "COUNT(" in query["sql"]])
+
+        self.client.delete(reverse("tweet:DeleteTweetView", kwargs={"tweet_id": tweet_id}), **self.headers)
+        self.assertEqual(self.stats()["tweet_count"], 1)
+
+    def test_purge_updates_counts(self):
+        Tweet.objects.create(tweet="Reply", author=self.user, thread=self.other_tweet)
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.other_tweet.id}),
+                         **self.headers)
+        services.recount_profile_stats()
+        self.assertEqual((self.stats()["tweet_count"], self.stats()["like_count"]), (1, 1))
+
+        purge.delete_tweet(self.other_tweet)
+        purge.purge()
+
+        self.assertEqual((self.stats()["tweet_count"], self.stats()["like_count"]), (0, 0))
+        self.assertEqual(self.stats("other24")["tweet_count"], 0)
+
+    def test_recount(self):
+        Tweet.objects.create(tweet="Untracked", author=self.user)
+        Like.objects.create(tweet=self.other_tweet, author=self.user)
+
+        self.assertEqual(services.recount_profile_stats(), 2)
+        self.assertEqual((self.stats()["tweet_count"], self.stats()["like_count"]), (1, 1))
+        self.assertEqual(self.stats("other24")["tweet_count"], 1)
+        self.assertEqual(services.recount_profile_stats(), 0)
+
+
+class TestConditionalGet(TestCase, SetupManagerMixin):
+    USERNAME = "admin25"
+    PASSWORD = "Testing@123"
+
+    def setUp(self) -> None:
+        self.setup()
+
+        self.tweet = Tweet.objects.create(tweet="Polled", author=self.user)
+        self.list_url = reverse("tweet:TweetsListView")
+        self.detail_url = reverse("tweet:TweetDetailView", kwargs={"tweet_id": self.tweet.id})
+
+    def like(self):
+        self.client.post(reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": self.tweet.id}), **self.headers)
+
+    def test_detail(self):
+        response = self.client.get(self.detail_url, **self.headers)
+        etag = response["ETag"]
+
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag, **self.headers).status_code, 304)
+
+        # Likes don't change `update_datetime`, so `If-Modified-Since` alone never answers `304`.
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"], **self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.like()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["like_count"], 1)
+
+    def test_list_not_modified_without_serializing(self):
+        etag = self.client.get(self.list_url, **self.headers)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+
+    def test_list_changes(self):
+        etag = self.client.get(self.list_url, **self.headers)["ETag"]
+
+        self.like()
+        liked_etag = self.client.get(self.list_url, **self.headers)["ETag"]
+        self.assertNotEqual(liked_etag, etag)
+
+        Tweet.objects.create(tweet="New", author=self.user)
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=liked_etag, **self.headers).status_code, 200)
+
+        self.assertNotEqual(
+            self.client.get(self.list_url, {"viewer_state": "1"}, **self.headers)["ETag"],
+            self.client.get(self.list_url, **self.headers)["ETag"],
+        )
+
+    def test_list_likes_moving_between_tweets(self):
+        other = Tweet.objects.create(tweet="Also polled", author=self.user)
+        Tweet.objects.filter(id=other.id).update(like_count=1)
+        etag = self.client.get(self.list_url, **self.headers)["ETag"]
+
+        # Same number of likes on the page, on another tweet.
+        Tweet.objects.filter(id=self.tweet.id).update(like_count=1)
+        Tweet.objects.filter(id=other.id).update(like_count=0)
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_by_author_follows_stats(self):
+        other = get_user_model().objects.create_user(username="other25", password=self.PASSWORD)
+        other_tweet = Tweet.objects.create(tweet="Not on the page", author=other)
+        url = reverse("tweet:TweetsByAuthorView", kwargs={"username": self.USERNAME})
+
+        for action, count, value in (
+            (reverse("user:FollowUnfollowView", kwargs={"username": other.username}), "following_count", 1),
+            (reverse("user:FollowUnfollowView", kwargs={"username": other.username}), "following_count", 0),
+            (reverse("tweet:LikeUnlikeTweetView", kwargs={"tweet_id": other_tweet.id}), "like_count", 1),
+        ):
+            etag = self.client.get(url, **self.headers)["ETag"]
+            self.client.post(action, **self.headers)
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["author"][count], value)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **self.headers).status_code,
+                             304)
+
+    def test_by_author_follows_username(self):
+        url = reverse("tweet:TweetsByAuthorView", kwargs={"username": self.USERNAME})
+        etag = self.client.get(url, **self.headers)["ETag"]
+
+        self.user.username = "renamed25"
+        self.user.save()
+
+        url = reverse("tweet:TweetsByAuthorView", kwargs={"username": "renamed25"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["author"]["username"], "renamed25")
+
+    @override_settings(TWEET_COUNTERS={"BACKEND": "tweet.counters.ShardedCounterBackend"})
+    def test_list_pending_counters(self):
+        etag = self.client.get(self.list_url, **self.headers)["ETag"]
+
+        self.like()
+
+        self.assertNotEqual(self.client.get(self.list_url, **self.headers)["ETag"], etag)
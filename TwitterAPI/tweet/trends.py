@@ -0,0 +1,216 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Min, OuterRef, Subquery, Sum
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tweet import models
+from tweet.search import extract_hashtags
+from tweet.signals import tweets_created
+
+
+def get_trends_settings() -> dict:
+    """
+    Returns the `TWEET_TRENDS` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "WINDOWS": (60, 24 * 60),
+        "WINDOW_MINUTES": 60,
+        "LIMIT": 10,
+        "MAX_LIMIT": 50,
+        **getattr(settings, "TWEET_TRENDS", {}),
+    }
+
+
+def get_bucket(moment):
+    """
+    Returns the start of the minute containing `moment`.
+    """
+
+    return moment.replace(second=0, microsecond=0)
+
+
+def get_windows() -> dict:
+    """
+    Returns the start of every window of the `WINDOWS` setting, mapped by its length. Windows that don't exist
+    yet are created, with the totals of the buckets they already cover.
+    """
+
+    lengths = get_trends_settings()["WINDOWS"]
+    windows = dict(models.TrendWindow.objects.filter(minutes__in=lengths).values_list("minutes", "start"))
+
+    for minutes in set(lengths) - set(windows):
+        start = get_bucket(timezone.now()) - timedelta(minutes=minutes - 1)
+
+        with transaction.atomic():
+            window, created = models.TrendWindow.objects.get_or_create(minutes=minutes, defaults={"start": start})
+            if created:
+                models.HashtagTrend.objects.bulk_create([
+                    models.HashtagTrend(window_minutes=minutes, hashtag=hashtag, count=count)
+                    for hashtag, count in models.HashtagCount.objects.filter(bucket__gte=start).values(
+                        "hashtag"
+                    ).annotate(total=Sum("count")).order_by().values_list("hashtag", "total")
+                ])
+
+        windows[minutes] = window.start
+
+    return windows
+
+
+def record(hashtags, moment=None) -> None:
+    """
+    Adds the uses of the hashtags to the bucket of `moment`, one upsert per distinct hashtag and window.
+
+    :param hashtags: Used hashtags, with repetitions.
+    :param moment: When the hashtags were used, now by default.
+    :return: None
+    """
+
+    bucket = get_bucket(moment or timezone.now())
+    if not (uses := Counter(hashtags)):
+        return
+
+    windows = get_windows()
+    for hashtag, amount in uses.items():
+        _add(hashtag, bucket, amount, windows)
+
+
+def record_tweets(tweets) -> None:
+    """
+    Records the hashtags of new tweets, in the buckets of their creation. Repeating a hashtag within a tweet
+    counts once.
+    """
+
+    uses = Counter()
+    for tweet in tweets:
+        for hashtag in extract_hashtags(tweet.tweet):
+            uses[hashtag, get_bucket(tweet.creation_datetime)] += 1
+
+    if not uses:
+        return
+
+    windows = get_windows()
+    for (hashtag, bucket), amount in uses.items():
+        _add(hashtag, bucket, amount, windows)
+
+
+def record_update(old_text: str, new_text: str) -> None:
+    """
+    Records the hashtags added to a tweet by an update, removed ones still count as used in the past.
+    """
+
+    record(set(extract_hashtags(new_text)) - set(extract_hashtags(old_text)))
+
+
+def _add(hashtag: str, bucket, amount: int, windows: dict) -> None:
+    # The bucket and the totals change together, so `decay` subtracts exactly what was added to the totals.
+    with transaction.atomic():
+        _increment(models.HashtagCount, amount, hashtag=hashtag, bucket=bucket)
+
+        for minutes, start in windows.items():
+            if bucket >= start:
+                _increment(models.HashtagTrend, amount, window_minutes=minutes, hashtag=hashtag)
+
+
+def _increment(model, amount: int, **lookup) -> None:
+    row = model.objects.filter(**lookup)
+
+    if not row.update(count=F("count") + amount):
+        try:
+            with transaction.atomic():
+                model.objects.create(count=amount, **lookup)
+        except IntegrityError:  # Created by a concurrent use in the meantime.
+            row.update(count=F("count") + amount)
+
+
+def get_trends(minutes: int = None, limit: int = None) -> list:
+    """
+    Returns the most used hashtags of the last `minutes` minutes, read from the running totals of the window, so
+    only `limit` rows are read whatever the length of the window. The totals include the minutes that left the
+    window since `prune_trends` last ran.
+
+    :param minutes: Length of the window, one of `WINDOWS`, `WINDOW_MINUTES` by default.
+    :param limit: Number of hashtags to return, `LIMIT` by default.
+    :return: list of dictionaries with `hashtag` and `count`, most used first.
+    """
+
+    config = get_trends_settings()
+    minutes, limit = minutes or config["WINDOW_MINUTES"], limit or config["LIMIT"]
+
+    return [
+        {"hashtag": hashtag, "count": count}
+        for hashtag, count in models.HashtagTrend.objects.filter(window_minutes=minutes, count__gt=0).order_by(
+            "-count", "hashtag"
+        ).values_list("hashtag", "count")[:limit]
+    ]
+
+
+def decay(moment=None) -> int:
+    """
+    Moves every window forward to end at `moment`, subtracting the uses of the minutes that left it from its
+    totals. Windows that are no longer configured are dropped.
+
+    :param moment: End of the windows, now by default.
+    :return: number of decayed totals.
+    """
+
+    now, decayed = get_bucket(moment or timezone.now()), 0
+    lengths = get_trends_settings()["WINDOWS"]
+
+    models.HashtagTrend.objects.exclude(window_minutes__in=lengths).delete()
+    models.TrendWindow.objects.exclude(minutes__in=lengths).delete()
+
+    for minutes in get_windows():
+        start = now - timedelta(minutes=minutes - 1)
+
+        with transaction.atomic():
+            window = models.TrendWindow.objects.select_for_update().get(minutes=minutes)
+            if start <= window.start:
+                continue
+
+            leaving = models.HashtagCount.objects.filter(bucket__gte=window.start, bucket__lt=start)
+            amounts = leaving.filter(hashtag=OuterRef("hashtag")).values("hashtag").annotate(
+                total=Sum("count")
+            ).order_by().values("total")
+            totals = models.HashtagTrend.objects.filter(window_minutes=minutes)
+
+            decayed += totals.filter(hashtag__in=leaving.values("hashtag")).update(
+                count=F("count") - Subquery(amounts)
+            )
+            totals.filter(count__lte=0).delete()
+
+            window.start = start
+            window.save(update_fields=["start"])
+
+    return decayed
+
+
+def prune(older_than_minutes: int) -> int:
+    """
+    Deletes the buckets older than the given number of minutes, which keeps the rollup table bounded. Buckets
+    still counted by a window are kept, so `decay` can subtract them later.
+
+    :param older_than_minutes: Age of the oldest bucket to keep.
+    :return: number of deleted buckets.
+    """
+
+    oldest = get_bucket(timezone.now()) - timedelta(minutes=older_than_minutes)
+    if (counted := models.TrendWindow.objects.aggregate(start=Min("start"))["start"]) is not None:
+        oldest = min(oldest, counted)
+
+    deleted, _ = models.HashtagCount.objects.filter(bucket__lt=oldest).delete()
+
+    return deleted
+
+
+@receiver(tweets_created)
+def record_created_tweets(sender, tweets, **kwargs):
+    """
+    Records the hashtags of new tweets once they are committed, so hot hashtag rows are only locked briefly.
+    """
+
+    transaction.on_commit(lambda: record_tweets(tweets))
@@ -1,20 +1,33 @@
 from django.urls import path
 
 from tweet import views
+from utils.async_views import select_view
 
 app_name = "tweet"
 
 urlpatterns = [
     path("create/", views.CreateTweet.as_view(), name="CreateTweet"),
-    path("list/", views.TweetsListView.as_view(), name="TweetsListView"),
+    path("list/", select_view(views.TweetsListView, views.AsyncTweetsListView), name="TweetsListView"),
+    path("timeline/", views.TimelineView.as_view(), name="TimelineView"),
+    path("by-author/<str:username>/", views.TweetsByAuthorView.as_view(), name="TweetsByAuthorView"),
+    path("search/", views.SearchTweetsView.as_view(), name="SearchTweetsView"),
+    path("trends/", views.TrendsView.as_view(), name="TrendsView"),
+    path("export/<str:kind>/", views.ExportView.as_view(), name="ExportView"),
     # ...........<int:tweet_id>... accepts integer in its place and then passes it to the view as key-word argument.
-    path("detail/<int:tweet_id>/", views.TweetDetailView.as_view(), name="TweetDetailView"),
+    path(
+        "detail/<int:tweet_id>/", select_view(views.TweetDetailView, views.AsyncTweetDetailView),
+        name="TweetDetailView"
+    ),
+    path("detail/batch/", views.TweetBatchDetailView.as_view(), name="TweetBatchDetailView"),
     path("update/", views.TweetUpdateView.as_view(), name="TweetUpdateView"),
+    path("history/<int:tweet_id>/", views.TweetHistoryView.as_view(), name="TweetHistoryView"),
     path("like-unlike/<int:tweet_id>/", views.LikeUnlikeTweetView.as_view(), name="LikeUnlikeTweetView"),
     path("likes/<int:tweet_id>/", views.LikesListView.as_view(), name="LikesListView"),
     path("retweet/<int:tweet_id>/", views.RetweetView.as_view(), name="RetweetView"),
     path("retweets/<int:tweet_id>/", views.GetRetweetsListView.as_view(), name="GetRetweetsListView"),
     path("delete/<int:tweet_id>/", views.DeleteTweetView.as_view(), name="DeleteTweetView"),
     path("create-thread/<int:tweet_id>/", views.CreateThreadView.as_view(), name="CreateThreadView"),
-    path("threads/<int:tweet_id>/", views.CreateThreadView.as_view(), name="CreateThreadView"),
+    path("create-thread/<int:tweet_id>/batch/", views.CreateThreadBatchView.as_view(), name="CreateThreadBatchView"),
+    path("threads/<int:tweet_id>/", views.GetThreadsView.as_view(), name="GetThreadsView"),
+    path("conversation/<int:tweet_id>/", views.ConversationView.as_view(), name="ConversationView"),
 ]
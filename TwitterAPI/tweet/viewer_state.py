@@ -0,0 +1,44 @@
+from django.db.models import Exists, OuterRef, Value
+
+from tweet import models
+
+FIELDS = ("liked_by_me", "retweeted_by_me")
+
+
+def annotate(queryset, user):
+    """
+    Annotates whether the user liked and retweeted each tweet, as `EXISTS` subqueries of the same statement,
+    so a page of tweets costs no extra query.
+
+    :param queryset: Queryset of tweets.
+    :param user: User viewing the tweets.
+    :return: annotated queryset.
+    """
+
+    if not user.is_authenticated:
+        return queryset.annotate(**{field: Value(False) for field in FIELDS})
+
+    return queryset.annotate(
+        liked_by_me=Exists(models.Like.objects.filter(tweet_id=OuterRef("pk"), author_id=user.id)),
+        retweeted_by_me=Exists(models.Tweet.objects.filter(retweet_id=OuterRef("pk"), author_id=user.id)),
+    )
+
+
+class ViewerStateMixin:
+    """
+    Adds `liked_by_me` and `retweeted_by_me` to every tweet of a list view, when the `viewer_state` query
+    parameter is set. Must come after `OptimizedQuerysetMixin`, so the annotations are known to the optimizer.
+    """
+
+    viewer_state_query_param = "viewer_state"
+
+    def include_viewer_state(self) -> bool:
+        return self.request.query_params.get(self.viewer_state_query_param, "").lower() in ("1", "true", "yes")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        return annotate(queryset, self.request.user) if self.include_viewer_state() else queryset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "include_viewer_state": self.include_viewer_state()}
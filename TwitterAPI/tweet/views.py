@@ -1,11 +1,36 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from tweet import cache
+from tweet import conditional
+from tweet import conversations
+from tweet import counters
+from tweet import exports
+from tweet import feeds
+from tweet import history
 from tweet import models
+from tweet import purge
+from tweet import retweets
+from tweet import search
 from tweet import serializers
+from tweet import services
+from tweet import signals
+from tweet import trends
+from tweet import viewer_state
+from user.models import ProfileStats
+from utils.async_views import AsyncAPIView, run_sync
+from utils.conditional import get_not_modified, make_etag, set_validators
+from utils.export import ExportRequestParametersSerializer
+from utils.pagination import KeysetPagination
+from utils.queryset import OptimizedQuerysetMixin, optimize_queryset
 
 
 class CreateTweet(APIView):
@@ -24,19 +49,182 @@ class CreateTweet(APIView):
         tweet_serializer = serializers.TweetSerializer(data=request.data)
 
         if tweet_serializer.is_valid():
-            tweet_serializer.save(author=request.user)
+            tweet = tweet_serializer.save(author=request.user)
+            signals.tweets_created.send(sender=models.Tweet, tweets=[tweet])
+
             return Response(tweet_serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(tweet_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class TweetsListView(ListAPIView):
+class TweetsListView(conditional.TweetListConditionalMixin, OptimizedQuerysetMixin, viewer_state.ViewerStateMixin,
+                     retweets.RootTweetMixin, counters.PendingCountersMixin, ListAPIView):
     """
-    Controller for listing all the tweets with pagination, default pagination is 20.
+    Controller for listing all the tweets with cursor pagination, default pagination is 20.
     """
 
     queryset = models.Tweet.objects.all()
     serializer_class = serializers.TweetListViewSerializer
+    pagination_class = KeysetPagination
+    allow_token_user = True
+
+
+class AsyncTweetsListView(AsyncAPIView, TweetsListView):
+    """
+    `TweetsListView` served as a coroutine, enabled through the `ASYNC_VIEWS` setting.
+    """
+
+    async def get(self, request: Request, *args, **kwargs):
+        return await run_sync(super().get, request, *args, **kwargs)
+
+
+class TimelineView(OptimizedQuerysetMixin, viewer_state.ViewerStateMixin, retweets.RootTweetMixin,
+                   counters.PendingCountersMixin, ListAPIView):
+    """
+    Controller for the home timeline of the user, own tweets and tweets of followed users, newest first.
+    """
+
+    serializer_class = serializers.TweetListViewSerializer
+    pagination_class = feeds.TimelinePagination
+
+    def get_queryset(self):
+        """
+        Pulls new tweets of followed users with many followers into the feed, when the first page is requested.
+
+        :return: Django Query
+        """
+
+        if self.paginator.cursor_query_param not in self.request.query_params:
+            feeds.pull(self.request.user.id)
+
+        return feeds.get_timeline_queryset(self.request.user.id)
+
+
+class SearchTweetsView(OptimizedQuerysetMixin, viewer_state.ViewerStateMixin, retweets.RootTweetMixin,
+                       counters.PendingCountersMixin, ListAPIView):
+    """
+    Controller for searching tweets containing every word of `q`, best matches first.
+    Hashtags and mentions can be searched with their `#` and `@` prefix.
+    """
+
+    serializer_class = serializers.TweetListViewSerializer
+    pagination_class = search.SearchPagination
+
+    def get_queryset(self):
+        """
+        returns query, through which the List Data is created
+
+        :return: Django Query
+        """
+
+        query = self.request.query_params.get("q", "")
+
+        if not search.tokenize(query):
+            raise ValidationError({"q": ["Search query must contain at least one word."]})
+
+        return search.search_queryset(query)
+
+
+class TweetsByAuthorView(conditional.TweetListConditionalMixin, OptimizedQuerysetMixin, viewer_state.ViewerStateMixin,
+                         retweets.RootTweetMixin, counters.PendingCountersMixin, ListAPIView):
+    """
+    Controller for listing the tweets of a user, newest first, with cursor pagination, default pagination is 20.
+    The counts shown on the profile of the user are read from its stats row.
+    """
+
+    serializer_class = serializers.TweetListViewSerializer
+    pagination_class = KeysetPagination
+    allow_token_user = True
+
+    def get_queryset(self):
+        """
+        returns query, through which the List Data is created
+
+        :return: Django Query
+        """
+
+        return models.Tweet.objects.filter(author_id=self.get_author().id)
+
+    def get_author(self):
+        """
+        Returns the user given in the url along with its stats, 404 if it doesn't exist.
+        """
+
+        if not hasattr(self, "_author"):
+            self._author = get_object_or_404(
+                get_user_model().objects.select_related("stats"),
+                username=self.kwargs.get("username"),
+            )
+
+        return self._author
+
+    def get_etag_extra(self) -> tuple:
+        """
+        The `author` block changes without touching the tweets, e.g. on follows and likes, so it is part of the ETag.
+        """
+
+        author = self.get_author()
+        stats = getattr(author, "stats", None)
+
+        return *super().get_etag_extra(), author.username, [getattr(stats, field, None) for field in (
+            "tweet_count", "like_count", "follower_count", "following_count", "update_datetime"
+        )]
+
+    def get_validators(self):
+        if (validators := super().get_validators()) is None:
+            return None
+
+        etag, last_modified = validators
+        stats = getattr(self.get_author(), "stats", None)
+
+        return etag, max(filter(None, (last_modified, getattr(stats, "update_datetime", None))), default=None)
+
+    def list(self, request: Request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        author = self.get_author()
+        stats = getattr(author, "stats", None)
+
+        response.data["author"] = {
+            "username": author.username,
+            **{count: getattr(stats, count, 0) for count in (
+                "tweet_count", "like_count", "follower_count", "following_count"
+            )},
+        }
+
+        return response
+
+
+class TrendsView(APIView):
+    """
+    Controller for the most used hashtags of the last `minutes` minutes, one of the `WINDOWS` of `TWEET_TRENDS`.
+    """
+
+    allow_token_user = True
+
+    def get(self, request: Request):
+        """
+        returns the trending hashtags, most used first.
+
+        :param request: Data gained from client.
+        :return: Trending hashtags with their number of uses.
+        """
+
+        config = trends.get_trends_settings()
+        parameters_serializer = serializers.TrendsRequestParametersSerializer(
+            data=request.query_params,
+            windows=config["WINDOWS"],
+            max_limit=config["MAX_LIMIT"],
+        )
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        minutes = parameters_serializer.validated_data.get("minutes", config["WINDOW_MINUTES"])
+
+        return Response({
+            "minutes": minutes,
+            "results": trends.get_trends(minutes, parameters_serializer.validated_data.get("limit")),
+        }, status=status.HTTP_200_OK)
 
 
 class TweetDetailView(APIView):
@@ -44,19 +232,148 @@ class TweetDetailView(APIView):
     Controller for getting the detail view of a single tweet. Tweet ID must be passed in the url itself.
     """
 
+    allow_token_user = True
+
     def get(self, request: Request, tweet_id: int):
         """
-        returns tweet, if exists else 404
+        returns tweet, if exists else 404. The original tweet of a retweet is embedded when `root_tweet` is set.
 
         :param request: Data gained from client.
         :param tweet_id: Tweet ID to get data of.
         :return: Detailed tweet data.
         """
 
-        tweet = get_object_or_404(models.Tweet, id=tweet_id)
-        tweet_serializer = serializers.TweetSerializer(instance=tweet)
+        payload = cache.tweet_payloads.get(tweet_id, lambda: self.build_payload(tweet_id))
 
-        return Response(tweet_serializer.data, status=status.HTTP_200_OK)
+        if retweets.is_requested(request):
+            payload = TweetBatchDetailView.embed_root_tweets([payload])[0]
+
+        # Counters change without touching `update_datetime`, so only the ETag can answer `304`.
+        etag = make_etag(payload)
+        last_modified = parse_datetime(payload["update_datetime"])
+        if (not_modified := get_not_modified(request, etag)) is not None:
+            return not_modified
+
+        return set_validators(Response(payload, status=status.HTTP_200_OK), etag, last_modified)
+
+    @staticmethod
+    def build_payload(tweet_id: int) -> dict:
+        """
+        Serializes the tweet from the database, for the cache.
+
+        :param tweet_id: Tweet ID to get data of.
+        :return: Detailed tweet data.
+        """
+
+        tweet = get_object_or_404(
+            optimize_queryset(models.Tweet.objects.all(), serializers.TweetSerializer),
+            id=tweet_id
+        )
+        counters.hydrate([tweet])
+
+        return dict(serializers.TweetSerializer(instance=tweet).data)
+
+
+class AsyncTweetDetailView(AsyncAPIView, TweetDetailView):
+    """
+    `TweetDetailView` served as a coroutine, enabled through the `ASYNC_VIEWS` setting.
+    """
+
+    async def get(self, request: Request, tweet_id: int):
+        return await run_sync(super().get, request, tweet_id)
+
+
+class TweetBatchDetailView(APIView):
+    """
+    Controller for getting the detail view of many tweets at once. Tweet IDs are passed as `ids`, either
+    comma separated in the url, or as a list in the POST body.
+    """
+
+    allow_token_user = True
+
+    def get(self, request: Request):
+        """
+        returns the tweets in the requested order, with the IDs of the tweets that don't exist.
+
+        :param request: Data gained from client.
+        :return: Detailed tweet data.
+        """
+
+        return self.get_batch(request.query_params, include_root_tweet=retweets.is_requested(request))
+
+    def post(self, request: Request):
+        """
+        same as get, for batches that don't fit in the url.
+
+        :param request: Data gained from client.
+        :return: Detailed tweet data.
+        """
+
+        return self.get_batch(request.data, include_root_tweet=retweets.is_requested(request))
+
+    @classmethod
+    def get_batch(cls, data, include_root_tweet: bool = False):
+        """
+        Reads the cached tweets from the cache, and the others with a single query.
+
+        :param data: Parameters containing the tweet IDs.
+        :param include_root_tweet: Whether to embed the original tweet of retweets.
+        :return: Detailed tweet data.
+        """
+
+        parameters_serializer = serializers.TweetBatchRequestParametersSerializer(
+            data=data,
+            max_ids=getattr(settings, "TWEET_BATCH_MAX_IDS", 100),
+        )
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tweet_ids = list(dict.fromkeys(parameters_serializer.validated_data.get("ids")))
+        payloads = cls.get_payloads(tweet_ids)
+        results = [payloads[tweet_id] for tweet_id in tweet_ids if tweet_id in payloads]
+
+        return Response({
+            "results": cls.embed_root_tweets(results) if include_root_tweet else results,
+            "missing": [tweet_id for tweet_id in tweet_ids if tweet_id not in payloads],
+        }, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def get_payloads(tweet_ids: list) -> dict:
+        """
+        Reads the payloads of the tweets from the cache, and the missing ones with a single query.
+
+        :param tweet_ids: IDs of the tweets.
+        :return: payloads of the existing tweets, mapped by tweet ID.
+        """
+
+        def build_many(missing_ids: list) -> dict:
+            tweets = optimize_queryset(models.Tweet.objects.all(), serializers.TweetSerializer).in_bulk(missing_ids)
+            counters.hydrate(tweets.values())
+
+            return {
+                tweet_id: dict(serializers.TweetSerializer(instance=tweet).data)
+                for tweet_id, tweet in tweets.items()
+            }
+
+        return cache.tweet_payloads.get_many(tweet_ids, build_many)
+
+    @classmethod
+    def embed_root_tweets(cls, payloads: list) -> list:
+        """
+        Adds the payload of the original tweet to every retweet as `root_tweet`, from the cache, and the missing
+        ones with a single query. It is `None` when the original tweet is deleted.
+
+        :param payloads: Payloads of tweets.
+        :return: payloads with the original tweets.
+        """
+
+        root_ids = list(dict.fromkeys(
+            payload["root_tweet_id"] for payload in payloads if payload.get("root_tweet_id") is not None
+        ))
+        roots = cls.get_payloads(root_ids) if root_ids else {}
+
+        return [{**payload, "root_tweet": roots.get(payload.get("root_tweet_id"))} for payload in payloads]
 
 
 class TweetUpdateView(APIView):
@@ -93,8 +410,11 @@ class TweetUpdateView(APIView):
                 "detail": "Can't modify other users tweet."
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        tweet.tweet = update_parameters_serializer.validated_data.get("tweet")
-        tweet.save()
+        replaced = history.edit_tweet(tweet, update_parameters_serializer.validated_data.get("tweet"))
+        if replaced is not None:
+            trends.record_update(replaced, tweet.tweet)
+            cache.tweet_payloads.invalidate(tweet.id)
+        counters.hydrate([tweet])
 
         return Response(
             serializers.TweetSerializer(instance=tweet).data,
@@ -102,6 +422,42 @@ class TweetUpdateView(APIView):
         )
 
 
+class TweetHistoryView(APIView):
+    """
+    Controller for the edit history of a tweet, newest version first. Tweet ID must be passed in the url itself.
+    """
+
+    allow_token_user = True
+
+    def get(self, request: Request, tweet_id: int):
+        """
+        returns every version of the tweet, or only the one given by `version`.
+
+        :param request: Data gained from client.
+        :param tweet_id: ID of the tweet to get the history of.
+        :return: Versions of the tweet with the date each was written.
+        """
+
+        parameters_serializer = serializers.TweetHistoryRequestParametersSerializer(data=request.query_params)
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tweet = get_object_or_404(models.Tweet.objects.only("tweet", "update_datetime"), id=tweet_id)
+        version = parameters_serializer.validated_data.get("version")
+        versions = history.get_versions(tweet, since_version=version or 1)
+
+        if version is not None:
+            if version > versions[0]["version"]:
+                raise NotFound()
+            versions = versions[-1:]
+
+        return Response({
+            "tweet_id": tweet.id,
+            "versions": serializers.TweetVersionSerializer(instance=versions, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+
 class LikeUnlikeTweetView(APIView):
     """
     Controller to create a new tweet.
@@ -118,25 +474,37 @@ class LikeUnlikeTweetView(APIView):
 
         tweet = get_object_or_404(models.Tweet, id=tweet_id)
 
-        if like := models.Like.objects.filter(tweet_id=tweet_id, author_id=request.user.id).first():
-            like.delete()
-            tweet.like_count -= 1
-        else:
-            models.Like(tweet_id=tweet_id, author=request.user).save()
-            tweet.like_count += 1
-
-        tweet.save()
+        with transaction.atomic():
+            unliked, _ = models.Like.objects.filter(tweet_id=tweet_id, author_id=request.user.id).delete()
+
+            if unliked:
+                counters.increment(tweet, "like_count", -1)
+                ProfileStats.increment(request.user.id, like_count=-1)
+            else:
+                try:
+                    # Savepoint, so a concurrent like by the same user only rolls back this insert.
+                    with transaction.atomic():
+                        models.Like.objects.create(tweet_id=tweet_id, author=request.user)
+                except IntegrityError:
+                    tweet.refresh_from_db(fields=["like_count"])
+                    counters.hydrate([tweet])
+                else:
+                    counters.increment(tweet, "like_count", 1)
+                    ProfileStats.increment(request.user.id, like_count=1)
+
+        cache.tweet_payloads.invalidate(tweet.id)
         tweet_serializer = serializers.TweetSerializer(instance=tweet)
 
         return Response(tweet_serializer.data, status=status.HTTP_200_OK)
 
 
-class LikesListView(ListAPIView):
+class LikesListView(OptimizedQuerysetMixin, ListAPIView):
     """
-    Controller for listing all the likes with pagination, default pagination is 20.
+    Controller for listing all the likes with cursor pagination, default pagination is 20.
     """
 
     serializer_class = serializers.LikeSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -169,21 +537,28 @@ class RetweetView(APIView):
         tweet_serializer = serializers.TweetSerializer(data=request.data)
 
         if tweet_serializer.is_valid():
-            tweet_serializer.save(author=request.user, retweet=retweet_tweet)
-            retweet_tweet.retweet_count += 1
-            retweet_tweet.save()
+            with transaction.atomic():
+                tweet = tweet_serializer.save(
+                    author=request.user, retweet=retweet_tweet, root_tweet_id=retweets.get_root_id(retweet_tweet)
+                )
+                counters.increment(retweet_tweet, "retweet_count", 1)
+                signals.tweets_created.send(sender=models.Tweet, tweets=[tweet])
+
+            cache.tweet_payloads.invalidate(retweet_tweet.id)
 
             return Response(tweet_serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(tweet_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetRetweetsListView(ListAPIView):
+class GetRetweetsListView(conditional.TweetListConditionalMixin, OptimizedQuerysetMixin, viewer_state.ViewerStateMixin,
+                          retweets.RootTweetMixin, counters.PendingCountersMixin, ListAPIView):
     """
-    Controller for listing all the retweets for a particular tweet with pagination, default pagination is 20.
+    Controller for listing all the retweets for a particular tweet with cursor pagination, default pagination is 20.
     """
 
     serializer_class = serializers.TweetSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -205,7 +580,8 @@ class DeleteTweetView(APIView):
     def delete(self, request: Request, tweet_id: int):
         """
         Deletes the given tweet or retweet.
-        In case of tweet, all its retweet too will be deleted.
+        In case of tweet, its retweets and threads are hidden along with it, and removed with everything below them
+        by `purge_deleted_tweets` in the background. Only the row of the tweet is written.
         In case of retweet, the retweet count on the first one will be deleted.
 
         :param request: Data gained from client.
@@ -215,14 +591,15 @@ class DeleteTweetView(APIView):
 
         tweet = get_object_or_404(models.Tweet, id=tweet_id)
 
-        if tweet.retweet:
-            tweet.retweet.retweet_count -= 1
-        if tweet.thread:
-            tweet.retweet.thread_count -= 1
-        if tweet.retweet or tweet.thread:
-            tweet.retweet.save()
+        with transaction.atomic():
+            if tweet.retweet:
+                counters.increment(tweet.retweet, "retweet_count", -1)
+            if tweet.thread:
+                counters.increment(tweet.thread, "thread_count", -1)
 
-        tweet.delete()
+            purge.delete_tweet(tweet)
+
+        cache.tweet_payloads.invalidate(tweet.id, tweet.retweet_id, tweet.thread_id)
 
         return Response(serializers.TweetSerializer(instance=tweet).data, status=status.HTTP_200_OK)
 
@@ -246,21 +623,105 @@ class CreateThreadView(APIView):
         tweet_serializer = serializers.TweetSerializer(data=request.data)
 
         if tweet_serializer.is_valid():
-            tweet_serializer.save(author=request.user, thread=thread_tweet)
-            thread_tweet.thread_count += 1
-            thread_tweet.save()
+            with transaction.atomic():
+                tweet = tweet_serializer.save(author=request.user, thread=thread_tweet)
+                counters.increment(thread_tweet, "thread_count", 1)
+                signals.tweets_created.send(sender=models.Tweet, tweets=[tweet])
+
+            cache.tweet_payloads.invalidate(thread_tweet.id)
 
             return Response(tweet_serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(tweet_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetThreadsView(ListAPIView):
+class CreateThreadBatchView(APIView):
+    """
+    Controller to publish many posts of a thread at once.
+    """
+
+    def post(self, request: Request, tweet_id: int):
+        """
+        Creates the posts in the given order as threads of the original post, in a single transaction.
+
+        :param request: Data gained from client.
+        :param tweet_id: ID of the tweet to bind threads to.
+        :return: new threads
+        """
+
+        thread_tweet = get_object_or_404(models.Tweet, id=tweet_id)
+
+        parameters_serializer = serializers.TweetThreadBatchRequestParametersSerializer(
+            data=request.data,
+            max_tweets=getattr(settings, "TWEET_THREAD_BATCH_MAX_TWEETS", 100),
+        )
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        tweets = services.publish_thread(
+            request.user, thread_tweet, parameters_serializer.validated_data.get("tweets")
+        )
+
+        return Response(serializers.TweetSerializer(instance=tweets, many=True).data, status=status.HTTP_200_OK)
+
+
+class ConversationView(APIView):
+    """
+    Controller for the whole thread below a tweet, as nested replies, read with a single query.
+    At most `depth` levels and `size` tweets are returned, the shallowest first.
+    """
+
+    allow_token_user = True
+
+    def get(self, request: Request, tweet_id: int):
+        """
+        returns the tweet with its replies, and the replies of these, nested down to `depth` levels.
+
+        :param request: Data gained from client.
+        :param tweet_id: ID of the tweet at the root of the conversation.
+        :return: Nested conversation, and whether it was truncated.
+        """
+
+        config = conversations.get_conversation_settings()
+        parameters_serializer = serializers.ConversationRequestParametersSerializer(
+            data=request.query_params,
+            max_depth=config["MAX_DEPTH"],
+            max_size=config["MAX_SIZE"],
+        )
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        depth = parameters_serializer.validated_data.get("depth", config["MAX_DEPTH"])
+        size = parameters_serializer.validated_data.get("size", config["MAX_SIZE"])
+
+        tweets = list(optimize_queryset(
+            conversations.get_conversation_queryset(tweet_id, depth, size), serializers.TweetListViewSerializer
+        ))
+        counters.hydrate(tweets)
+
+        tree, truncated = conversations.build_tree(
+            tweet_id, serializers.TweetListViewSerializer(instance=tweets, many=True).data, size
+        )
+        if tree is None:
+            raise NotFound()
+
+        return Response({
+            "size": min(len(tweets), size),
+            "truncated": truncated,
+            "tweet": tree,
+        }, status=status.HTTP_200_OK)
+
+
+class GetThreadsView(conditional.TweetListConditionalMixin, OptimizedQuerysetMixin, viewer_state.ViewerStateMixin,
+                     retweets.RootTweetMixin, counters.PendingCountersMixin, ListAPIView):
     """
-    Controller for listing all the threads for a particular tweet with pagination, default pagination is 20.
+    Controller for listing all the threads for a particular tweet with cursor pagination, default pagination is 20.
     """
 
     serializer_class = serializers.TweetSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -272,3 +733,34 @@ class GetThreadsView(ListAPIView):
         return models.Tweet.objects.filter(
             thread_id=self.kwargs.get("tweet_id")
         ).order_by("-creation_datetime")
+
+
+class ExportView(APIView):
+    """
+    Controller streaming all the `tweets`, `retweets` or `likes` as NDJSON or CSV, optionally filtered by the username
+    of the author and by a range of creation dates, instead of paging through the list views.
+    """
+
+    allow_token_user = True
+
+    def get(self, request: Request, kind: str):
+        """
+        returns the rows of the export as a file, encoded while it is sent.
+
+        :param request: Data gained from client.
+        :param kind: Name of the export.
+        :return: Streamed NDJSON or CSV file.
+        """
+
+        if (export := exports.EXPORTS.get(kind)) is None:
+            raise NotFound()
+
+        parameters_serializer = ExportRequestParametersSerializer(data=request.query_params, export=export)
+
+        if not parameters_serializer.is_valid():
+            return Response(parameters_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = dict(parameters_serializer.validated_data)
+        file_format = filters.pop("file_format")
+
+        return export.stream(export.filter(**filters), file_format, filename=kind)
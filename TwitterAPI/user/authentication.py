@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+def get_user_cache_settings() -> dict:
+    """
+    Returns the `JWT_USER_CACHE` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "ALIAS": "default",
+        "TIMEOUT": 30,
+        **getattr(settings, "JWT_USER_CACHE", {}),
+    }
+
+
+def make_key(user_id) -> str:
+    return f"jwt:user:{user_id}"
+
+
+def invalidate(*user_ids) -> None:
+    """
+    Removes the users from the cache, the next request of each user loads it from the database again.
+
+    :param user_ids: IDs of the changed users.
+    :return: None
+    """
+
+    caches[get_user_cache_settings()["ALIAS"]].delete_many([make_key(user_id) for user_id in user_ids])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` serving the user from the cache configured by the `JWT_USER_CACHE` setting, instead of
+    loading it from the database on every request. Entries are dropped when the user is saved or deleted,
+    e.g. on a password or `is_active` change, and expire after `TIMEOUT` seconds otherwise.
+
+    Views setting `allow_token_user = True` get a `TokenUser` built from the token alone for safe methods,
+    when they only need the ID of the user.
+    """
+
+    def authenticate(self, request):
+        view = request.parser_context.get("view") if request.parser_context else None
+        self.use_token_user = getattr(view, "allow_token_user", False) and request.method in SAFE_METHODS
+
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.use_token_user:
+            if api_settings.USER_ID_CLAIM not in validated_token:
+                raise InvalidToken(_("Token contained no recognizable user identification"))
+
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        config = get_user_cache_settings()
+        cache = caches[config["ALIAS"]]
+
+        try:
+            key = make_key(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if (user := cache.get(key)) is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout=config["TIMEOUT"])
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_changed_user(sender, instance, **kwargs):
+    """
+    Drops saved and deleted users from the cache, new users too, as their ID may have been used before.
+    """
+
+    invalidate(instance.pk)
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from user.managers import UserManager
@@ -44,3 +45,101 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.username
+
+
+class Follow(models.Model):
+    """
+    Keeps track of users following other users.
+    """
+
+    creation_datetime = models.DateTimeField(
+        verbose_name=_("Creation Date"),
+        help_text=_("Date followed"),
+        auto_now_add=True
+    )
+    pulled_datetime = models.DateTimeField(
+        verbose_name=_("Pulled Date"),
+        help_text=_("Until when tweets of the followed user were pulled into the follower's feed on read."),
+        auto_now_add=True
+    )
+
+    follower = models.ForeignKey(
+        verbose_name=_("Follower"),
+        to=User,
+        on_delete=models.CASCADE,
+        help_text=_("User who follows"),
+        related_name="following",
+    )
+    followee = models.ForeignKey(
+        verbose_name=_("Followee"),
+        to=User,
+        on_delete=models.CASCADE,
+        help_text=_("User who is followed"),
+        related_name="followers",
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("follower", "followee"), name="unique_follow"),
+        )
+        indexes = (
+            models.Index(fields=("followee", "follower"), name="follow_followee_follower_idx"),
+        )
+
+
+class ProfileStats(models.Model):
+    """
+    Denormalized counts shown on a user's profile, so they don't need a COUNT query.
+    """
+
+    user = models.OneToOneField(
+        verbose_name=_("User"),
+        to=User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        help_text=_("User the counts belong to"),
+        related_name="stats",
+    )
+
+    follower_count = models.BigIntegerField(
+        verbose_name=_("Follower Count"),
+        default=0,
+        help_text=_("Number of users following the user."),
+    )
+    following_count = models.BigIntegerField(
+        verbose_name=_("Following Count"),
+        default=0,
+        help_text=_("Number of users the user follows."),
+    )
+    tweet_count = models.BigIntegerField(
+        verbose_name=_("Tweet Count"),
+        default=0,
+        help_text=_("Number of tweets, retweets and threads posted by the user, deleted ones excluded."),
+    )
+    like_count = models.BigIntegerField(
+        verbose_name=_("Like Count"),
+        default=0,
+        help_text=_("Number of tweets liked by the user."),
+    )
+    update_datetime = models.DateTimeField(
+        verbose_name=_("Update Date"),
+        auto_now=True,
+        help_text=_("Date any of the counts last changed."),
+    )
+
+    @classmethod
+    def increment(cls, user_id: int, **amounts) -> None:
+        """
+        Adds the given amounts to the counts of the user, creating the row if it doesn't exist yet.
+
+        :param user_id: ID of the user to update counts of.
+        :param amounts: Count name mapped to the value to add, e.g. `follower_count=1`.
+        :return: None
+        """
+
+        changes = {count: models.F(count) + amount for count, amount in amounts.items()}
+
+        # The row exists for every user with any activity, so it's only created on the first update.
+        if not cls.objects.filter(user_id=user_id).update(update_datetime=timezone.now(), **changes):
+            cls.objects.get_or_create(user_id=user_id)
+            cls.objects.filter(user_id=user_id).update(update_datetime=timezone.now(), **changes)
@@ -1,9 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIRequestFactory
 
+from user import authentication
+
 
 class TestRegister(TestCase):
     """
@@ -175,3 +180,98 @@ class UserManagerTestCase(TestCase):
                 self.User.objects.create_superuser(username='', password=self.test_password)
         finally:
             user.delete()
+
+
+class TestFollowUnfollowView(TestCase):
+    """
+    Tests following and unfollowing users.
+    """
+
+    USERNAME = "follower"
+    PASSWORD = "follower"
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username=self.USERNAME, password=self.PASSWORD)
+        get_user_model().objects.create_user(username="followee", password=self.PASSWORD)
+
+        response = self.client.post(
+            reverse("user:GetRefreshToken"), {"username": self.USERNAME, "password": self.PASSWORD}
+        )
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {response.data.get('access')}"}
+
+    def test_follow_unfollow(self):
+        url = reverse("user:FollowUnfollowView", kwargs={"username": "followee"})
+
+        response = self.client.post(url, **self.headers)
+        self.assertEqual((response.data["following"], response.data["follower_count"]), (True, 1))
+        self.assertEqual(self.user.stats.following_count, 1)
+
+        response = self.client.post(url, **self.headers)
+        self.assertEqual((response.data["following"], response.data["follower_count"]), (False, 0))
+
+    def test_follow_self(self):
+        response = self.client.post(
+            reverse("user:FollowUnfollowView", kwargs={"username": self.USERNAME}), **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_unknown_user(self):
+        response = self.client.post(
+            reverse("user:FollowUnfollowView", kwargs={"username": "nobody"}), **self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestCachedJWTAuthentication(TestCase):
+    """
+    Tests serving the user of authenticated requests from the cache.
+    """
+
+    USERNAME = "cached"
+    PASSWORD = "cached"
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username=self.USERNAME, password=self.PASSWORD)
+
+        response = self.client.post(
+            reverse("user:GetRefreshToken"), {"username": self.USERNAME, "password": self.PASSWORD}
+        )
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {response.data.get('access')}"}
+        self.url = reverse("user:FollowUnfollowView", kwargs={"username": "cached"})
+
+    def request(self, url=None, method="post"):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url or self.url, **self.headers)
+
+        user_queries = [query for query in queries if 'FROM "user_user" WHERE "user_user"."id" =' in query["sql"]]
+        return response, len(user_queries)
+
+    def test_user_is_cached(self):
+        self.assertEqual(self.request()[1], 1)
+        self.assertEqual(self.request()[1], 0)
+
+    def test_password_change_invalidates(self):
+        self.request()
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.set_password("changed")
+        user.save()
+
+        self.assertIsNone(caches["users"].get(authentication.make_key(self.user.id)))
+        self.assertEqual(self.request()[1], 1)
+
+    def test_inactive_user(self):
+        self.request()
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+
+        self.assertEqual(self.request()[0].status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_user(self):
+        response, user_queries = self.request(reverse("tweet:TweetsListView"), method="get")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 0)
+        self.assertIsNone(caches["users"].get(authentication.make_key(self.user.id)))
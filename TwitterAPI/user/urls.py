@@ -9,4 +9,5 @@ urlpatterns = [
     path("register/", views.RegisterView.as_view(), name="RegisterView"),
     path("get-refresh-token/", TokenObtainPairView.as_view(), name="GetRefreshToken"),
     path("get-access-token/", TokenRefreshView.as_view(), name="GetAccessToken"),
+    path("follow/<str:username>/", views.FollowUnfollowView.as_view(), name="FollowUnfollowView"),
 ]
@@ -1,9 +1,14 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from rest_framework import permissions
 from rest_framework import status
+from rest_framework.generics import get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from tweet import feeds
+from user.models import Follow, ProfileStats
 from user.serializer import UserSerializer
 
 
@@ -29,3 +34,50 @@ class RegisterView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FollowUnfollowView(APIView):
+    """
+    Follows the given user, if not already followed else, unfollows the user.
+    """
+
+    def post(self, request: Request, username: str):
+        """
+        Toggles following of the user.
+
+        :param request: contains data got from the client
+        :param username: username of the user to follow or unfollow
+        :return: follow state and follower count of the user
+        """
+
+        followee = get_object_or_404(get_user_model(), username=username)
+
+        if followee.id == request.user.id:
+            return Response({
+                "detail": "Can't follow yourself."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            unfollowed, _ = Follow.objects.filter(follower_id=request.user.id, followee_id=followee.id).delete()
+            change = -1 if unfollowed else 1
+
+            if not unfollowed:
+                try:
+                    with transaction.atomic():
+                        Follow.objects.create(follower_id=request.user.id, followee_id=followee.id)
+                except IntegrityError:  # Followed by a concurrent request.
+                    change = 0
+
+            if change:
+                ProfileStats.increment(followee.id, follower_count=change)
+                ProfileStats.increment(request.user.id, following_count=change)
+            if unfollowed:
+                feeds.forget_followee(request.user.id, followee.id)
+
+        return Response({
+            "username": followee.username,
+            "following": not unfollowed,
+            "follower_count": ProfileStats.objects.filter(
+                user_id=followee.id
+            ).values_list("follower_count", flat=True).first() or 0,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,322 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the buckets of the wall time histogram.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_current_profile = ContextVar("current_profile", default=None)
+
+
+def get_instrumentation_settings() -> dict:
+    """
+    Returns the `PERFORMANCE_INSTRUMENTATION` setting, with defaults for the missing keys.
+    """
+
+    return {
+        "ENABLED": False,
+        "SAMPLE_RATE": 0.1,
+        "SLOW_REQUEST_MS": 500,
+        "SLOW_REQUEST_QUERIES": 10,
+        "METRICS_ALLOWED_IPS": ("127.0.0.1",),
+        "EXTRA_METRICS": (),
+        **getattr(settings, "PERFORMANCE_INSTRUMENTATION", {}),
+    }
+
+
+class RequestProfile:
+    """
+    Measurements of a single sampled request.
+    """
+
+    def __init__(self):
+        self.queries = []  # (sql, seconds) of every query.
+        self.serializer_time = 0.0
+        self.wall_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def db_time(self) -> float:
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def duplicate_queries(self) -> int:
+        """
+        Number of queries repeating the SQL of an earlier query of the request, with other parameters, e.g. N+1.
+        """
+
+        return len(self.queries) - len({sql for sql, _ in self.queries})
+
+
+class ViewMetrics:
+    """
+    Thread-safe aggregates of the sampled requests of every view in this process.
+    """
+
+    FIELDS = ("requests", "wall_seconds", "db_seconds", "queries", "duplicate_queries", "serializer_seconds",
+              "response_bytes")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+            self._buckets = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+
+    def record(self, view_name: str, wall_time: float, profile: RequestProfile, response_bytes: int) -> None:
+        with self._lock:
+            totals = self._totals[view_name]
+            totals["requests"] += 1
+            totals["wall_seconds"] += wall_time
+            totals["db_seconds"] += profile.db_time
+            totals["queries"] += len(profile.queries)
+            totals["duplicate_queries"] += profile.duplicate_queries
+            totals["serializer_seconds"] += profile.serializer_time
+            totals["response_bytes"] += response_bytes
+            self._buckets[view_name][bisect_left(BUCKETS, wall_time)] += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {view_name: dict(totals) for view_name, totals in self._totals.items()}
+
+    def render(self) -> str:
+        """
+        Renders the aggregates in the Prometheus text exposition format.
+        """
+
+        with self._lock:
+            totals = {view_name: dict(values) for view_name, values in self._totals.items()}
+            buckets = {view_name: list(values) for view_name, values in self._buckets.items()}
+
+        lines = []
+
+        for field in self.FIELDS:
+            name = f"django_view_{field}_total"
+            lines += [f"# TYPE {name} counter"]
+            lines += [f'{name}{{view="{view_name}"}} {values[field]}' for view_name, values in sorted(totals.items())]
+
+        name = "django_view_wall_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for view_name, counts in sorted(buckets.items()):
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{view="{view_name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{view="{view_name}"}} {totals[view_name]["wall_seconds"]}')
+            lines.append(f'{name}_count{{view="{view_name}"}} {totals[view_name]["requests"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+view_metrics = ViewMetrics()
+
+
+class _SerializerTimer:
+    """
+    Times `BaseSerializer.data` while sampled requests are running, the property is only replaced from the start of
+    the first one to the end of the last one. Nested serializers don't go through `.data`, so every serialization is
+    counted once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = 0
+        self._original = None
+
+    def __enter__(self):
+        with self._lock:
+            if not self._running:
+                self._original = BaseSerializer.__dict__["data"]
+                BaseSerializer.data = property(self._profiled(self._original.fget))
+            self._running += 1
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self._running -= 1
+            if not self._running:
+                BaseSerializer.data = self._original
+
+    @staticmethod
+    def _profiled(fget):
+        def profiled_data(serializer):
+            if (profile := _current_profile.get()) is None:
+                return fget(serializer)
+
+            start = time.perf_counter()
+            try:
+                return fget(serializer)
+            finally:
+                profile.serializer_time += time.perf_counter() - start
+
+        return profiled_data
+
+
+_serializer_timer = _SerializerTimer()
+
+
+def _record_query(execute, sql, params, many, context):
+    if (profile := _current_profile.get()) is None:
+        return execute(sql, params, many, context)
+
+    return profile.record_query(execute, sql, params, many, context)
+
+
+def _install_query_recorder(sender=None, connection=None, **kwargs):
+    """
+    Adds the recorder of profiled queries to the connection. Queries run in the thread of the request, or in the
+    threads of `sync_to_async` under ASGI, which see the profile of the request through the context.
+    """
+
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, database time, query count, duplicate queries, serializer time and response size of
+    a sample of the requests, by view name, into `view_metrics`. Requests slower than `SLOW_REQUEST_MS` are logged
+    with their slowest queries. Runs as a coroutine under ASGI, so async views aren't moved to a thread.
+
+    Removed from the middleware chain entirely unless enabled through the `PERFORMANCE_INSTRUMENTATION` setting.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = get_instrumentation_settings()
+
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed()
+
+        connection_created.connect(_install_query_recorder)
+        for connection in connections.all():
+            _install_query_recorder(connection=connection)
+
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            # Same marker as `MiddlewareMixin`, so the handler awaits the middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        if random.random() >= self.config["SAMPLE_RATE"]:
+            start = time.perf_counter()
+            response = self.get_response(request)
+            self.log_slow_request(request, time.perf_counter() - start, None)
+
+            return response
+
+        with self.profile() as profile:
+            response = self.get_response(request)
+
+        return self.record(request, response, profile)
+
+    async def __acall__(self, request):
+        if random.random() >= self.config["SAMPLE_RATE"]:
+            start = time.perf_counter()
+            response = await self.get_response(request)
+            self.log_slow_request(request, time.perf_counter() - start, None)
+
+            return response
+
+        with self.profile() as profile:
+            response = await self.get_response(request)
+
+        return self.record(request, response, profile)
+
+    @contextmanager
+    def profile(self):
+        """
+        Profiles the queries and the serializers of the request run inside, and its wall time.
+        """
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        try:
+            with _serializer_timer:
+                start = time.perf_counter()
+                try:
+                    yield profile
+                finally:
+                    profile.wall_time = time.perf_counter() - start
+        finally:
+            _current_profile.reset(token)
+
+    def record(self, request, response, profile: RequestProfile):
+        view_name = request.resolver_match.view_name if request.resolver_match else "unresolved"
+        response_bytes = 0 if response.streaming else len(response.content)
+
+        view_metrics.record(view_name, profile.wall_time, profile, response_bytes)
+        self.log_slow_request(request, profile.wall_time, profile)
+
+        return response
+
+    def log_slow_request(self, request, wall_time: float, profile):
+        if wall_time * 1000 < self.config["SLOW_REQUEST_MS"]:
+            return
+
+        view_name = request.resolver_match.view_name if request.resolver_match else "unresolved"
+        message = f"Slow request {request.method} {request.path} ({view_name}): {wall_time * 1000:.1f}ms"
+
+        if profile is not None:
+            slowest = sorted(profile.queries, key=lambda query: query[1], reverse=True)
+            repeated = Counter(sql for sql, _ in profile.queries).most_common(1)
+
+            message += f", {len(profile.queries)} queries in {profile.db_time * 1000:.1f}ms"
+            if repeated and repeated[0][1] > 1:
+                message += f", repeated {repeated[0][1]} times: {repeated[0][0]}"
+            message += "".join(
+                f"\n  {duration * 1000:8.1f}ms {sql}" for sql, duration in slowest[:self.config["SLOW_REQUEST_QUERIES"]]
+            )
+
+        logger.warning(message)
+
+
+def metrics(request):
+    """
+    Exports the aggregates of `view_metrics`, and the ones of `EXTRA_METRICS`, for Prometheus.
+    Only available when instrumentation is enabled, from `METRICS_ALLOWED_IPS`.
+    """
+
+    config = get_instrumentation_settings()
+
+    if not config["ENABLED"] or request.META.get("REMOTE_ADDR") not in config["METRICS_ALLOWED_IPS"]:
+        raise Http404()
+
+    lines = ["# TYPE django_view_sample_rate gauge", f"django_view_sample_rate {config['SAMPLE_RATE']}"]
+    for path in config["EXTRA_METRICS"]:
+        for name, value in import_string(path)().items():
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+
+    return HttpResponse(
+        "\n".join(lines) + "\n" + view_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,16 @@
+from itertools import islice
+
+
+def batched(iterable, size: int):
+    """
+    Splits the iterable into lists of `size` items, the last list may be shorter.
+
+    :param iterable: Iterable to split, consumed lazily.
+    :param size: Number of items per list.
+    :return: generator of lists.
+    """
+
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
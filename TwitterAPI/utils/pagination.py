@@ -0,0 +1,174 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full ordering key instead of using offsets.
+
+    Unlike `rest_framework.pagination.CursorPagination`, the cursor stores the value of every ordering
+    field of the boundary row, so pages are fetched with a single indexed range query, no `COUNT(*)` is
+    issued and rows inserted while a client is paging never shift or duplicate results.
+    The last ordering field must be unique (usually `id`) to keep the ordering total.
+    """
+
+    ordering = ("-creation_datetime", "-id")
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns a single page of the queryset, starting right after the row encoded in the cursor.
+
+        :param queryset: Queryset to paginate.
+        :param request: Request from the client side.
+        :param view: View requesting the pagination.
+        :return: list of rows in the requested page.
+        """
+
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        try:
+            results = list(queryset)
+        except (ValidationError, ValueError, TypeError):  # Cursor values of the wrong type.
+            raise NotFound(self.invalid_cursor_message)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        return self.page
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Returns the unevaluated queryset of the requested page, with one extra row, e.g. to compute validators of
+        the page with an aggregate instead of reading it.
+
+        :param queryset: Queryset to paginate.
+        :param request: Request from the client side.
+        :param view: View requesting the pagination.
+        :return: sliced queryset, or `None` when pagination is disabled.
+        """
+
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        # Previous pages are fetched by walking the index backwards, then restoring the order.
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(ordering, self.cursor.position))
+            except (ValidationError, ValueError, TypeError):  # Cursor values of the wrong type.
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells us if there is anything beyond this page, without counting.
+        return queryset[:self.page_size + 1]
+
+    @classmethod
+    def get_keyset_filter(cls, ordering, position) -> Q:
+        """
+        Builds the filter matching every row that comes strictly after `position` in `ordering`.
+
+        The leading field is also constrained with an inclusive range, so the database can seek
+        on the index instead of evaluating the `OR` chain for every row.
+
+        :param ordering: Ordering fields, prefixed with `-` for descending order.
+        :param position: Values of the ordering fields for the boundary row.
+        :return: Filter for the rows after the boundary row.
+        """
+
+        field = ordering[0].lstrip("-")
+        lookup = "lt" if ordering[0].startswith("-") else "gt"
+
+        return Q(**{f"{field}__{lookup}e": position[0]}) & cls._get_strictly_after(ordering, position)
+
+    @classmethod
+    def _get_strictly_after(cls, ordering, position) -> Q:
+        field = ordering[0].lstrip("-")
+        lookup = "lt" if ordering[0].startswith("-") else "gt"
+        after = Q(**{f"{field}__{lookup}": position[0]})
+
+        if len(ordering) == 1:
+            return after
+
+        return after | (Q(**{field: position[0]}) & cls._get_strictly_after(ordering[1:], position[1:]))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        """
+        Decodes the opaque cursor passed by the client, raises 404 if it was tampered with.
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = tokens["p"]
+            reverse = bool(tokens.get("r", False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        """
+        Encodes the cursor as url-safe base64 json and places it in the current url.
+        """
+
+        tokens = {"p": cursor.position}
+        if cursor.reverse:
+            tokens["r"] = 1
+
+        encoded = urlsafe_b64encode(json.dumps(tokens, separators=(",", ":")).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+
+        for field in ordering:
+            field = field.lstrip("-")
+            value = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            position.append(value.isoformat() if isinstance(value, datetime) else value)
+
+        return position
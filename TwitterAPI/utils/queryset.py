@@ -0,0 +1,163 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class _QuerysetPlan:
+    """
+    Collects the relations and columns that a serializer reads from a model.
+    """
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = {}
+        self.only = {"": set()}  # Relation path -> columns read on that path, `None` when unknown.
+
+    def add_column(self, path: str, column: str):
+        if self.only.get(path, set()) is not None:
+            self.only.setdefault(path, set()).add(column)
+
+    def load_everything(self, path: str):
+        self.only[path] = None
+
+    def get_only_fields(self):
+        """
+        Fields to pass to `QuerySet.only()`, or `None` if the columns read on the base model are unknown.
+        """
+
+        if self.only[""] is None:
+            return None
+
+        fields = set()
+        for path, columns in self.only.items():
+            if path:
+                fields.add(path)  # The relation itself must not be deferred while traversed.
+            if columns is not None:
+                fields.update(f"{path}__{column}" if path else column for column in columns)
+
+        return sorted(fields)
+
+
+def _join(path: str, attr: str) -> str:
+    return f"{path}__{attr}" if path else attr
+
+
+def _plan_serializer(plan: _QuerysetPlan, serializer, model, path: str, annotations=()):
+    """
+    Walks through the readable fields of the serializer and records how each source is loaded.
+    """
+
+    plan.add_column(path, model._meta.pk.attname)
+    for column in getattr(getattr(serializer, "Meta", None), "extra_only", ()):
+        plan.add_column(path, column)
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if field.source == "*":
+            if isinstance(field, serializers.BaseSerializer):
+                _plan_serializer(plan, field, model, path)
+            else:  # e.g. `SerializerMethodField`, can read anything from the instance.
+                plan.load_everything(path)
+            continue
+
+        _plan_source(plan, field, model, path, list(field.source_attrs), annotations)
+
+
+def _plan_source(plan: _QuerysetPlan, field, model, path: str, attrs: list, annotations=()):
+    """
+    Follows a dotted source like `author.username` through the model relations.
+    """
+
+    for index, attr in enumerate(attrs):
+        is_last = index == len(attrs) - 1
+
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            # Properties and methods can read any column, annotations are already part of the query.
+            if not (path == "" and attr in annotations):
+                plan.load_everything(path)
+            return
+
+        if not model_field.is_relation or attr == getattr(model_field, "attname", None) != model_field.name:
+            plan.add_column(path, getattr(model_field, "attname", attr))
+            return
+
+        related_model = model_field.related_model
+        related_path = _join(path, attr)
+
+        if model_field.many_to_many or model_field.one_to_many:
+            child = getattr(field, "child", None) if is_last else None
+            queryset = related_model._default_manager.all()
+
+            if isinstance(child, serializers.BaseSerializer):
+                back_reference = () if model_field.many_to_many else (model_field.field.attname,)
+                queryset = optimize_queryset(queryset, child, extra_only=back_reference)
+
+            plan.prefetch_related[related_path] = Prefetch(related_path, queryset=queryset)
+            return
+
+        if is_last and not isinstance(field, serializers.BaseSerializer):
+            if model_field.concrete and isinstance(field, serializers.RelatedField) \
+                    and field.use_pk_only_optimization():
+                plan.add_column(path, model_field.attname)
+                return
+
+            # e.g. `StringRelatedField`, it can read anything from the related instance.
+            plan.select_related.add(related_path)
+            plan.load_everything(related_path)
+            return
+
+        plan.select_related.add(related_path)
+        plan.only.setdefault(related_path, set())
+
+        if is_last:
+            _plan_serializer(plan, field, related_model, related_path)
+            return
+
+        model, path = related_model, related_path
+
+
+def optimize_queryset(queryset, serializer, extra_only=()):
+    """
+    Applies `select_related`, `prefetch_related` and `only` to the queryset based on the fields that the
+    serializer reads, so that serializing a page costs a fixed number of queries. Columns read by a serializer
+    outside its fields can be listed in `Meta.extra_only`.
+
+    :param queryset: Queryset that will be serialized.
+    :param serializer: Serializer class or instance used to serialize the queryset.
+    :param extra_only: Additional columns to load on the base model.
+    :return: optimized queryset.
+    """
+
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    plan = _QuerysetPlan()
+    _plan_serializer(plan, serializer, queryset.model, "", annotations=queryset.query.annotations)
+
+    for column in extra_only:
+        plan.add_column("", column)
+
+    if plan.select_related:
+        queryset = queryset.select_related(*sorted(plan.select_related))
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related.values())
+    if (only_fields := plan.get_only_fields()) is not None:
+        queryset = queryset.only(*only_fields)
+
+    return queryset
+
+
+class OptimizedQuerysetMixin:
+    """
+    Optimizes the queryset of a generic view for the fields used by its serializer.
+    Hooks into `filter_queryset`, so it also applies to views that override `get_queryset`.
+    """
+
+    def filter_queryset(self, queryset):
+        return optimize_queryset(super().filter_queryset(queryset), self.get_serializer())
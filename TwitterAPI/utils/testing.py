@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountAssertionsMixin:
+    """
+    Assertions about the number of queries made by list endpoints. Mix into `django.test.TestCase`.
+    """
+
+    def assertConstantQueryCount(self, url: str, page_sizes=(1, 5, 20), page_size_param="limit", data=None,
+                                 **extra) -> int:
+        """
+        Requests the url with each page size, and asserts that the number of queries stays the same.
+
+        :param url: List endpoint to request.
+        :param page_sizes: Page sizes to request the url with.
+        :param page_size_param: Query parameter used by the pagination for the page size.
+        :param data: Additional query parameters.
+        :param extra: Additional arguments for the test client, like headers.
+        :return: number of queries made for a single page.
+        """
+
+        query_counts = {}
+
+        # Warms up per-process caches, like the one of authenticated users, before counting.
+        self.client.get(url, {**(data or {}), page_size_param: page_sizes[0]}, **extra)
+
+        for page_size in page_sizes:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {**(data or {}), page_size_param: page_size}, **extra)
+
+            self.assertLess(response.status_code, 400, f"{url} responded with {response.status_code}.")
+            query_counts[page_size] = len(queries)
+
+        self.assertEqual(
+            len(set(query_counts.values())), 1,
+            f"Number of queries for {url} depends on the page size: {query_counts}"
+        )
+
+        return query_counts[page_sizes[0]]
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions on the query plans chosen by SQLite. Mix into `django.test.TestCase`.
+    """
+
+    def assertQueriesUseIndexes(self, queries, tables=None):
+        """
+        Asserts that none of the captured queries reads a table without an index, or sorts in a temporary b-tree.
+
+        :param queries: Queries captured by `django.test.utils.CaptureQueriesContext`.
+        :param tables: Only check the queries reading one of these tables, all queries when `None`.
+        """
+
+        for query in queries:
+            sql = query["sql"]
+
+            if not sql.startswith("SELECT") or (tables and not any(f'"{table}"' in sql for table in tables)):
+                continue
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[-1] for row in cursor.fetchall()]
+
+            for step in plan:
+                self.assertNotIn("TEMP B-TREE", step, f"Query sorts without an index: {sql}\n{plan}")
+                # Rows of a subquery in `FROM` are read from the co-routine computing them, not from a table.
+                self.assertFalse(
+                    step.startswith("SCAN") and "USING" not in step and "CONSTANT ROW" not in step
+                    and step != "SCAN subquery",
+                    f"Query scans a table without an index: {sql}\n{plan}"
+                )